@@ -0,0 +1,28 @@
+from django.urls import path, re_path
+
+from realworld.apps.articles.async_views import AsyncArticleDetailView, AsyncArticleFeedView, \
+    AsyncArticleListView, AsyncCommentListView
+from realworld.apps.articles.views import ArticleSearchAPIView, ArticleViewSet, ArticlesFeedAPIView, \
+    CommentsListCreateAPIView
+from realworld.apps.core.aio import get_or_sync_view
+
+urlpatterns = [
+    # articles/<slug> 보다 먼저 (검색은 sync view 그대로)
+    path('articles/search', ArticleSearchAPIView.as_view()),
+    path('articles', get_or_sync_view(
+        AsyncArticleListView.as_view(),
+        ArticleViewSet.as_view({'get': 'list', 'post': 'create'}),
+    )),
+    path('articles/feed/', get_or_sync_view(
+        AsyncArticleFeedView.as_view(),
+        ArticlesFeedAPIView.as_view(),
+    )),
+    re_path(r'^articles/(?P<slug>[^/.]+)$', get_or_sync_view(
+        AsyncArticleDetailView.as_view(),
+        ArticleViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}),
+    )),
+    path('articles/<str:article_slug>/comments/', get_or_sync_view(
+        AsyncCommentListView.as_view(),
+        CommentsListCreateAPIView.as_view(),
+    )),
+]
@@ -0,0 +1,101 @@
+"""
+GET 전용 async view (realworld.asgi_urls 에서 쓴다)
+출력, 캐시, 예외 응답은 views.py 의 같은 route 와 같다.
+"""
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+from realworld.apps.articles.cache import article_response_cache
+from realworld.apps.articles.models import Article
+from realworld.apps.articles.readers import article_values, article_values_in_order, comment_values, get_cache_rows, \
+    get_tag_list_by_slug, read_article, read_articles, read_comments
+from realworld.apps.articles.validators import get_article_validators, get_comment_list_validators
+from realworld.apps.articles.views import ArticleViewSet, ArticlesFeedAPIView, CommentsListCreateAPIView, \
+    filter_by_article_id, get_viewer_profile
+from realworld.apps.core.aio import AsyncReadView, database_sync_to_async, gather, paginate
+from realworld.strings import ARTICLE_DOES_NOT_EXIST
+
+
+class AsyncArticleListView(AsyncReadView):
+    view_class = ArticleViewSet
+    view_initkwargs = {'action_map': {'get': 'list'}}
+
+    async def get(self, view, request):
+        viewer = await database_sync_to_async(get_viewer_profile)(request)
+        cached = await database_sync_to_async(article_response_cache.get)(request, viewer)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
+
+        snapshot = await database_sync_to_async(article_response_cache.snapshot)()
+        queryset = await database_sync_to_async(view.get_queryset)()
+        rows = await paginate(view.paginator, article_values(queryset), request)
+        data = await database_sync_to_async(read_articles)(rows)
+        response = view.get_paginated_response(data)
+        await database_sync_to_async(article_response_cache.set)(
+            request, response.data, get_cache_rows(rows), view.get_membership_key(), snapshot=snapshot
+        )
+        return response
+
+
+class AsyncArticleDetailView(AsyncReadView):
+    view_class = ArticleViewSet
+    view_initkwargs = {'action_map': {'get': 'retrieve'}}
+
+    async def get(self, view, request, slug):
+        """
+        조건부 GET 을 먼저 확인하고, article row (viewer 상태 annotate 포함) 와 태그 목록을 동시에 읽는다.
+        """
+        viewer = await database_sync_to_async(get_viewer_profile)(request)
+        cached, validators = await database_sync_to_async(article_response_cache.get_with_validators)(request, viewer)
+        if cached is not None and validators is not None:
+            validators = validators.extend(cached['favorited'], cached['author']['following'])
+            if validators.is_not_modified(request):
+                return validators.not_modified()
+            return validators.apply(Response(cached, status=status.HTTP_200_OK))
+
+        snapshot = await database_sync_to_async(article_response_cache.snapshot)()
+        found = await database_sync_to_async(get_article_validators)(slug, viewer)
+        if found is None:
+            raise NotFound(ARTICLE_DOES_NOT_EXIST)
+        shared_validators, favorited, author_following = found
+        validators = shared_validators.extend(favorited, author_following)
+        if validators.is_not_modified(request):
+            return validators.not_modified()
+
+        rows, tag_list = await gather(
+            (list, article_values(Article.objects.for_listing(viewer).filter(slug=slug))),
+            (get_tag_list_by_slug, slug),
+        )
+        if not rows:
+            raise NotFound(ARTICLE_DOES_NOT_EXIST)
+
+        data = read_article(rows[0], tag_list)
+        await database_sync_to_async(article_response_cache.set)(
+            request, data, get_cache_rows(rows), validators=shared_validators, snapshot=snapshot
+        )
+        return validators.apply(Response(data, status=status.HTTP_200_OK))
+
+
+class AsyncArticleFeedView(AsyncReadView):
+    view_class = ArticlesFeedAPIView
+
+    async def get(self, view, request):
+        keys = await database_sync_to_async(view.paginator.paginate_feed)(view.get_feed(), request)
+        rows = await database_sync_to_async(article_values_in_order)(view.get_queryset(), [key.id for key in keys])
+        data = await database_sync_to_async(read_articles)(rows)
+        return view.get_paginated_response(data)
+
+
+class AsyncCommentListView(AsyncReadView):
+    view_class = CommentsListCreateAPIView
+
+    async def get(self, view, request, article_slug):
+        viewer = await database_sync_to_async(get_viewer_profile)(request)
+        article_id, validators = await database_sync_to_async(get_comment_list_validators)(article_slug, viewer)
+        if validators.is_not_modified(request):
+            return validators.not_modified()
+
+        queryset = comment_values(filter_by_article_id(view.get_queryset(), article_id), viewer)
+        rows = await paginate(view.paginator, queryset, request)
+        return validators.apply(view.get_paginated_response(read_comments(rows)))
@@ -0,0 +1,240 @@
+"""
+API route 마다 Django test client 로 요청을 반복해서 지연시간(p50, p95), 요청당 query 수, 메모리 할당량을 잰다.
+synthetic.DatasetGenerator 로 만든 데이터 위에서 돌리는 것을 가정한다.
+"""
+import asyncio
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlencode
+
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.db.models import Count
+from django.test.client import AsyncRequestFactory, RequestFactory
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from realworld.apps.articles.models import Article, Tag
+from realworld.apps.articles.synthetic import DEFAULT_PASSWORD
+from realworld.apps.core.metrics import RequestMetrics
+from realworld.apps.profiles.models import Profile
+
+
+@dataclass
+class Endpoint:
+    name: str
+    path: str
+    method: str = 'get'
+    params: dict = field(default_factory=dict)
+    auth: bool = False
+    # 측정하지 않고 매번 뒤따라 보내는 요청 (좋아요 -> 좋아요 취소 처럼 상태를 되돌린다)
+    undo: Optional['Endpoint'] = None
+
+
+def percentile(samples, ratio):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+
+def get_endpoints():
+    """
+    팔로우가 가장 많은 viewer, 글이 가장 많은 작성자, 가장 인기 있는 글과 태그로 route 목록을 만든다.
+    좋아요, 팔로우는 viewer 가 아직 하지 않은 대상을 골라서 undo 로 원래 상태가 되도록 한다.
+    (viewer, [Endpoint]) 를 돌려준다.
+    """
+    profiles = Profile.objects.select_related('user')
+    viewer = profiles.annotate(follow_count=Count('follows')).order_by('-follow_count', 'pk').first()
+    author = profiles.exclude(pk=viewer.pk).annotate(
+        article_count=Count('articles')
+    ).order_by('-article_count', 'pk').first()
+    followee = profiles.exclude(pk=viewer.pk).exclude(followed_by=viewer).order_by('pk').first() or author
+    article = Article.objects.exclude(favorited_by=viewer).order_by('-favorites_count', '-id').first()
+    tag = Tag.objects.popular(1).first()
+    author_name = author.user.username
+    viewer_name = viewer.user.username
+    article_url = f'/api/articles/{article.slug}'
+    follow_url = f'/api/profiles/{followee.user.username}/follow'
+
+    return viewer.user, [
+        Endpoint('articles', '/api/articles'),
+        Endpoint('articles limit=100', '/api/articles', params={'limit': 100}),
+        Endpoint('articles cursor', '/api/articles', params={'cursor': '', 'count': 'false'}),
+        Endpoint('articles tag', '/api/articles', params={'tag': tag.tag}),
+        Endpoint('articles author', '/api/articles', params={'author': author_name}),
+        Endpoint('articles favorited', '/api/articles', params={'favorited': viewer_name}),
+        Endpoint('articles (viewer)', '/api/articles', auth=True),
+        Endpoint('article', article_url),
+        Endpoint('article (viewer)', article_url, auth=True),
+        Endpoint('comments', article_url + '/comments/'),
+        Endpoint('search', '/api/articles/search', params={'q': 'django cache'}),
+        Endpoint('feed', '/api/articles/feed/', auth=True),
+        Endpoint('tags', '/api/tags/'),
+        Endpoint('tags top', '/api/tags/', params={'top': 10}),
+        Endpoint('profile', f'/api/profiles/{author_name}'),
+        Endpoint('profile (viewer)', f'/api/profiles/{author_name}', auth=True),
+        Endpoint('user', f'/api/users/{viewer.user_id}/', auth=True),
+        Endpoint(
+            'favorite', article_url + '/favorite/', method='post', auth=True,
+            undo=Endpoint('unfavorite', article_url + '/favorite/', method='delete', auth=True),
+        ),
+        Endpoint(
+            'follow', follow_url, method='post', auth=True,
+            undo=Endpoint('unfollow', follow_url, method='delete', auth=True),
+        ),
+        Endpoint(
+            'login', '/api/users/login/', method='post',
+            params={'user': {'email': viewer.user.email, 'password': DEFAULT_PASSWORD}},
+        ),
+    ]
+
+
+class EndpointBenchmark:
+    def __init__(self, viewer, iterations=50, warmup=5, allocations=False):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.allocations = allocations
+        self.client = APIClient()
+        self.auth_header = f'Token {viewer.token}'
+
+    def request(self, endpoint):
+        extra = {'HTTP_AUTHORIZATION': self.auth_header} if endpoint.auth else {}
+        if endpoint.method == 'get':
+            return self.client.get(endpoint.path, endpoint.params, **extra)
+        return getattr(self.client, endpoint.method)(endpoint.path, endpoint.params, format='json', **extra)
+
+    def undo(self, endpoint):
+        if endpoint.undo is not None:
+            self.request(endpoint.undo)
+
+    def run(self, endpoint):
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for _ in range(self.warmup):
+                self.request(endpoint)
+                self.undo(endpoint)
+
+            samples = []
+            for _ in range(self.iterations):
+                started = time.perf_counter()
+                response = self.request(endpoint)
+                samples.append(time.perf_counter() - started)
+                self.undo(endpoint)
+
+            # DEBUG 의 connection.queries 는 9000 개에서 잘리므로 execute_wrapper 로 센다.
+            metrics = RequestMetrics()
+            with connection.execute_wrapper(metrics):
+                self.request(endpoint)
+            self.undo(endpoint)
+
+            result = {
+                'name': endpoint.name,
+                'status': response.status_code,
+                'p50_ms': percentile(samples, 0.5) * 1000,
+                'p95_ms': percentile(samples, 0.95) * 1000,
+                'queries': metrics.queries,
+                'bytes': len(response.content),
+            }
+            if self.allocations:
+                result['alloc_kib'] = self.measure_allocations(endpoint)
+        return result
+
+    def measure_allocations(self, endpoint):
+        """
+        tracemalloc 은 요청을 몇 배 느리게 만들기 때문에 시간 측정과 따로 한 번만 돌린다. (최대 사용량)
+        """
+        tracemalloc.start()
+        try:
+            self.request(endpoint)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.undo(endpoint)
+        return peak / 1024
+
+
+class ConcurrencyBenchmark:
+    """
+    같은 GET 요청을 concurrency 개씩 동시에 보내서 처리량(req/s)과 요청별 지연시간(p50, p99)을 잰다.
+    서버 없이 프로세스 안에서 handler 를 바로 부른다.
+    - wsgi: WSGIHandler 를 스레드 concurrency 개에서 (gunicorn --threads 와 비슷하게)
+    - asgi: ASGIHandler 를 이벤트 루프 하나의 task concurrency 개로 (uvicorn 과 비슷하게)
+    ASGI 에서 async view 를 쓰려면 ROOT_URLCONF='realworld.asgi_urls' 로 돌린다.
+    """
+
+    def __init__(self, viewer, requests=200, concurrency=10):
+        self.requests = requests
+        self.concurrency = concurrency
+        self.auth_header = f'Token {viewer.token}'
+
+    def get_headers(self, endpoint):
+        return {'HTTP_AUTHORIZATION': self.auth_header} if endpoint.auth else {}
+
+    def run(self, endpoint, interface):
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            run = self.run_wsgi if interface == 'wsgi' else self.run_asgi
+            started = time.perf_counter()
+            samples = run(endpoint)
+            elapsed = time.perf_counter() - started
+        latencies = [seconds for _, seconds in samples]
+        return {
+            'name': endpoint.name,
+            'interface': interface,
+            'concurrency': self.concurrency,
+            'status': max(status for status, _ in samples),
+            'requests_per_second': len(samples) / elapsed,
+            'p50_ms': percentile(latencies, 0.5) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+        }
+
+    def run_wsgi(self, endpoint):
+        handler = get_wsgi_application()
+        environ = RequestFactory()._base_environ(
+            PATH_INFO=endpoint.path, QUERY_STRING=urlencode(endpoint.params), **self.get_headers(endpoint)
+        )
+
+        def request(_):
+            statuses = []
+            started = time.perf_counter()
+            body = handler(dict(environ), lambda status, headers: statuses.append(int(status.split()[0])))
+            b''.join(body)
+            # close() 가 request_finished 를 보내서 connection 을 닫는다. (pool 이면 돌려준다)
+            body.close()
+            return statuses[0], time.perf_counter() - started
+
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            return list(executor.map(request, range(self.requests)))
+
+    def run_asgi(self, endpoint):
+        handler = get_asgi_application()
+        headers = [(b'authorization', self.auth_header.encode())] if endpoint.auth else []
+        scope = AsyncRequestFactory()._base_scope(
+            path=endpoint.path, query_string=urlencode(endpoint.params), headers=headers
+        )
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def request():
+            statuses = []
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+
+            started = time.perf_counter()
+            await handler(dict(scope), receive, send)
+            return statuses[0], time.perf_counter() - started
+
+        async def worker(count):
+            return [await request() for _ in range(count)]
+
+        async def main():
+            counts = [self.requests // self.concurrency] * self.concurrency
+            counts[0] += self.requests % self.concurrency
+            results = await asyncio.gather(*(worker(count) for count in counts))
+            return [sample for samples in results for sample in samples]
+
+        return asyncio.run(main())
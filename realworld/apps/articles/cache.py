@@ -0,0 +1,229 @@
+import copy
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from realworld.apps.core.cache import LRUCache
+from realworld.apps.core.routers import read_primary_from_now
+from realworld.apps.profiles.graph import FAVORITES, FOLLOWING
+from realworld.apps.profiles.models import Profile
+
+DEFAULT_ARTICLE_RESPONSE_CACHE_SIZE = 512
+
+ALL_ARTICLES = 'articles'
+ALL_TAGS = 'tags'
+# bump 할 때마다 같이 올린다. 본문을 읽는 동안 쓰기가 있었는지 snapshot 과 비교한다.
+ALL_WRITES = 'writes'
+
+
+def article_version_key(article_id):
+    return f'article:{article_id}'
+
+
+def author_version_key(profile_id):
+    return f'author:{profile_id}'
+
+
+def tag_version_key(tag):
+    return f'tag:{tag}'
+
+
+class ArticleResponseCache:
+    """
+    익명 사용자 기준으로 직렬화한 article 응답을 URL 단위로 캐시한다.
+    각 항목은 만들어질 때의 의존 버전(article, author, tag, 전체 목록)을 같이 저장하고,
+    꺼낼 때 현재 버전과 하나라도 다르면 버린다. 버전은 signals 에서 올린다.
+    본문을 읽기 전에 snapshot() 을 받아서 set 에 넘긴다. 그 사이에 쓰기가 있었으면 (옛 본문일 수 있으므로) 넣지 않는다.
+    favorited, following 은 요청한 사용자 기준으로 꺼낼 때 덮어쓴다.
+    """
+    version_key_prefix = 'article-response-version:'
+
+    def __init__(self):
+        self.bodies = LRUCache(
+            maxsize=getattr(settings, 'ARTICLE_RESPONSE_CACHE_SIZE', DEFAULT_ARTICLE_RESPONSE_CACHE_SIZE)
+        )
+        self.stale = 0
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'ARTICLE_RESPONSE_CACHE', False)
+
+    @property
+    def versions(self):
+        return caches[getattr(settings, 'ARTICLE_RESPONSE_CACHE_VERSIONS', 'default')]
+
+    @staticmethod
+    def get_key(request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        return f'{request.path}?{query}'
+
+    def get(self, request, viewer=None):
+        data, _ = self.get_with_validators(request, viewer)
+        return data
+
+    def get_with_validators(self, request, viewer=None):
+        """
+        (data, set 에 같이 넘긴 viewer 와 상관없는 Validators). 없으면 (None, None)
+        """
+        entry = self.get_entry(request)
+        if entry is None:
+            return None, None
+
+        data = entry['data']
+        if viewer is not None:
+            data = self.apply_viewer(data, entry['rows'], viewer)
+        return data, entry.get('validators')
+
+    def get_plain(self, request):
+        """
+        viewer 에 따라 달라지는 필드가 없는 응답 (태그 목록 등)
+        """
+        entry = self.get_entry(request)
+        if entry is None:
+            return None
+        return entry['data']
+
+    def get_entry(self, request):
+        if not self.enabled:
+            return None
+        entry = self.bodies.get(self.get_key(request))
+        if entry is None:
+            return None
+
+        if self.get_versions(entry['deps'].keys()) != entry['deps']:
+            self.bodies.delete(self.get_key(request))
+            self.stale += 1
+            return None
+        return entry
+
+    def snapshot(self):
+        """
+        본문을 읽는 query 보다 먼저 부른다. cache 에 넣을 본문이므로 남은 읽기는 replica 가 아니라 primary 에서 한다.
+        """
+        if not self.enabled:
+            return None
+        read_primary_from_now()
+        return self.get_versions([ALL_WRITES])
+
+    def is_unchanged_since(self, snapshot):
+        return snapshot is None or self.get_versions(snapshot.keys()) == snapshot
+
+    def set(self, request, data, rows, membership_key=ALL_ARTICLES, validators=None, snapshot=None):
+        """
+        rows: data 의 결과와 같은 순서의 (article_id, author_id) 목록
+        """
+        if not self.enabled:
+            return
+        dep_keys = [membership_key]
+        for article_id, author_id in rows:
+            dep_keys.append(article_version_key(article_id))
+            dep_keys.append(author_version_key(author_id))
+
+        deps = self.get_versions(dep_keys)
+        if not self.is_unchanged_since(snapshot):
+            return
+        self.bodies.set(self.get_key(request), {
+            'deps': deps,
+            'data': self.strip_viewer(data),
+            'rows': rows,
+            'validators': validators,
+        })
+
+    def set_plain(self, request, data, dep_keys, snapshot=None):
+        if not self.enabled:
+            return
+        deps = self.get_versions(dep_keys)
+        if not self.is_unchanged_since(snapshot):
+            return
+        self.bodies.set(self.get_key(request), {
+            'deps': deps,
+            'data': data,
+            'rows': [],
+        })
+
+    def get_versions(self, keys):
+        """
+        없는 버전은 시각 기반 값으로 새로 만든다. (캐시에서 밀려난 뒤 같은 값으로 돌아오지 않도록)
+        """
+        prefixed = {self.version_key_prefix + key: key for key in keys}
+        found = self.versions.get_many(prefixed.keys())
+        versions = {prefixed[key]: value for key, value in found.items()}
+        for prefixed_key, key in prefixed.items():
+            if key not in versions:
+                self.versions.add(prefixed_key, time.time_ns())
+                versions[key] = self.versions.get(prefixed_key)
+        return versions
+
+    def bump(self, *keys):
+        """
+        signals 는 transaction 안에서 부르므로 commit 뒤에 한 번 더 올린다.
+        (commit 전에 다른 요청이 snapshot 을 받고 옛 row 를 읽었을 수 있다)
+        """
+        if not self.enabled:
+            return
+        keys = (*keys, ALL_WRITES)
+        self.incr_versions(keys)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self.incr_versions(keys))
+
+    def incr_versions(self, keys):
+        for key in keys:
+            prefixed_key = self.version_key_prefix + key
+            try:
+                self.versions.incr(prefixed_key)
+            except ValueError:
+                self.versions.set(prefixed_key, time.time_ns())
+
+    def clear(self):
+        self.bodies.clear()
+        self.stale = 0
+
+    def stats(self):
+        return dict(self.bodies.stats(), stale=self.stale)
+
+    @staticmethod
+    def get_items(data):
+        if 'results' in data:
+            return data['results']
+        return [data]
+
+    def strip_viewer(self, data):
+        data = copy.deepcopy(data)
+        for item in self.get_items(data):
+            item['favorited'] = False
+            item['author']['following'] = False
+        return data
+
+    def apply_viewer(self, data, rows, viewer):
+        article_ids = [article_id for article_id, _ in rows]
+        author_ids = [author_id for _, author_id in rows]
+        graph = viewer.social_graph
+        if graph.is_cheap(FAVORITES):
+            favorited_ids = graph.favorites
+        else:
+            favorited_ids = set(Profile.favorites.through.objects.filter(
+                profile_id=viewer.pk, article_id__in=article_ids
+            ).values_list('article_id', flat=True))
+        if graph.is_cheap(FOLLOWING):
+            following_ids = graph.following
+        else:
+            following_ids = set(Profile.follows.through.objects.filter(
+                from_profile_id=viewer.pk, to_profile_id__in=author_ids
+            ).values_list('to_profile_id', flat=True))
+
+        data = copy.copy(data)
+        items = [dict(item, author=dict(item['author'])) for item in self.get_items(data)]
+        for item, (article_id, author_id) in zip(items, rows):
+            item['favorited'] = article_id in favorited_ids
+            item['author']['following'] = author_id in following_ids
+
+        if 'results' in data:
+            data['results'] = items
+            return data
+        return items[0]
+
+
+article_response_cache = ArticleResponseCache()
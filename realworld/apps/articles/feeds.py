@@ -0,0 +1,188 @@
+import heapq
+from collections import namedtuple
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from realworld.apps.articles.models import Article, FeedEntry
+from realworld.apps.core.pagination import KeysetPagination
+from realworld.apps.profiles.models import Profile
+
+DEFAULT_FEED_FANOUT_MAX_FOLLOWERS = 5000
+DEFAULT_FEED_BACKFILL_SIZE = 200
+FEED_BATCH_SIZE = 1000
+
+Follow = Profile.follows.through
+
+
+def get_fan_out_max_followers():
+    return getattr(settings, 'FEED_FANOUT_MAX_FOLLOWERS', DEFAULT_FEED_FANOUT_MAX_FOLLOWERS)
+
+
+def get_backfill_size():
+    return getattr(settings, 'FEED_BACKFILL_SIZE', DEFAULT_FEED_BACKFILL_SIZE)
+
+
+def get_follower_ids(author):
+    return list(Follow.objects.filter(to_profile_id=author.pk).values_list('from_profile_id', flat=True))
+
+
+def is_fan_out_author(author):
+    """
+    팔로워가 너무 많은 작성자는 fan-out-on-write 를 하지 않고, 읽을 때 합친다.
+    """
+    return not Profile.objects.filter(pk=author.pk, fan_out_on_read=True).exists()
+
+
+def mark_fan_out_on_read(author_ids):
+    """
+    followers_count 가 기준을 넘은 작성자를 fan-out-on-read 로 바꾼다.
+    팔로워가 다시 줄어도 되돌리지 않는다. (그동안 쓴 글은 FeedEntry 가 없어서 읽을 때 합쳐야 한다)
+    """
+    return Profile.objects.filter(
+        pk__in=author_ids, fan_out_on_read=False, followers_count__gt=get_fan_out_max_followers()
+    ).update(fan_out_on_read=True)
+
+
+def fan_out_article(article):
+    if not is_fan_out_author(article.author):
+        return
+    follower_ids = get_follower_ids(article.author)
+    FeedEntry.objects.bulk_create([
+        FeedEntry(
+            follower_id=follower_id,
+            article_id=article.pk,
+            author_id=article.author_id,
+            created_at=article.created_at,
+        )
+        for follower_id in follower_ids
+    ], batch_size=FEED_BATCH_SIZE, ignore_conflicts=True)
+
+
+def fan_out_articles(articles):
+    """
+    bulk insert 한 글들을 한 번에 펼친다. (signal 을 거치지 않는 synthetic, import 용)
+    articles: (id, author_id, created_at) 목록. 만든 FeedEntry 수를 돌려준다.
+    """
+    followers = {}
+    follows = Follow.objects.filter(
+        to_profile_id__in={author_id for _, author_id, _ in articles}
+    ).values_list('to_profile_id', 'from_profile_id')
+    for author_id, follower_id in follows.iterator():
+        followers.setdefault(author_id, []).append(follower_id)
+
+    on_read_ids = set(Profile.objects.filter(
+        pk__in=followers.keys(), fan_out_on_read=True
+    ).values_list('pk', flat=True))
+    rows = [
+        FeedEntry(follower_id=follower_id, article_id=article_id, author_id=author_id, created_at=created_at)
+        for article_id, author_id, created_at in articles
+        if author_id not in on_read_ids
+        for follower_id in followers.get(author_id, ())
+    ]
+    FeedEntry.objects.bulk_create(rows, batch_size=FEED_BATCH_SIZE, ignore_conflicts=True)
+    return len(rows)
+
+
+def backfill_feed(follower, author):
+    if not is_fan_out_author(author):
+        return
+    articles = Article.objects.filter(author_id=author.pk).order_by('-created_at', '-id')
+    articles = articles.values_list('pk', 'created_at')[:get_backfill_size()]
+    FeedEntry.objects.bulk_create([
+        FeedEntry(
+            follower_id=follower.pk,
+            article_id=article_id,
+            author_id=author.pk,
+            created_at=created_at,
+        )
+        for article_id, created_at in articles
+    ], batch_size=FEED_BATCH_SIZE, ignore_conflicts=True)
+
+
+def trim_feed(follower, author):
+    FeedEntry.objects.filter(follower_id=follower.pk, author_id=author.pk).delete()
+
+
+FeedKey = namedtuple('FeedKey', ['created_at', 'id'])
+
+
+def get_range(queryset, id_field, limit, position=None, reverse=False):
+    """
+    (created_at, id_field) 인덱스를 그대로 따라 읽는 keyset 범위. position 다음부터 limit 개
+    """
+    prefix, lookup, bound = ('', 'gt', 'gte') if reverse else ('-', 'lt', 'lte')
+    queryset = queryset.order_by(prefix + 'created_at', prefix + id_field)
+    if position is not None:
+        created_at, pk = position
+        # bound 는 OR 조건에 이미 들어 있지만, 있어야 인덱스에서 position 위치로 바로 찾아간다.
+        queryset = queryset.filter(**{f'created_at__{bound}': created_at}).filter(
+            Q(**{f'created_at__{lookup}': created_at}) | Q(created_at=created_at, **{f'{id_field}__{lookup}': pk})
+        )
+    return queryset.values_list('created_at', id_field)[:limit]
+
+
+class Feed:
+    """
+    펼쳐둔 FeedEntry 와, fan-out-on-read 작성자의 글을 합친 피드
+    FeedEntry 는 (follower, created_at, article) 인덱스, 작성자의 글은 article_author_created_at_idx 범위로 읽고
+    (created_at, id) 순서로 merge 한다. 정렬용 임시 B-tree 없이 페이지 크기만큼만 읽는다.
+    """
+
+    def __init__(self, follower):
+        self.follower = follower
+
+    @cached_property
+    def on_read_author_ids(self):
+        return list(self.follower.follows.filter(fan_out_on_read=True).values_list('pk', flat=True))
+
+    def get_entries(self):
+        entries = FeedEntry.objects.filter(follower_id=self.follower.pk)
+        if self.on_read_author_ids:
+            # fan-out-on-read 로 바뀌기 전에 펼쳐둔 글은 작성자 범위에서 읽는다.
+            entries = entries.exclude(author_id__in=self.on_read_author_ids)
+        return entries
+
+    def get_ranges(self, limit, position=None, reverse=False):
+        yield get_range(self.get_entries(), 'article_id', limit, position, reverse)
+        for author_id in self.on_read_author_ids:
+            yield get_range(Article.objects.filter(author_id=author_id), 'id', limit, position, reverse)
+
+    def get_keys(self, limit, position=None, reverse=False, offset=0):
+        """
+        (created_at, id) 내림차순 (reverse 면 position 부터 오름차순) 으로 offset 다음 limit 개의 FeedKey
+        """
+        ranges = self.get_ranges(offset + limit, position, reverse)
+        keys = heapq.merge(*ranges, reverse=not reverse)
+        return [FeedKey(*key) for key in islice(keys, offset, offset + limit)]
+
+    def count(self):
+        count = self.get_entries().count()
+        if self.on_read_author_ids:
+            count += Article.objects.filter(author_id__in=self.on_read_author_ids).count()
+        return count
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Feed 에서 FeedKey 만 골라서 페이지를 만든다. 글 row 는 view 가 id 로 읽는다.
+    """
+
+    def paginate_feed(self, feed, request):
+        self.request = request
+        self.count_enabled = self.get_count_enabled(request)
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        self.limit = self.get_limit(request) or self.default_limit
+
+        if self.cursor_mode:
+            self.next_cursor = None
+            self.previous_cursor = None
+            self.position, self.reverse = self.decode_cursor(request.query_params[self.cursor_query_param])
+            keys = feed.get_keys(self.limit + 1, self.position, self.reverse)
+        else:
+            self.offset = self.get_offset(request)
+            keys = feed.get_keys(self.limit, offset=self.offset)
+        self.count = feed.count() if self.count_enabled else None
+        return self.get_page(keys)
@@ -0,0 +1,88 @@
+import json
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from realworld.apps.articles.benchmark import ConcurrencyBenchmark, get_endpoints
+from realworld.apps.articles.models import Article
+from realworld.apps.core.db.pool import PooledDatabaseWrapperMixin
+
+INTERFACES = ('wsgi', 'asgi')
+
+
+class Command(BaseCommand):
+    help = 'GET route 마다 WSGI(스레드) 와 ASGI(이벤트 루프) 의 동시 요청 처리량을 잽니다. (generate_dataset 먼저)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+        parser.add_argument('--interface', choices=INTERFACES, nargs='+', default=list(INTERFACES))
+        parser.add_argument('--only', nargs='+', help='이 이름의 route 만')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄씩 출력 (비교용)')
+        parser.add_argument(
+            '--compare-pool', action='store_true',
+            help='connection pool 을 끄고 (매 요청 connect) 켠 결과를 나란히 잽니다. '
+                 '(ENGINE 이 realworld.apps.core.db.backends.*, CONN_MAX_AGE=0 일 때)'
+        )
+
+    def handle(self, *args, **options):
+        if not Article.objects.exists():
+            raise CommandError('No articles. Run generate_dataset first.')
+
+        viewer, endpoints = get_endpoints()
+        endpoints = [endpoint for endpoint in endpoints if endpoint.method == 'get']
+        if options['only']:
+            endpoints = [endpoint for endpoint in endpoints if endpoint.name in options['only']]
+
+        pools = get_configured_pools() if options['compare_pool'] else []
+        if options['compare_pool'] and not pools:
+            raise CommandError('--compare-pool needs a pooled ENGINE (realworld.apps.core.db.backends.*).')
+        pool_modes = ('off', 'on') if pools else (None,)
+
+        if not options['json']:
+            self.stdout.write(
+                f'{"route":<22} {"interface":>9} {"conc":>5} {"pool":>4} {"status":>6} {"req/s":>9} '
+                f'{"p50 ms":>8} {"p99 ms":>8} {"connects":>8}'
+            )
+        for concurrency in options['concurrency']:
+            benchmark = ConcurrencyBenchmark(viewer, requests=options['requests'], concurrency=concurrency)
+            for endpoint in endpoints:
+                for interface in options['interface']:
+                    for pool_mode in pool_modes:
+                        result = self.run(benchmark, endpoint, interface, pools, pool_mode)
+                        self.stdout.write(json.dumps(result) if options['json'] else self.format(result))
+
+    @staticmethod
+    def run(benchmark, endpoint, interface, pools, pool_mode):
+        """
+        pool_mode 가 'off' 면 pool 을 비우고 돌려받는 connection 을 바로 닫는다. (pool 이 없는 것과 같다)
+        """
+        with ExitStack() as stack:
+            if pool_mode == 'off':
+                for pool in pools:
+                    stack.enter_context(pool.bypassed())
+            before = [pool.stats() for pool in pools]
+            result = benchmark.run(endpoint, interface)
+            after = [pool.stats() for pool in pools]
+        result['pool'] = pool_mode
+        result['connects'] = sum(end['created'] - start['created'] for start, end in zip(before, after))
+        result['connect_ms'] = sum(
+            end['connect_seconds'] - start['connect_seconds'] for start, end in zip(before, after)
+        ) * 1000
+        return result
+
+    @staticmethod
+    def format(result):
+        return (
+            f'{result["name"]:<22} {result["interface"]:>9} {result["concurrency"]:>5} {result["pool"] or "-":>4} '
+            f'{result["status"]:>6} {result["requests_per_second"]:9.1f} '
+            f'{result["p50_ms"]:8.2f} {result["p99_ms"]:8.2f} {result["connects"]:>8}'
+        )
+
+
+def get_configured_pools():
+    return [
+        connections[alias].pool for alias in connections
+        if isinstance(connections[alias], PooledDatabaseWrapperMixin)
+    ]
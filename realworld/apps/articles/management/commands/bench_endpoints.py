@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from realworld.apps.articles.benchmark import EndpointBenchmark, get_endpoints
+from realworld.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    help = 'API route 마다 p50 / p95 지연시간, 요청당 query 수, 메모리 할당량을 잽니다. (generate_dataset 먼저)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--allocations', action='store_true', help='tracemalloc 으로 최대 할당량도 잽니다.')
+        parser.add_argument('--only', nargs='+', help='이 이름의 route 만')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON 한 줄씩 출력 (비교용)')
+
+    def handle(self, *args, **options):
+        if not Article.objects.exists():
+            raise CommandError('No articles. Run generate_dataset first.')
+
+        viewer, endpoints = get_endpoints()
+        if options['only']:
+            endpoints = [endpoint for endpoint in endpoints if endpoint.name in options['only']]
+
+        benchmark = EndpointBenchmark(
+            viewer,
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            allocations=options['allocations'],
+        )
+        if not options['json']:
+            self.stdout.write(
+                f'{"route":<22} {"status":>6} {"p50 ms":>8} {"p95 ms":>8} {"queries":>7} {"bytes":>8}'
+                + (f' {"alloc KiB":>9}' if options['allocations'] else '')
+            )
+        for endpoint in endpoints:
+            result = benchmark.run(endpoint)
+            self.stdout.write(json.dumps(result) if options['json'] else self.format(result))
+
+    @staticmethod
+    def format(result):
+        line = (
+            f'{result["name"]:<22} {result["status"]:>6} {result["p50_ms"]:8.2f} {result["p95_ms"]:8.2f} '
+            f'{result["queries"]:>7} {result["bytes"]:>8}'
+        )
+        if 'alloc_kib' in result:
+            line += f' {result["alloc_kib"]:9.1f}'
+        return line
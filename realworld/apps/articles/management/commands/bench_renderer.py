@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from realworld.apps.articles.renderers import ArticleJSONRenderer
+from realworld.apps.core.json_backends import JSON_BACKENDS, OrjsonBackend, orjson
+
+
+def get_article_page(size):
+    now = timezone.now()
+    return {
+        'count': size,
+        'results': [
+            {
+                'author': {
+                    'username': f'author{i}',
+                    'bio': '자기소개 ' * 5,
+                    'image': 'https://static.productionready.io/images/smiley-cyrus.jpg',
+                    'following': bool(i % 2),
+                },
+                'slug': f'article-title-{i}-abc123',
+                'title': f'Article title {i}',
+                'body': '본문 내용입니다. ' * 40,
+                'description': 'description ' * 5,
+                'tagList': ['django', 'react', f'tag{i}'],
+                'favorited': bool(i % 3),
+                'favoritesCount': i,
+                'createdAt': now,
+                'updatedAt': now,
+            }
+            for i in range(size)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'ArticleJSONRenderer 로 20, 100 개짜리 article 페이지를 렌더링하는 속도(bytes/sec)를 잽니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+        parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100])
+
+    def handle(self, *args, **options):
+        renderer = ArticleJSONRenderer()
+        for size in options['sizes']:
+            page = get_article_page(size)
+            for name in JSON_BACKENDS:
+                if name == OrjsonBackend.name and orjson is None:
+                    self.stdout.write(f'{size:>4} items {name:>7}: orjson is not installed')
+                    continue
+                renderer.json_backend = name
+                self.stdout.write(self.measure(renderer, page, size, name, options['iterations']))
+
+    @staticmethod
+    def measure(renderer, page, size, name, iterations):
+        total_bytes = 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            total_bytes += len(renderer.render(page))
+        elapsed = time.perf_counter() - started
+        return (
+            f'{size:>4} items {name:>7}: '
+            f'{total_bytes / elapsed / 1024 / 1024:8.1f} MiB/s, '
+            f'{iterations / elapsed:8.0f} pages/s, '
+            f'{total_bytes // iterations} bytes/page'
+        )
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from realworld.apps.articles.transfer import DEFAULT_CHUNK_SIZE, export_articles
+
+
+class Command(BaseCommand):
+    help = '글을 태그, 좋아요와 함께 NDJSON 으로 내보냅니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help='출력 파일 (- 이면 stdout)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['path'] == '-':
+            written = export_articles(self.stdout, chunk_size=options['chunk_size'])
+        else:
+            with open(options['path'], 'w', encoding='utf-8') as stream:
+                written = export_articles(stream, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        # stdout 은 데이터이므로 통계는 stderr 로
+        self.stderr.write(f'{written} articles exported in {elapsed:.1f}s ({written / max(elapsed, 1e-9):.0f} rows/s)')
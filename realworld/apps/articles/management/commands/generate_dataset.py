@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from realworld.apps.articles.synthetic import DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = '벤치마크용 사용자, 팔로우, 글, 태그, 좋아요, 댓글을 bulk insert 로 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--articles', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--follows', type=int, default=20, help='사용자당 평균 팔로우 수')
+        parser.add_argument('--favorites', type=int, default=30, help='사용자당 평균 좋아요 수')
+        parser.add_argument('--comments', type=int, default=3, help='글당 평균 댓글 수')
+        parser.add_argument('--exponent', type=float, default=1.1, help='Zipf 지수 (클수록 인기 항목에 몰린다)')
+        parser.add_argument('--prefix', default='bench', help='username, slug, tag 이름 앞에 붙일 문자열')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        generator = DatasetGenerator(
+            users=options['users'],
+            articles=options['articles'],
+            tags=options['tags'],
+            follows=options['follows'],
+            favorites=options['favorites'],
+            comments=options['comments'],
+            exponent=options['exponent'],
+            prefix=options['prefix'],
+            seed=options['seed'],
+            stdout=self.stdout,
+        )
+        started = time.perf_counter()
+        counts = generator.generate()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{sum(counts.values())} rows in {elapsed:.1f}s')
@@ -0,0 +1,29 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from realworld.apps.articles.transfer import DEFAULT_CHUNK_SIZE, ArticleImporter
+
+
+class Command(BaseCommand):
+    help = 'export_articles 의 NDJSON 을 bulk insert 로 가져옵니다. (작성자, 좋아요한 사용자는 미리 있어야 합니다)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='입력 파일 (- 이면 stdin)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        importer = ArticleImporter(chunk_size=options['chunk_size'])
+        started = time.perf_counter()
+        if options['path'] == '-':
+            counts = importer.run(sys.stdin)
+        else:
+            with open(options['path'], encoding='utf-8') as stream:
+                counts = importer.run(stream)
+        elapsed = time.perf_counter() - started
+
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f'{name}: {count}')
+        rate = counts['articles'] / max(elapsed, 1e-9)
+        self.stdout.write(f'{counts["articles"]} articles imported in {elapsed:.1f}s ({rate:.0f} rows/s)')
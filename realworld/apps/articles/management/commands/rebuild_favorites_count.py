@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from realworld.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    help = 'favorited_by through 테이블로부터 Article.favorites_count 를 다시 계산합니다.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Article.objects.rebuild_favorites_count()
+        self.stdout.write(f'{updated} articles rebuilt.')
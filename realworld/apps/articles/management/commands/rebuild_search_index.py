@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from realworld.apps.articles.models import Article
+from realworld.apps.articles.search import INDEX_BATCH_SIZE, get_search_backend
+from realworld.apps.core.utils import chunked
+
+
+class Command(BaseCommand):
+    help = '검색 색인을 비우고 모든 글을 다시 넣습니다. (bulk insert, backend 변경 뒤)'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        started = time.perf_counter()
+        indexed = 0
+        with transaction.atomic():
+            backend.clear()
+            article_ids = Article.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=INDEX_BATCH_SIZE)
+            for chunk in chunked(article_ids, INDEX_BATCH_SIZE):
+                backend.index(chunk)
+                indexed += len(chunk)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{indexed} articles indexed ({backend.name}) in {elapsed:.1f}s')
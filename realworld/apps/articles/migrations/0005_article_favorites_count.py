@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:58
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_favorites_count(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Profile = apps.get_model('profiles', 'Profile')
+    favorites = Profile.favorites.through.objects.filter(
+        article_id=OuterRef('pk')
+    ).order_by().values('article_id').annotate(count=Count('*')).values('count')
+    Article.objects.update(
+        favorites_count=Coalesce(Subquery(favorites, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_profile_favorites'),
+        ('articles', '0004_article_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_favorites_count, migrations.RunPython.noop),
+    ]
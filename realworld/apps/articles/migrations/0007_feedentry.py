@@ -0,0 +1,78 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+# 앱 코드가 바뀌어도 migration 은 그대로 돌도록 feeds 의 기본값을 옮겨 둔다.
+DEFAULT_FEED_FANOUT_MAX_FOLLOWERS = 5000
+DEFAULT_FEED_BACKFILL_SIZE = 200
+
+
+def backfill_feed_entries(apps, schema_editor):
+    """
+    feeds.backfill_feed 와 같은 규칙으로 채운다.
+    팔로워가 FEED_FANOUT_MAX_FOLLOWERS 보다 많은 작성자는 건너뛰고 (읽을 때 합친다), 작성자마다 최근 FEED_BACKFILL_SIZE 개만 펼친다.
+    """
+    max_followers = getattr(settings, 'FEED_FANOUT_MAX_FOLLOWERS', DEFAULT_FEED_FANOUT_MAX_FOLLOWERS)
+    backfill_size = getattr(settings, 'FEED_BACKFILL_SIZE', DEFAULT_FEED_BACKFILL_SIZE)
+    Article = apps.get_model('articles', 'Article')
+    FeedEntry = apps.get_model('articles', 'FeedEntry')
+    Profile = apps.get_model('profiles', 'Profile')
+    Follow = Profile.follows.through
+    author_ids = Follow.objects.order_by().values('to_profile_id').annotate(
+        followers=Count('*')
+    ).filter(followers__lte=max_followers).values_list('to_profile_id', flat=True)
+
+    for author_id in author_ids.iterator():
+        articles = list(Article.objects.filter(author_id=author_id).order_by(
+            '-created_at', '-id'
+        ).values_list('pk', 'created_at')[:backfill_size])
+        if not articles:
+            continue
+        follower_ids = Follow.objects.filter(to_profile_id=author_id).values_list('from_profile_id', flat=True)
+        FeedEntry.objects.bulk_create([
+            FeedEntry(
+                follower_id=follower_id,
+                article_id=article_id,
+                author_id=author_id,
+                created_at=created_at,
+            )
+            for follower_id in follower_ids
+            for article_id, created_at in articles
+        ], batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_profile_favorites'),
+        ('articles', '0006_article_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='articles.article')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='profiles.profile')),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='profiles.profile')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['follower', 'created_at'], name='feed_follower_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['follower', 'author'], name='feed_follower_author_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedentry',
+            constraint=models.UniqueConstraint(fields=('follower', 'article'), name='feed_follower_article_unique'),
+        ),
+        migrations.RunPython(backfill_feed_entries, migrations.RunPython.noop),
+    ]
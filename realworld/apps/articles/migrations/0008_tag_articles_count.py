@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_articles_count(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Tag = apps.get_model('articles', 'Tag')
+    articles = Article.tags.through.objects.filter(
+        tag_id=OuterRef('pk')
+    ).order_by().values('tag_id').annotate(count=Count('*')).values('count')
+    Tag.objects.update(
+        articles_count=Coalesce(Subquery(articles, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_feedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='articles_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(fill_articles_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_tag_articles_count'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='article',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AlterField(
+            model_name='tag',
+            name='tag',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', 'created_at', 'id'], name='article_author_created_at_idx'),
+        ),
+        # 자동으로 만들어진 through 모델에는 Meta.indexes 를 줄 수 없어서 직접 만든다.
+        # unique (article_id, tag_id) 는 이미 있으므로 tag 쪽에서 들어가는 순서만 추가한다.
+        # profiles_profile_favorites 는 unique (profile_id, article_id) 가 이미 그 순서다.
+        migrations.RunSQL(
+            'CREATE INDEX "article_tags_tag_article_idx" ON "articles_article_tags" ("tag_id", "article_id");',
+            'DROP INDEX "article_tags_tag_article_idx";',
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:39
+
+from django.core.management.color import no_style
+from django.db import migrations, models
+
+SLUG_BLOCK_SIZE = 1000
+MAXIMUM_SLUG_BLOCK = 2 ** 63 - 1
+BASE36_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def reserve_existing_slugs(apps, schema_editor):
+    """
+    이미 '--' + base36 번호로 끝나는 slug 가 있으면 그 번호가 든 block 을 미리 예약한다.
+    이전 방식의 slug ('-' + 무작위 6글자) 에는 '--' 가 없어서 allocator 가 만들 slug 와 겹치지 않는다.
+    """
+    Article = apps.get_model('articles', 'Article')
+    SlugBlock = apps.get_model('articles', 'SlugBlock')
+    blocks = set()
+    for slug in Article.objects.filter(slug__contains='--').values_list('slug', flat=True).iterator():
+        suffix = slug.rpartition('--')[2]
+        if suffix and not suffix.strip(BASE36_DIGITS):
+            block = int(suffix, 36) // SLUG_BLOCK_SIZE
+            if 0 < block <= MAXIMUM_SLUG_BLOCK:
+                blocks.add(block)
+    if not blocks:
+        return
+
+    SlugBlock.objects.bulk_create([SlugBlock(pk=block) for block in sorted(blocks)])
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [SlugBlock]):
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0010_comment_article_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugBlock',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(reserve_existing_slugs, migrations.RunPython.noop),
+    ]
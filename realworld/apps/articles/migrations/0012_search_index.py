@@ -0,0 +1,115 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:43
+
+import re
+from collections import Counter
+
+from django.db import OperationalError, migrations, models
+import django.db.models.deletion
+
+FTS_TABLE = 'articles_article_fts'
+MAX_TERM_LENGTH = 64
+BATCH_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def create_fts_table(apps, schema_editor):
+    """
+    SQLite 이고 FTS5 가 있을 때만 만든다. 없으면 검색은 python backend 로 돈다.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, description, body, tags, tokenize='unicode61')"
+        )
+    except OperationalError:
+        pass
+
+
+def has_fts_table(schema_editor):
+    connection = schema_editor.connection
+    return connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+
+
+def tokenize(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+def build_search_index(apps, schema_editor):
+    """
+    search.PythonSearchBackend, Fts5SearchBackend 의 index 와 같은 규칙으로 이미 있는 글을 넣는다.
+    FTS5 테이블이 있으면 거기에도 넣는다.
+    """
+    Article = apps.get_model('articles', 'Article')
+    SearchDocument = apps.get_model('articles', 'SearchDocument')
+    SearchPosting = apps.get_model('articles', 'SearchPosting')
+    ArticleTag = Article.tags.through
+    use_fts = has_fts_table(schema_editor)
+
+    rows = Article.objects.order_by('pk').values_list('pk', 'title', 'description', 'body')
+    article_ids = list(Article.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(article_ids), BATCH_SIZE):
+        chunk = article_ids[start:start + BATCH_SIZE]
+        tag_lists = {article_id: [] for article_id in chunk}
+        for article_id, tag in ArticleTag.objects.filter(article_id__in=chunk).order_by('pk').values_list(
+            'article_id', 'tag__tag'
+        ):
+            tag_lists[article_id].append(tag)
+        documents = [(*row, ' '.join(tag_lists[row[0]])) for row in rows.filter(pk__in=chunk)]
+
+        search_documents, postings = [], []
+        for article_id, *fields in documents:
+            frequencies = Counter(token for field in fields for token in tokenize(field))
+            length = sum(frequencies.values())
+            search_documents.append(SearchDocument(article_id=article_id, length=length))
+            postings.extend(
+                SearchPosting(term=term, article_id=article_id, frequency=frequency, length=length)
+                for term, frequency in frequencies.items()
+            )
+        SearchDocument.objects.bulk_create(search_documents, batch_size=BATCH_SIZE)
+        SearchPosting.objects.bulk_create(postings, batch_size=BATCH_SIZE)
+        if use_fts:
+            with schema_editor.connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, title, description, body, tags) VALUES (%s, %s, %s, %s, %s)',
+                    documents
+                )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_slug_block'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='articles.article')),
+                ('length', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.PositiveIntegerField()),
+                ('length', models.PositiveIntegerField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.article')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchposting',
+            constraint=models.UniqueConstraint(fields=('term', 'article'), name='search_posting_term_article_unique'),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
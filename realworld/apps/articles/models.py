@@ -1,6 +1,47 @@
 from django.db import models
+from django.db.models import BooleanField, Count, Exists, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 
 from realworld.apps.core.models import TimestampedModel
+from realworld.apps.profiles.models import Profile, following_expression
+
+
+def get_profile_id(username):
+    return Profile.objects.filter(user__username=username).values_list('pk', flat=True).first()
+
+
+class ArticleQuerySet(models.QuerySet):
+    def with_author(self):
+        return self.select_related('author', 'author__user')
+
+    def with_viewer_state(self, viewer):
+        """
+        viewer(Profile)가 좋아요를 눌렀는지, 작성자를 팔로우하는지 여부를 annotate
+        """
+        if viewer is None:
+            return self.annotate(
+                favorited=Value(False, output_field=BooleanField()),
+                author_following=following_expression(None),
+            )
+
+        return self.annotate(
+            favorited=Exists(Profile.favorites.through.objects.filter(
+                profile_id=viewer.pk,
+                article_id=OuterRef('pk'),
+            )),
+            author_following=following_expression(viewer, 'author_id'),
+        )
+
+    def for_listing(self, viewer=None):
+        return self.with_author().prefetch_related('tags').with_viewer_state(viewer)
+
+    def rebuild_favorites_count(self):
+        favorites = Profile.favorites.through.objects.filter(
+            article_id=OuterRef('pk')
+        ).order_by().values('article_id').annotate(count=Count('*')).values('count')
+        return self.update(
+            favorites_count=Coalesce(Subquery(favorites, output_field=IntegerField()), 0)
+        )
 
 
 class Article(TimestampedModel):
@@ -8,6 +49,7 @@ class Article(TimestampedModel):
     title = models.CharField(db_index=True, max_length=255)
     description = models.TextField()
     body = models.TextField()
+    favorites_count = models.PositiveIntegerField(default=0)
 
     author = models.ForeignKey(
         'profiles.Profile',
@@ -19,10 +61,28 @@ class Article(TimestampedModel):
         'articles.Tag', related_name='articles'
     )
 
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta(TimestampedModel.Meta):
+        # keyset 페이지네이션과 같은 순서라서 인덱스만으로 정렬이 끝난다.
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='article_created_at_id_idx'),
+            models.Index(fields=['author', 'created_at', 'id'], name='article_author_created_at_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class SlugBlock(models.Model):
+    """
+    slugs.SlugAllocator 가 예약한 번호 block. pk 만 쓴다.
+    """
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
 class Comment(TimestampedModel):
     body = models.TextField()
     article = models.ForeignKey(
@@ -36,13 +96,119 @@ class Comment(TimestampedModel):
         on_delete=models.CASCADE
     )
 
+    class Meta(TimestampedModel.Meta):
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['article', 'created_at', 'id'], name='comment_article_created_at_idx'),
+        ]
+
     def __str__(self):
         return self.body
 
 
+class TagQuerySet(models.QuerySet):
+    def resolve(self, names):
+        """
+        태그 이름 목록을 Tag 목록으로 (slug 기준, 입력 순서, 중복 제거)
+        SELECT 한 번 + 없는 것만 bulk_create(ignore_conflicts) + 새로 만든 것 SELECT 한 번
+        동시에 같은 태그를 만드는 요청이 있어도 unique slug 충돌은 무시하고 다시 읽는다.
+        """
+        names_by_slug = {}
+        for name in names:
+            names_by_slug.setdefault(name.lower(), name)
+
+        tags = {tag.slug: tag for tag in self.filter(slug__in=names_by_slug.keys())}
+        missing = [slug for slug in names_by_slug if slug not in tags]
+        if missing:
+            self.bulk_create(
+                [Tag(tag=names_by_slug[slug], slug=slug) for slug in missing],
+                ignore_conflicts=True
+            )
+            tags.update({tag.slug: tag for tag in self.filter(slug__in=missing)})
+        return [tags[slug] for slug in names_by_slug]
+
+    def popular(self, top):
+        return self.filter(articles_count__gt=0).order_by('-articles_count', 'slug')[:top]
+
+    def rebuild_articles_count(self):
+        articles = Article.tags.through.objects.filter(
+            tag_id=OuterRef('pk')
+        ).order_by().values('tag_id').annotate(count=Count('*')).values('count')
+        return self.update(
+            articles_count=Coalesce(Subquery(articles, output_field=IntegerField()), 0)
+        )
+
+
 class Tag(TimestampedModel):
-    tag = models.CharField(max_length=255)
+    tag = models.CharField(db_index=True, max_length=255)
     slug = models.SlugField(db_index=True, unique=True)
+    articles_count = models.PositiveIntegerField(default=0, db_index=True)
+
+    objects = TagQuerySet.as_manager()
 
     def __str__(self):
         return self.tag
+
+
+class FeedEntry(models.Model):
+    """
+    팔로워마다 미리 펼쳐둔(fan-out-on-write) 피드 한 줄
+    created_at 은 article 의 것을 복사해서 (follower, created_at, article) 인덱스로 피드 순서 그대로 범위 조회한다.
+    """
+    follower = models.ForeignKey(
+        'profiles.Profile',
+        related_name='feed_entries',
+        on_delete=models.CASCADE
+    )
+    article = models.ForeignKey(
+        'articles.Article',
+        related_name='feed_entries',
+        on_delete=models.CASCADE
+    )
+    author = models.ForeignKey(
+        'profiles.Profile',
+        related_name='+',
+        on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['follower', 'article'], name='feed_follower_article_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['follower', 'created_at', 'article'], name='feed_follower_created_id_idx'),
+            models.Index(fields=['follower', 'author'], name='feed_follower_author_idx'),
+        ]
+
+
+class SearchDocument(models.Model):
+    """
+    python 검색 backend 의 문서 길이 (BM25 의 문서 길이 정규화용)
+    """
+    article = models.OneToOneField(
+        'articles.Article',
+        primary_key=True,
+        related_name='+',
+        on_delete=models.CASCADE
+    )
+    length = models.PositiveIntegerField()
+
+
+class SearchPosting(models.Model):
+    """
+    python 검색 backend 의 역색인 한 줄 (term 이 article 에 frequency 번 나온다)
+    """
+    term = models.CharField(max_length=64)
+    article = models.ForeignKey(
+        'articles.Article',
+        related_name='+',
+        on_delete=models.CASCADE
+    )
+    frequency = models.PositiveIntegerField()
+    length = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'article'], name='search_posting_term_article_unique'),
+        ]
@@ -0,0 +1,189 @@
+"""
+글 목록의 tag, author, favorited 필터를 합치는 planner
+필터 하나는 예전처럼 인덱스를 타는 JOIN 한 번으로 건다.
+여러 개면 각 필터를 article id 집합으로 보고, 가장 작을 것으로 보이는 집합부터 시작한다.
+- 예상 크기는 tag 는 Tag.articles_count, author / favorited 는 인덱스만 읽는 COUNT 로 구한다.
+- 가장 작은 집합이 ARTICLE_FILTER_IN_MEMORY_LIMIT 이하이면 그 id 를 읽어서 나머지 필터는 그 id 안에서만 확인한다.
+  이후 목록 query 는 그 id 만 정렬하므로 비용이 가장 작은 집합 크기를 따른다.
+- 아니면 작은 것부터 pk IN (subquery) 로 건다. (M2M JOIN 을 겹치지 않으므로 중복 row 가 없다)
+tag 는 여러 개 줄 수 있고 (?tag=a&tag=b), ?tag_mode=all (기본, 모두 붙은 글) 또는 any (하나라도)
+"""
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from realworld.apps.articles.models import Article, Tag, get_profile_id
+from realworld.strings import INVALID_TAG_MODE
+
+DEFAULT_ARTICLE_FILTER_IN_MEMORY_LIMIT = 500
+TAG_MODE_ALL = 'all'
+TAG_MODE_ANY = 'any'
+
+ArticleTag = Article.tags.through
+Favorite = Article.favorited_by.through
+
+
+def get_in_memory_limit():
+    return getattr(settings, 'ARTICLE_FILTER_IN_MEMORY_LIMIT', DEFAULT_ARTICLE_FILTER_IN_MEMORY_LIMIT)
+
+
+class ArticleFilter:
+    """
+    article id 집합 하나. ids 는 article id 를 돌려주는 values_list queryset, id_field 는 그 id 의 필드 이름
+    """
+    estimate_is_free = False
+
+    def __init__(self, ids, id_field='article_id'):
+        self.ids = ids
+        self.id_field = id_field
+        self._estimate = None
+
+    @property
+    def estimate(self):
+        if self._estimate is None:
+            self._estimate = self.ids.count()
+        return self._estimate
+
+    def apply(self, queryset):
+        """
+        필터가 하나뿐일 때. 기본은 pk IN (subquery)
+        """
+        return queryset.filter(pk__in=self.ids)
+
+    def probe(self, article_ids):
+        return set(self.ids.filter(**{f'{self.id_field}__in': article_ids}))
+
+
+class TagFilter(ArticleFilter):
+    estimate_is_free = True
+
+    def __init__(self, tag_ids, estimate):
+        super().__init__(ArticleTag.objects.filter(tag_id__in=tag_ids).values_list('article_id', flat=True))
+        self.tag_ids = tag_ids
+        self._estimate = estimate
+
+    def apply(self, queryset):
+        if len(self.tag_ids) == 1:
+            return queryset.filter(tags=self.tag_ids[0])
+        return super().apply(queryset)
+
+
+class AuthorFilter(ArticleFilter):
+    def __init__(self, author_id):
+        super().__init__(Article.objects.filter(author_id=author_id).values_list('pk', flat=True), 'pk')
+        self.author_id = author_id
+
+    def apply(self, queryset):
+        return queryset.filter(author_id=self.author_id)
+
+
+class FavoritedFilter(ArticleFilter):
+    def __init__(self, profile_id):
+        super().__init__(Favorite.objects.filter(profile_id=profile_id).values_list('article_id', flat=True))
+        self.profile_id = profile_id
+
+    def apply(self, queryset):
+        return queryset.filter(favorited_by=self.profile_id)
+
+
+class ArticleFilterPlanner:
+    tag_query_param = 'tag'
+    tag_mode_query_param = 'tag_mode'
+    author_query_param = 'author'
+    favorited_query_param = 'favorited'
+
+    def __init__(self, query_params):
+        self.query_params = query_params
+
+    def filter(self, queryset):
+        filters = self.get_filters()
+        if filters is None:
+            return queryset.none()
+        if not filters:
+            return queryset
+        if len(filters) == 1:
+            return filters[0].apply(queryset)
+        return self.intersect(queryset, filters)
+
+    def get_filters(self):
+        """
+        필터 목록. 이름이 없어서 결과가 비는 것이 확실하면 None
+        """
+        filters = self.get_tag_filters()
+        if filters is None:
+            return None
+
+        author = self.query_params.get(self.author_query_param, None)
+        if author is not None:
+            author_id = get_profile_id(author)
+            if author_id is None:
+                return None
+            filters.append(AuthorFilter(author_id))
+
+        favorited = self.query_params.get(self.favorited_query_param, None)
+        if favorited is not None:
+            profile_id = get_profile_id(favorited)
+            if profile_id is None:
+                return None
+            filters.append(FavoritedFilter(profile_id))
+        return filters
+
+    def get_tag_mode(self):
+        mode = self.query_params.get(self.tag_mode_query_param, TAG_MODE_ALL)
+        if mode not in (TAG_MODE_ALL, TAG_MODE_ANY):
+            raise ValidationError({self.tag_mode_query_param: INVALID_TAG_MODE})
+        return mode
+
+    def get_tag_filters(self):
+        names = list(dict.fromkeys(self.query_params.getlist(self.tag_query_param)))
+        if not names:
+            return []
+        mode = self.get_tag_mode()
+
+        tags_by_name = {}
+        for pk, name, articles_count in Tag.objects.filter(tag__in=names).values_list('pk', 'tag', 'articles_count'):
+            tags_by_name.setdefault(name, []).append((pk, articles_count))
+
+        if mode == TAG_MODE_ANY:
+            tags = [tag for name in names for tag in tags_by_name.get(name, ())]
+            if not tags:
+                return None
+            return [self.make_tag_filter(tags)]
+
+        if len(tags_by_name) < len(names):
+            return None
+        return [self.make_tag_filter(tags_by_name[name]) for name in names]
+
+    @staticmethod
+    def make_tag_filter(tags):
+        return TagFilter([pk for pk, _ in tags], sum(articles_count for _, articles_count in tags))
+
+    @staticmethod
+    def order_by_estimate(filters):
+        """
+        예상 크기가 공짜인(tag) 필터 중 가장 작은 것이 이미 한도 안이면 나머지는 세지 않는다.
+        """
+        free = sorted((f for f in filters if f.estimate_is_free), key=lambda f: f.estimate)
+        counted = [f for f in filters if not f.estimate_is_free]
+        if free and free[0].estimate <= get_in_memory_limit():
+            return free + counted
+        return sorted(filters, key=lambda f: f.estimate)
+
+    def intersect(self, queryset, filters):
+        filters = self.order_by_estimate(filters)
+        smallest, others = filters[0], filters[1:]
+        if smallest.estimate == 0:
+            return queryset.none()
+
+        if smallest.estimate > get_in_memory_limit():
+            for article_filter in filters:
+                queryset = queryset.filter(pk__in=article_filter.ids)
+            return queryset
+
+        article_ids = set(smallest.ids)
+        for article_filter in others:
+            if not article_ids:
+                break
+            article_ids = article_filter.probe(article_ids)
+        if not article_ids:
+            return queryset.none()
+        return queryset.filter(pk__in=sorted(article_ids))
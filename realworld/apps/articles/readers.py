@@ -0,0 +1,109 @@
+"""
+GET 요청용 읽기 전용 경로
+ModelSerializer 대신 .values() row 와 annotate 값으로 바로 dict 를 만든다.
+출력은 ArticleSerializer, CommentSerializer 와 바이트 단위로 같아야 한다. (test_readers.py)
+"""
+from collections import defaultdict
+
+from django.db.models import F
+
+from realworld.apps.articles.models import Tag
+from realworld.apps.profiles.models import following_expression
+from realworld.apps.profiles.readers import read_profile
+
+ARTICLE_VALUES = (
+    'id', 'slug', 'title', 'body', 'description', 'favorites_count', 'created_at', 'updated_at',
+    'author_id', 'author__user__username', 'author__bio', 'author__image',
+    'favorited', 'author_following',
+)
+COMMENT_VALUES = (
+    'id', 'body', 'created_at', 'updated_at',
+    'author_id', 'author__user__username', 'author__bio', 'author__image',
+    'author_following',
+)
+
+
+def article_values(queryset):
+    """
+    Article.objects.for_listing(viewer) 로 annotate 된 queryset 을 받는다.
+    """
+    return queryset.prefetch_related(None).values(*ARTICLE_VALUES)
+
+
+def article_values_in_order(queryset, article_ids):
+    """
+    article_ids 순서대로 row 를 돌려준다. 그 사이에 지워진 글은 건너뛴다.
+    """
+    rows = {row['id']: row for row in article_values(queryset.filter(pk__in=article_ids))}
+    return [rows[article_id] for article_id in article_ids if article_id in rows]
+
+
+def comment_values(queryset, viewer=None):
+    return queryset.annotate(
+        author_following=following_expression(viewer, 'author_id')
+    ).values(*COMMENT_VALUES)
+
+
+def get_tag_lists(article_ids):
+    """
+    prefetch_related('tags') 와 같은 순서 (Tag 의 기본 ordering) 로 article 마다 태그 목록을 만든다.
+    """
+    tag_lists = defaultdict(list)
+    if not article_ids:
+        return tag_lists
+    tags = Tag.objects.filter(articles__in=article_ids).annotate(article_id=F('articles__id'))
+    for article_id, tag in tags.values_list('article_id', 'tag'):
+        tag_lists[article_id].append(tag)
+    return tag_lists
+
+
+def get_tag_list_by_slug(slug):
+    """
+    article row 와 따로 (동시에) 읽을 수 있도록 slug 로 태그 목록을 읽는다.
+    """
+    return list(Tag.objects.filter(articles__slug=slug).values_list('tag', flat=True))
+
+
+def read_author(row) -> dict:
+    return read_profile(
+        row['author__user__username'], row['author__bio'], row['author__image'], row['author_following']
+    )
+
+
+def read_articles(rows) -> list:
+    rows = list(rows)
+    tag_lists = get_tag_lists([row['id'] for row in rows])
+    return [read_article(row, tag_lists[row['id']]) for row in rows]
+
+
+def read_article(row, tag_list) -> dict:
+    return {
+        'author': read_author(row),
+        'slug': row['slug'],
+        'title': row['title'],
+        'body': row['body'],
+        'description': row['description'],
+        'tagList': tag_list,
+        'favorited': row['favorited'],
+        'favoritesCount': row['favorites_count'],
+        'createdAt': row['created_at'],
+        'updatedAt': row['updated_at'],
+    }
+
+
+def read_comments(rows) -> list:
+    return [read_comment(row) for row in rows]
+
+
+def read_comment(row) -> dict:
+    return {
+        'id': row['id'],
+        'author': read_author(row),
+        'body': row['body'],
+        'createdAt': row['created_at'],
+        'updatedAt': row['updated_at'],
+    }
+
+
+def get_cache_rows(rows):
+    return [(row['id'], row['author_id']) for row in rows]
@@ -1,15 +1,32 @@
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 
 from realworld.apps.articles.models import Tag
 
 
+class TagListRelatedField(serializers.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return Tag.objects.resolve(data)
+
+
 class TagRelatedField(serializers.RelatedField):
     def get_queryset(self):
         return Tag.objects.all()
 
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return TagListRelatedField(**list_kwargs)
+
     def to_internal_value(self, data):
-        tag, created = Tag.objects.get_or_create(tag=data, slug=data.lower())
-        return tag
+        return Tag.objects.resolve([data])[0]
 
     def to_representation(self, value):
         return value.tag
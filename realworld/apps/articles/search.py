@@ -0,0 +1,288 @@
+"""
+글 검색 (title, description, body, 태그 이름) - BM25 점수 순, (score, id) cursor 페이지네이션
+- fts5: SQLite FTS5 가상 테이블 (migration 0012 가 만든다). 점수는 FTS5 의 bm25()
+- python: SearchPosting 역색인 테이블을 term 으로만 읽고 BM25 는 python 에서 계산한다.
+ARTICLE_SEARCH_BACKEND 로 고르고, 주지 않으면 FTS5 테이블이 있으면 fts5, 없으면 python
+색인은 signals 에서 글, 태그가 바뀔 때마다 그 글만 commit 때 다시 넣는다. (bulk insert 뒤에는 rebuild_search_index)
+"""
+import base64
+import heapq
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from rest_framework.exceptions import NotFound
+
+from realworld.apps.articles.models import Article, SearchDocument, SearchPosting
+from realworld.apps.articles.readers import get_tag_lists
+from realworld.apps.core.cache import LRUCache
+from realworld.apps.core.pagination import INVALID_CURSOR, KeysetPagination
+
+FTS_TABLE = 'articles_article_fts'
+MAX_QUERY_TERMS = 16
+MAX_TERM_LENGTH = SearchPosting._meta.get_field('term').max_length
+BM25_K1 = 1.2
+BM25_B = 0.75
+SEARCH_STATS_TTL = 60
+INDEX_BATCH_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+def get_query_terms(query):
+    """
+    중복을 뺀 앞쪽 MAX_QUERY_TERMS 개
+    """
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def get_documents(article_ids):
+    """
+    (id, title, description, body, 태그 이름들) - 글 한 번, 태그 한 번 읽는다.
+    """
+    rows = Article.objects.filter(pk__in=article_ids).values_list('pk', 'title', 'description', 'body')
+    rows = list(rows)
+    tag_lists = get_tag_lists([row[0] for row in rows])
+    return [(*row, ' '.join(tag_lists[row[0]])) for row in rows]
+
+
+def bm25(frequency, length, document_frequency, document_count, average_length):
+    idf = math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / max(average_length, 1))
+    return idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+
+def lock_articles(article_ids):
+    """
+    같은 글의 색인을 다시 넣는 transaction 들을 줄 세운다. (SQLite 는 쓰기가 이미 한 번에 하나다)
+    """
+    if connection.features.has_select_for_update:
+        list(Article.objects.select_for_update().filter(pk__in=article_ids).values_list('pk', flat=True))
+
+
+class PythonSearchBackend:
+    name = 'python'
+    stats = LRUCache(maxsize=1, ttl=SEARCH_STATS_TTL)
+
+    def index(self, article_ids):
+        """
+        지우고 다시 넣는 것을 한 transaction 에서 한다. 같은 글을 동시에 다시 넣어도 unique 제약에 걸리지 않는다.
+        """
+        article_ids = list(article_ids)
+        with transaction.atomic():
+            lock_articles(article_ids)
+            self.remove(article_ids)
+            self.insert(article_ids)
+
+    def insert(self, article_ids):
+        documents, postings = [], []
+        for article_id, *fields in get_documents(article_ids):
+            frequencies = Counter(token for field in fields for token in tokenize(field))
+            length = sum(frequencies.values())
+            documents.append(SearchDocument(article_id=article_id, length=length))
+            postings.extend(
+                SearchPosting(term=term, article_id=article_id, frequency=frequency, length=length)
+                for term, frequency in frequencies.items()
+            )
+        SearchDocument.objects.bulk_create(documents, batch_size=INDEX_BATCH_SIZE, ignore_conflicts=True)
+        SearchPosting.objects.bulk_create(postings, batch_size=INDEX_BATCH_SIZE, ignore_conflicts=True)
+
+    def remove(self, article_ids):
+        SearchPosting.objects.filter(article_id__in=article_ids).delete()
+        SearchDocument.objects.filter(article_id__in=article_ids).delete()
+
+    def clear(self):
+        SearchPosting.objects.all().delete()
+        SearchDocument.objects.all().delete()
+        self.stats.clear()
+
+    def get_stats(self):
+        """
+        (문서 수, 평균 길이). 검색마다 세지 않도록 SEARCH_STATS_TTL 초 동안 재사용한다.
+        """
+        stats = self.stats.get('stats')
+        if stats is None:
+            totals = SearchDocument.objects.aggregate(count=Count('pk'), length=Sum('length'))
+            count = totals['count']
+            stats = (count, (totals['length'] or 0) / count if count else 0)
+            self.stats.set('stats', stats)
+        return stats
+
+    def search(self, terms, limit, after=None, count=True):
+        """
+        term 으로 posting 만 읽고 점수를 매긴다. ([(article_id, score)], 전체 결과 수)
+        """
+        postings = list(SearchPosting.objects.filter(term__in=terms).values_list(
+            'term', 'article_id', 'frequency', 'length'
+        ))
+        document_frequencies = Counter(term for term, *_ in postings)
+        document_count, average_length = self.get_stats()
+        document_count = max(document_count, max(document_frequencies.values(), default=0))
+
+        scores = defaultdict(float)
+        for term, article_id, frequency, length in postings:
+            scores[article_id] += bm25(
+                frequency, length, document_frequencies[term], document_count, average_length
+            )
+
+        # 전체를 정렬하지 않고 cursor 뒤의 앞쪽 limit 개만 heap 으로 고른다.
+        hits = scores.items()
+        if after is not None:
+            after_key = rank_key((after[1], after[0]))
+            hits = (hit for hit in hits if rank_key(hit) > after_key)
+        return heapq.nsmallest(limit, hits, key=rank_key), len(scores) if count else None
+
+
+def rank_key(hit):
+    article_id, score = hit
+    return -score, -article_id
+
+
+class Fts5SearchBackend:
+    name = 'fts5'
+
+    def index(self, article_ids):
+        article_ids = list(article_ids)
+        with transaction.atomic():
+            lock_articles(article_ids)
+            self.remove(article_ids)
+            self.insert(article_ids)
+
+    def insert(self, article_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, body, tags) VALUES (%s, %s, %s, %s, %s)',
+                get_documents(article_ids)
+            )
+
+    def remove(self, article_ids):
+        if not article_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({", ".join(["%s"] * len(article_ids))})',
+                list(article_ids)
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    @staticmethod
+    def get_match_expression(terms):
+        return ' OR '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+    def search(self, terms, limit, after=None, count=True):
+        """
+        bm25() 는 작을수록 잘 맞으므로 부호를 바꿔서 python backend 와 같이 큰 점수가 앞에 오게 한다.
+        """
+        match = self.get_match_expression(terms)
+        params = [match]
+        position = ''
+        if after is not None:
+            score, article_id = after
+            position = 'WHERE score < %s OR (score = %s AND rowid < %s)'
+            params += [score, score, article_id]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, score FROM ('
+                f'SELECT rowid, -bm25({FTS_TABLE}) AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+                f') {position} ORDER BY score DESC, rowid DESC LIMIT %s',
+                params + [limit]
+            )
+            hits = [(article_id, score) for article_id, score in cursor.fetchall()]
+            total = None
+            if count:
+                cursor.execute(f'SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+                total = cursor.fetchone()[0]
+        return hits, total
+
+
+SEARCH_BACKENDS = {
+    PythonSearchBackend.name: PythonSearchBackend,
+    Fts5SearchBackend.name: Fts5SearchBackend,
+}
+
+
+def has_fts_table():
+    if connection.vendor != 'sqlite':
+        return False
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+_detected_backend = None
+
+
+def get_search_backend():
+    global _detected_backend
+    name = getattr(settings, 'ARTICLE_SEARCH_BACKEND', None)
+    if name is None:
+        if _detected_backend is None:
+            _detected_backend = Fts5SearchBackend.name if has_fts_table() else PythonSearchBackend.name
+        name = _detected_backend
+    return SEARCH_BACKENDS[name]()
+
+
+_pending = threading.local()
+
+
+def index_on_commit(article_ids):
+    """
+    transaction 이 commit 될 때 한 번만 색인한다. 같은 transaction 안에서 글을 저장하고 태그를 붙여도
+    (post_save, m2m_changed 가 모두 부른다) 모아둔 id 를 처음 실행되는 callback 이 한꺼번에 넣고 나머지는 할 일이 없다.
+    transaction 밖이면 바로 넣는다.
+    """
+    pending = getattr(_pending, 'article_ids', None)
+    if pending is None:
+        pending = _pending.article_ids = set()
+    pending.update(article_ids)
+    transaction.on_commit(index_pending)
+
+
+def index_pending():
+    article_ids = getattr(_pending, 'article_ids', None)
+    if article_ids:
+        _pending.article_ids = set()
+        get_search_backend().index(article_ids)
+
+
+class SearchPagination(KeysetPagination):
+    """
+    (score, id) 내림차순 cursor. 점수는 색인이 바뀌면 달라지므로 앞 페이지 cursor 는 주지 않는다.
+    """
+
+    def paginate_search(self, backend, terms, request):
+        self.request = request
+        self.cursor_mode = True
+        self.count_enabled = self.get_count_enabled(request)
+        self.limit = self.get_limit(request) or self.default_limit
+        self.position, _ = self.decode_cursor(request.query_params.get(self.cursor_query_param, ''))
+
+        hits, self.count = backend.search(terms, self.limit + 1, self.position, count=self.count_enabled)
+        self.previous_cursor = None
+        self.next_cursor = self.encode_cursor(hits[self.limit - 1]) if len(hits) > self.limit else None
+        return hits[:self.limit]
+
+    def encode_cursor(self, hit, reverse=False):
+        article_id, score = hit
+        payload = json.dumps({'s': score, 'i': article_id}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(encoded):
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return (float(payload['s']), int(payload['i'])), False
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(INVALID_CURSOR)
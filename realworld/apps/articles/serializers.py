@@ -1,7 +1,9 @@
+from django.db import transaction
 from rest_framework import serializers
 
 from realworld.apps.articles.models import Article, Comment, Tag
 from realworld.apps.articles.relations import TagRelatedField
+from realworld.apps.profiles.following import FollowStateListSerializer
 from realworld.apps.profiles.serializers import ProfileSerializer
 
 
@@ -33,25 +35,49 @@ class ArticleSerializer(serializers.ModelSerializer):
             'createdAt',
             'updatedAt',
         )
+        list_serializer_class = FollowStateListSerializer
 
+    @staticmethod
+    def get_followed_profile_ids(articles):
+        return [article.author_id for article in articles]
+
+    @transaction.atomic
     def create(self, validated_data):
+        """
+        글과 태그를 한 transaction 으로 저장해서 검색 색인이 commit 때 한 번만 들어가게 한다.
+        """
         author = self.context.get('author', None)
         tags = validated_data.pop('tags', [])
         article = Article.objects.create(author=author, **validated_data)
-        for tag in tags:
-            article.tags.add(tag)
+        if tags:
+            article.tags.add(*tags)
         return article
 
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        return super().update(instance, validated_data)
+
+    def to_representation(self, instance):
+        author_following = getattr(instance, 'author_following', None)
+        if author_following is not None:
+            instance.author.following = author_following
+        return super().to_representation(instance)
+
     def get_created_at(self, instance):
-        return instance.created_at.isoformat()
+        return instance.created_at
 
     def get_updated_at(self, instance):
-        return instance.updated_at.isoformat()
+        return instance.updated_at
 
     def get_favorited(self, instance) -> bool:
         """
         사용자가 좋아요를 누른 게시글인지? 여부를 반환
+        Article.objects.for_listing 으로 annotate 되어 있으면 쿼리 없이 읽는다.
         """
+        favorited = getattr(instance, 'favorited', None)
+        if favorited is not None:
+            return favorited
+
         request = self.context.get('request', None)
         if request is None:
             return False
@@ -62,7 +88,7 @@ class ArticleSerializer(serializers.ModelSerializer):
         return request.user.profile.has_favorited(instance)
 
     def get_favorites_count(self, instance) -> int:
-        return instance.favorited_by.count()
+        return instance.favorites_count
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -79,6 +105,11 @@ class CommentSerializer(serializers.ModelSerializer):
             'createdAt',
             'updatedAt',
         )
+        list_serializer_class = FollowStateListSerializer
+
+    @staticmethod
+    def get_followed_profile_ids(comments):
+        return [comment.author_id for comment in comments]
 
     def create(self, validated_data):
         article = self.context['article']
@@ -91,10 +122,10 @@ class CommentSerializer(serializers.ModelSerializer):
         )
 
     def get_created_at(self, instance):
-        return instance.created_at.isoformat()
+        return instance.created_at
 
     def get_updated_at(self, instance):
-        return instance.updated_at.isoformat()
+        return instance.updated_at
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -1,29 +1,276 @@
-from django.db.models.signals import pre_save
+from collections import Counter, defaultdict
+
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from django.utils.text import slugify
 
-from realworld.apps.articles.models import Article
-from realworld.apps.core.utils import generate_random_string
+from realworld.apps.articles.cache import article_response_cache, ALL_ARTICLES, ALL_TAGS, \
+    article_version_key, author_version_key, tag_version_key
+from realworld.apps.articles.feeds import backfill_feed, fan_out_article, mark_fan_out_on_read, trim_feed
+from realworld.apps.articles.models import Article, Tag
+from realworld.apps.articles.search import get_search_backend, index_on_commit
+from realworld.apps.articles.slugs import allocate_slug
+from realworld.apps.profiles.graph import bump_social_graphs
+from realworld.apps.profiles.models import Profile
+from realworld.apps.profiles.signals import favorites_changed
 
-MAXIMUM_SLUG_LENGTH = 255
+SOCIAL_GRAPH_THROUGH_FIELDS = {
+    Profile.follows.through: ('from_profile_id', 'to_profile_id'),
+    Profile.favorites.through: ('profile_id', 'article_id'),
+}
 
 
 @receiver(pre_save, sender=Article)
 def add_slug_to_article_if_not_exists(sender, instance, *args, **kwargs):
     if instance and not instance.slug:
-        instance.slug = get_slug_from_title(instance.title)
+        instance.slug = allocate_slug(instance.title)
+
+
+@receiver(post_save, sender=Article)
+def fan_out_new_article(sender, instance, created, *args, **kwargs):
+    if instance and created:
+        fan_out_article(instance)
+
 
+@receiver(m2m_changed, sender=Profile.follows.through)
+def update_feed_on_follow(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    follow 하면 작성자의 followers_count 를 올리고 최근 글을 피드에 채운다. unfollow 하면 반대로 한다.
+    remove, clear 는 실제로 지워질 row 만 세기 위해 pre_ 단계에서 미리 조회한다.
+    """
+    owner_field, target_field = ('to_profile_id', 'from_profile_id') if reverse else ('from_profile_id', 'to_profile_id')
+    if action in ('pre_remove', 'pre_clear'):
+        instance._removed_follow_ids = get_through_ids(
+            sender, instance, pk_set, owner_field, target_field, target_field
+        )
+        return
+    if action == 'post_add':
+        other_ids = list(pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        other_ids = getattr(instance, '_removed_follow_ids', [])
+        instance._removed_follow_ids = []
+    else:
+        return
 
-def get_slug_from_title(title):
-    slug = slugify(title)
-    unique = generate_random_string()
-    if len(slug) > MAXIMUM_SLUG_LENGTH:
-        slug = slug[:MAXIMUM_SLUG_LENGTH]
-    while len(slug + '-' + unique) > MAXIMUM_SLUG_LENGTH:
-        parts = slug.split('-')
+    author_ids = [instance.pk] * len(other_ids) if reverse else other_ids
+    add_to_counter(Profile, 'followers_count', author_ids, 1 if action == 'post_add' else -1)
+    if action == 'post_add':
+        mark_fan_out_on_read(set(author_ids))
 
-        if len(parts) is 1:
-            slug = slug[:MAXIMUM_SLUG_LENGTH - len(unique) - 1]
+    update = backfill_feed if action == 'post_add' else trim_feed
+    for other in Profile.objects.filter(pk__in=other_ids):
+        follower, author = (other, instance) if reverse else (instance, other)
+        update(follower, author)
+
+
+@receiver(m2m_changed, sender=Profile.favorites.through)
+def update_favorites_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    profile.favorites / article.favorited_by 의 add, remove, clear 를 favorites_count 에 반영
+    remove, clear 는 실제로 지워질 row 만 세기 위해 pre_ 단계에서 미리 조회한다.
+    """
+    if action == 'post_add':
+        if reverse:
+            article_ids = [instance.pk] * len(pk_set)
         else:
-            slug = '-'.join(parts[:-1])
-    return slug + '-' + unique
+            article_ids = list(pk_set)
+        add_favorites_count(article_ids, 1)
+    elif action in ('pre_remove', 'pre_clear'):
+        instance._removed_favorite_article_ids = get_favorite_article_ids(
+            sender, instance, reverse, pk_set
+        )
+    elif action in ('post_remove', 'post_clear'):
+        article_ids = getattr(instance, '_removed_favorite_article_ids', [])
+        add_favorites_count(article_ids, -1)
+        instance._removed_favorite_article_ids = []
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def update_tag_articles_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    article.tags / tag.articles 의 add, remove, clear 를 Tag.articles_count 에 반영
+    """
+    if action == 'post_add':
+        if reverse:
+            tag_ids = [instance.pk] * len(pk_set)
+        else:
+            tag_ids = list(pk_set)
+        add_to_counter(Tag, 'articles_count', tag_ids, 1)
+    elif action in ('pre_remove', 'pre_clear'):
+        owner_field, target_field = ('tag_id', 'article_id') if reverse else ('article_id', 'tag_id')
+        instance._removed_tag_ids = get_through_ids(
+            sender, instance, pk_set, owner_field, target_field, 'tag_id'
+        )
+    elif action in ('post_remove', 'post_clear'):
+        add_to_counter(Tag, 'articles_count', getattr(instance, '_removed_tag_ids', []), -1)
+        instance._removed_tag_ids = []
+
+
+@receiver(pre_delete, sender=Profile)
+def remove_favorites_count_of_profile(sender, instance, *args, **kwargs):
+    article_ids = get_favorite_article_ids(
+        Profile.favorites.through, instance, reverse=False, pk_set=None
+    )
+    add_favorites_count(article_ids, -1)
+
+
+@receiver(pre_delete, sender=Profile)
+def remove_followers_count_of_profile(sender, instance, *args, **kwargs):
+    author_ids = get_through_ids(
+        Profile.follows.through, instance, None, 'from_profile_id', 'to_profile_id', 'to_profile_id'
+    )
+    add_to_counter(Profile, 'followers_count', author_ids, -1)
+
+
+def get_favorite_article_ids(through, instance, reverse, pk_set):
+    owner_field, target_field = ('article_id', 'profile_id') if reverse else ('profile_id', 'article_id')
+    return get_through_ids(through, instance, pk_set, owner_field, target_field, 'article_id')
+
+
+def get_through_ids(through, instance, pk_set, owner_field, target_field, counted_field):
+    rows = through.objects.filter(**{owner_field: instance.pk})
+    if pk_set is not None:
+        rows = rows.filter(**{target_field + '__in': pk_set})
+    return list(rows.values_list(counted_field, flat=True))
+
+
+def add_favorites_count(article_ids, sign):
+    add_to_counter(Article, 'favorites_count', article_ids, sign)
+    bump_articles(set(article_ids))
+
+
+def add_to_counter(model, field_name, ids, sign):
+    """
+    같은 증감량을 가진 row 끼리 묶어서 UPDATE 한 번으로 처리
+    """
+    ids_by_delta = defaultdict(list)
+    for pk, count in Counter(ids).items():
+        ids_by_delta[sign * count].append(pk)
+
+    for delta, pks in ids_by_delta.items():
+        model.objects.filter(pk__in=pks).update(**{field_name: F(field_name) + delta})
+
+
+@receiver(favorites_changed, sender=Profile)
+def bump_favorited_articles(sender, article_ids, **kwargs):
+    bump_articles(article_ids)
+
+
+@receiver(favorites_changed, sender=Profile)
+def bump_social_graph_of_favoriter(sender, profile_ids, **kwargs):
+    bump_social_graphs(profile_ids)
+
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+@receiver(m2m_changed, sender=Profile.favorites.through)
+def bump_changed_social_graphs(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    follows, favorites 를 가진 쪽(팔로우한 사람, 좋아요 누른 사람)의 SocialGraph 공유 cache 를 무효화
+    reverse 의 clear 는 지워질 owner 를 pre_clear 에서 미리 읽는다.
+    """
+    if not reverse:
+        if action.startswith('post_'):
+            bump_social_graphs([instance.pk])
+        return
+
+    owner_field, target_field = SOCIAL_GRAPH_THROUGH_FIELDS[sender]
+    if action == 'pre_clear':
+        instance._cleared_graph_owner_ids = get_through_ids(
+            sender, instance, None, target_field, owner_field, owner_field
+        )
+    elif action == 'post_clear':
+        bump_social_graphs(getattr(instance, '_cleared_graph_owner_ids', []))
+        instance._cleared_graph_owner_ids = []
+    elif action in ('post_add', 'post_remove'):
+        bump_social_graphs(pk_set)
+
+
+@receiver(post_save, sender=Article)
+def bump_saved_article(sender, instance, created, *args, **kwargs):
+    article_response_cache.bump(article_version_key(instance.pk))
+    if created:
+        article_response_cache.bump(ALL_ARTICLES)
+
+
+@receiver(pre_delete, sender=Article)
+def remove_deleted_article(sender, instance, *args, **kwargs):
+    """
+    through row 는 signal 없이 cascade 로 지워지므로 태그 사용 수를 여기서 줄인다.
+    """
+    tags = list(instance.tags.values_list('pk', 'tag'))
+    add_to_counter(Tag, 'articles_count', [pk for pk, _ in tags], -1)
+    bump_articles([instance.pk], [tag for _, tag in tags])
+    article_response_cache.bump(ALL_TAGS)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def bump_tagged_articles(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        related = instance.articles if reverse else instance.tags
+        instance._cleared_tag_relation_ids = set(related.values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_tag_relation_ids', set())
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    if reverse:
+        bump_articles(pk_set, [instance.tag])
+    else:
+        bump_articles([instance.pk], Tag.objects.filter(pk__in=pk_set).values_list('tag', flat=True))
+    article_response_cache.bump(ALL_TAGS)
+
+
+@receiver(post_save, sender=Tag)
+def bump_saved_tag(sender, instance, created, *args, **kwargs):
+    article_response_cache.bump(ALL_TAGS)
+    if not created:
+        bump_articles(instance.articles.values_list('pk', flat=True), [instance.tag])
+
+
+@receiver(post_save, sender=Profile)
+def bump_saved_author(sender, instance, *args, **kwargs):
+    article_response_cache.bump(author_version_key(instance.pk), ALL_ARTICLES)
+
+
+@receiver(post_save, sender=Article)
+def index_saved_article(sender, instance, *args, **kwargs):
+    """
+    새 글에 태그를 붙이면 index_retagged_articles 도 부르지만, 같은 transaction 이면 commit 때 한 번만 넣는다.
+    """
+    index_on_commit([instance.pk])
+
+
+@receiver(post_delete, sender=Article)
+def unindex_deleted_article(sender, instance, *args, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def index_retagged_articles(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    post_clear 의 대상은 bump_tagged_articles 가 pre_clear 에서 읽어둔 것을 쓴다.
+    """
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_tag_relation_ids', set())
+    elif action not in ('post_add', 'post_remove'):
+        return
+    index_on_commit(pk_set if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+def index_renamed_tag_articles(sender, instance, created, *args, **kwargs):
+    if not created:
+        index_on_commit(instance.articles.values_list('pk', flat=True))
+
+
+def bump_articles(article_ids, tags=()):
+    """
+    article 의 내용, 좋아요 수, 태그가 바뀌면 그 article 과 목록(전체, 태그별)의 버전을 올린다.
+    """
+    article_response_cache.bump(
+        ALL_ARTICLES,
+        *[article_version_key(article_id) for article_id in article_ids],
+        *[tag_version_key(tag) for tag in tags]
+    )
+
@@ -0,0 +1,173 @@
+"""
+article slug = slugify(title) + '--' + base36(번호)
+번호는 SlugBlock row 하나로 SLUG_BLOCK_SIZE 개씩 예약해 두고 프로세스 안에서 차례로 꺼낸다.
+block 은 autoincrement pk 라서 프로세스끼리 겹치지 않고, slug 의 마지막 '--' 뒤가 번호이므로
+제목이 같거나 잘려도 slug 는 겹치지 않는다. 중복 검사 query 나 재시도가 없다.
+slugify 는 '-' 를 두 개 이어서 만들지 않으므로 '--' 는 allocator 가 만든 slug 의 표시다.
+이전 방식의 slug (slugify(title) + '-' + 무작위 6글자) 는 '--' 가 없어서 새 slug 와 겹칠 수 없다.
+PostgreSQL, MySQL 의 autoincrement 는 rollback 되어도 되돌아가지 않는다. SQLite 는 block 을 예약한
+transaction 이 rollback 되면 같은 block 이 다시 나올 수 있다. (unique index 가 마지막으로 막는다)
+import 로 원래 slug 를 유지할 때는 reserve_kept_slugs 로 그 번호가 든 block 을 예약한다.
+"""
+import os
+import string
+import threading
+
+from django.core.management.color import no_style
+from django.db import connections, router
+from django.utils.text import slugify
+
+from realworld.apps.articles.models import SlugBlock
+
+MAXIMUM_SLUG_LENGTH = 255
+SLUG_BLOCK_SIZE = 1000
+MAXIMUM_SLUG_BLOCK = 2 ** 63 - 1
+SLUG_NUMBER_SEPARATOR = '--'
+BASE36_DIGITS = string.digits + string.ascii_lowercase
+
+
+def encode_base36(number):
+    digits = []
+    while True:
+        number, digit = divmod(number, 36)
+        digits.append(BASE36_DIGITS[digit])
+        if number == 0:
+            return ''.join(reversed(digits))
+
+
+def truncate_slug(slug, max_length):
+    """
+    max_length 를 넘으면 단어('-') 경계에서 한 번에 자른다. 단어가 하나뿐이면 글자 단위로 자른다.
+    """
+    if len(slug) <= max_length:
+        return slug
+    cut = slug[:max_length]
+    if slug[max_length] != '-' and '-' in cut:
+        cut = cut.rsplit('-', 1)[0]
+    return cut
+
+
+def parse_slug_number(slug):
+    """
+    make_slug 가 붙인 번호. allocator 가 만든 slug 가 아니면 ('--' 뒤가 base36 이 아니면) None
+    """
+    _, separator, suffix = slug.rpartition(SLUG_NUMBER_SEPARATOR)
+    if not separator or not suffix or suffix.strip(BASE36_DIGITS):
+        return None
+    return int(suffix, 36)
+
+
+def make_slug(title, number):
+    suffix = encode_base36(number)
+    base = truncate_slug(slugify(title), MAXIMUM_SLUG_LENGTH - len(suffix) - len(SLUG_NUMBER_SEPARATOR))
+    return f'{base}{SLUG_NUMBER_SEPARATOR}{suffix}'
+
+
+class SlugAllocator:
+    def __init__(self):
+        self.next = 0
+        self.end = 0
+        self.blocks = set()
+        self.lock = threading.Lock()
+
+    def allocate(self, count=1) -> list:
+        """
+        겹치지 않는 번호 count 개. 남은 block 으로 모자라면 block 을 더 예약한다.
+        """
+        numbers = []
+        with self.lock:
+            while len(numbers) < count:
+                if self.next == self.end:
+                    self.next, self.end = self.reserve()
+                    self.blocks.add(self.next // SLUG_BLOCK_SIZE)
+                taken = min(count - len(numbers), self.end - self.next)
+                numbers.extend(range(self.next, self.next + taken))
+                self.next += taken
+        return numbers
+
+    @staticmethod
+    def reserve():
+        start = SlugBlock.objects.create().pk * SLUG_BLOCK_SIZE
+        return start, start + SLUG_BLOCK_SIZE
+
+    def has_issued(self, number) -> bool:
+        """
+        이 프로세스가 이미 나눠준 번호인지. 다시 나눠줄 일이 없으므로 그 번호의 slug 는 다시 써도 된다.
+        """
+        with self.lock:
+            if number // SLUG_BLOCK_SIZE not in self.blocks:
+                return False
+            return number < self.next or number >= self.end
+
+    def reset(self):
+        """
+        새로 시작한 프로세스처럼 다음 allocate 때 새 block 을 예약한다. (테스트)
+        """
+        with self.lock:
+            self.next = self.end = 0
+            self.blocks = set()
+
+    def reset_after_fork(self):
+        """
+        prefork 서버의 worker 가 부모가 쓰던 block 을 이어서 쓰지 않게 한다.
+        fork 할 때 다른 스레드가 잡고 있던 lock 은 풀리지 않으므로 새로 만든다.
+        """
+        self.lock = threading.Lock()
+        self.next = self.end = 0
+        self.blocks = set()
+
+
+slug_allocator = SlugAllocator()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=slug_allocator.reset_after_fork)
+
+
+def allocate_slug(title):
+    return make_slug(title, slug_allocator.allocate()[0])
+
+
+def reserve_kept_slugs(slugs) -> set:
+    """
+    다른 환경에서 가져와 그대로 쓰려는 slug 중 그대로 써도 되는 것.
+    이 프로세스가 이미 나눠준 번호는 다시 나오지 않는다. 나머지 번호가 든 block 은 SlugBlock row 를
+    그 pk 로 직접 만들어서 예약한다. 이미 있는 block 은 살아 있는 프로세스가 아직 나눠주고 있을 수
+    있으므로 그 slug 는 빼고, 부르는 쪽이 새로 할당한다.
+    allocator 번호가 아니거나, 0 번 block (pk 는 1 부터) 이나 BigAutoField 범위 밖의 번호는 할당될 일이 없다.
+    """
+    slugs = list(slugs)
+    blocks = {}
+    for slug in slugs:
+        number = parse_slug_number(slug)
+        if number is None or slug_allocator.has_issued(number):
+            continue
+        if 0 < number // SLUG_BLOCK_SIZE <= MAXIMUM_SLUG_BLOCK:
+            blocks[slug] = number // SLUG_BLOCK_SIZE
+
+    reserved = {block for block in set(blocks.values()) if reserve_block(block)}
+    if reserved:
+        reset_block_sequence()
+    return {slug for slug in slugs if slug not in blocks or blocks[slug] in reserved}
+
+
+def reserve_block(block) -> bool:
+    _, created = SlugBlock.objects.get_or_create(pk=block)
+    return created
+
+
+def reset_block_sequence():
+    """
+    SQLite (AUTOINCREMENT), MySQL 은 pk 를 직접 넣으면 sequence 가 따라 올라가고, PostgreSQL 은 setval 이 필요하다.
+    """
+    connection = connections[router.db_for_write(SlugBlock)]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [SlugBlock]):
+            cursor.execute(sql)
+
+
+def allocate_slugs(titles) -> list:
+    """
+    import 처럼 한 번에 많이 만들 때. 필요한 만큼의 block 만 예약한다.
+    """
+    titles = list(titles)
+    return [make_slug(title, number) for title, number in zip(titles, slug_allocator.allocate(len(titles)))]
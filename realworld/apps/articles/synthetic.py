@@ -0,0 +1,203 @@
+"""
+벤치마크용 합성 RealWorld 데이터
+팔로우, 태그, 좋아요, 댓글 대상은 모두 Zipf 분포로 고른다. (소수의 인기 작성자, 태그, 글에 몰리도록)
+모든 insert 는 bulk_create 이고 signal 을 거치지 않으므로 카운터, 피드, 검색 색인은 마지막에 한 번에 다시 만든다.
+"""
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from realworld.apps.articles.feeds import fan_out_articles, mark_fan_out_on_read
+from realworld.apps.articles.models import Article, Comment, Tag
+from realworld.apps.articles.search import get_search_backend
+from realworld.apps.authentication.models import JwtUser
+from realworld.apps.core.utils import chunked
+from realworld.apps.profiles.models import Profile
+
+BATCH_SIZE = 1000
+DEFAULT_PASSWORD = 'password1234'
+WORDS = (
+    'django', 'react', 'python', 'database', 'index', 'cache', 'query', 'latency', 'queue', 'deploy',
+    'async', 'thread', 'render', 'serializer', 'profile', 'feed', 'tag', 'comment', 'cursor', 'shard',
+)
+
+
+class ZipfSampler:
+    """
+    rank 가 낮을수록 자주 뽑힌다. (weight = 1 / rank^exponent)
+    """
+
+    def __init__(self, items, exponent, rng):
+        self.items = list(items)
+        self.cum_weights = list(accumulate(1 / (rank ** exponent) for rank in range(1, len(self.items) + 1)))
+        self.rng = rng
+
+    def choose(self, k):
+        """
+        중복을 허용해서 k 개
+        """
+        return self.rng.choices(self.items, cum_weights=self.cum_weights, k=k)
+
+    def sample(self, k):
+        """
+        서로 다른 k 개. 절반 넘게 뽑아야 하면 꼬리를 다 모으느라 오래 걸리므로 그냥 고르게 뽑는다.
+        """
+        k = min(k, len(self.items))
+        if k * 2 > len(self.items):
+            return self.rng.sample(self.items, k)
+        picked = {}
+        while len(picked) < k:
+            for item in self.choose(k - len(picked)):
+                picked.setdefault(item, None)
+        return list(picked)
+
+
+def make_sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+class DatasetGenerator:
+    def __init__(self, users=100, articles=500, tags=50, follows=10, favorites=20, comments=2,
+                 exponent=1.1, prefix='bench', seed=0, stdout=None):
+        self.users = users
+        self.articles = articles
+        self.tags = tags
+        self.follows = follows
+        self.favorites = favorites
+        self.comments = comments
+        self.exponent = exponent
+        self.prefix = prefix
+        self.rng = random.Random(seed)
+        self.stdout = stdout
+        self.counts = {}
+
+    def log(self, name, count):
+        self.counts[name] = count
+        if self.stdout is not None:
+            self.stdout.write(f'{name}: {count}')
+
+    def sampler(self, items):
+        return ZipfSampler(items, self.exponent, self.rng)
+
+    def generate(self):
+        with transaction.atomic():
+            profile_ids = self.create_users()
+            self.create_follows(profile_ids)
+            tag_ids = self.create_tags()
+            articles = self.create_articles(profile_ids)
+            article_ids = [article_id for article_id, _, _ in articles]
+            self.create_article_tags(article_ids, tag_ids)
+            self.create_favorites(profile_ids, article_ids)
+            self.create_comments(profile_ids, article_ids)
+            self.create_feed_entries(articles)
+            Article.objects.filter(pk__in=article_ids).rebuild_favorites_count()
+            Tag.objects.filter(pk__in=tag_ids).rebuild_articles_count()
+            for chunk in chunked(article_ids, BATCH_SIZE):
+                get_search_backend().index(chunk)
+        return self.counts
+
+    def create_users(self):
+        password = make_password(DEFAULT_PASSWORD)
+        JwtUser.objects.bulk_create([
+            JwtUser(
+                username=f'{self.prefix}{i}',
+                email=f'{self.prefix}{i}@{self.prefix}.example.com',
+                password=password,
+            )
+            for i in range(self.users)
+        ], batch_size=BATCH_SIZE)
+        user_ids = list(JwtUser.objects.filter(
+            email__endswith=f'@{self.prefix}.example.com'
+        ).values_list('pk', flat=True))
+        Profile.objects.bulk_create([
+            Profile(user_id=user_id, bio=make_sentence(self.rng, 8)) for user_id in user_ids
+        ], batch_size=BATCH_SIZE)
+        profile_ids = list(Profile.objects.filter(user_id__in=user_ids).values_list('pk', flat=True))
+        self.log('users', len(profile_ids))
+        return profile_ids
+
+    def create_follows(self, profile_ids):
+        """
+        팔로우 대상 인기도가 멱법칙을 따른다. (몇몇 작성자에게 팔로워가 몰린다)
+        """
+        targets = self.sampler(profile_ids)
+        Follow = Profile.follows.through
+        edges = [
+            Follow(from_profile_id=follower_id, to_profile_id=followee_id)
+            for follower_id in profile_ids
+            for followee_id in targets.sample(self.rng.randint(0, self.follows * 2))
+            if followee_id != follower_id
+        ]
+        Follow.objects.bulk_create(edges, batch_size=BATCH_SIZE)
+        Profile.objects.filter(pk__in=profile_ids).rebuild_followers_count()
+        mark_fan_out_on_read(profile_ids)
+        self.log('follows', len(edges))
+
+    def create_tags(self):
+        names = [f'{self.prefix}-tag{i}' for i in range(self.tags)]
+        tag_ids = [tag.pk for tag in Tag.objects.resolve(names)]
+        self.log('tags', len(tag_ids))
+        return tag_ids
+
+    def create_articles(self, profile_ids):
+        """
+        (id, author_id, created_at) 목록. created_at 은 지난 1 년에 고르게 흩는다.
+        """
+        authors = self.sampler(profile_ids)
+        Article.objects.bulk_create([
+            Article(
+                slug=f'{self.prefix}--{i}',
+                title=make_sentence(self.rng, 6).capitalize(),
+                description=make_sentence(self.rng, 12),
+                body=make_sentence(self.rng, self.rng.randint(50, 400)),
+                author_id=author_id,
+            )
+            for i, author_id in enumerate(authors.choose(self.articles))
+        ], batch_size=BATCH_SIZE)
+
+        now = timezone.now()
+        # slugify 는 '--' 를 만들지 않으므로 이 prefix 로는 만든 글만 걸린다.
+        articles = list(Article.objects.filter(slug__startswith=f'{self.prefix}--'))
+        for article in articles:
+            article.created_at = article.updated_at = now - timedelta(seconds=self.rng.randint(0, 365 * 24 * 3600))
+        Article.objects.bulk_update(articles, ['created_at', 'updated_at'], batch_size=BATCH_SIZE)
+        self.log('articles', len(articles))
+        return [(article.pk, article.author_id, article.created_at) for article in articles]
+
+    def create_article_tags(self, article_ids, tag_ids):
+        tags = self.sampler(tag_ids)
+        ArticleTag = Article.tags.through
+        rows = [
+            ArticleTag(article_id=article_id, tag_id=tag_id)
+            for article_id in article_ids
+            for tag_id in tags.sample(self.rng.randint(1, 5))
+        ]
+        ArticleTag.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        self.log('article tags', len(rows))
+
+    def create_favorites(self, profile_ids, article_ids):
+        articles = self.sampler(article_ids)
+        Favorite = Profile.favorites.through
+        rows = [
+            Favorite(profile_id=profile_id, article_id=article_id)
+            for profile_id in profile_ids
+            for article_id in articles.sample(self.rng.randint(0, self.favorites * 2))
+        ]
+        Favorite.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        self.log('favorites', len(rows))
+
+    def create_comments(self, profile_ids, article_ids):
+        articles = self.sampler(article_ids)
+        rows = [
+            Comment(article_id=article_id, author_id=self.rng.choice(profile_ids), body=make_sentence(self.rng, 20))
+            for article_id in articles.choose(len(article_ids) * self.comments)
+        ]
+        Comment.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        self.log('comments', len(rows))
+
+    def create_feed_entries(self, articles):
+        self.log('feed entries', fan_out_articles(articles))
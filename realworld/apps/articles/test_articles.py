@@ -1,3 +1,16 @@
+import re
+from types import SimpleNamespace
+from unittest import skipUnless
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.http import QueryDict
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from realworld.apps.articles.models import Article, Tag
+from realworld.apps.articles.planner import ArticleFilterPlanner
+from realworld.apps.articles.readers import article_values
 from realworld.apps.articles.views import ArticleViewSet, TagListAPIView, ArticlesFavoriteAPIView, ArticlesFeedAPIView
 from realworld.testing_util import parse_body, TestCaseWithAuth, ARTICLE_2, ARTICLE_1, get_article_data
 
@@ -281,3 +294,339 @@ class ArticleTest(TestCaseWithAuth):
         articles_after = parse_body(after_response)['articles']
         assert len(articles_after) == 1
         assert articles_after[0]['title'] == self.article_2.title
+
+
+class ArticleQueryCountTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.profile_1.follow(cls.profile_2)
+        for i in range(10):
+            article = cls.create_article(
+                cls.profile_2, f"제목{i}", "개요", "내용", [f"tag{i}", f"tag{i}-2"]
+            )
+            cls.profile_1.favorite(article)
+
+    def count_queries(self, url, limit):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'limit': limit})
+        self.assert_200_OK(response)
+        assert len(parse_body(response)['articles']) == limit
+        return len(context)
+
+    def test_list_query_count_is_fixed(self):
+        assert self.count_queries(ARTICLE_URL, 2) == self.count_queries(ARTICLE_URL, 10)
+
+    def test_list_query_count_is_fixed_with_login(self):
+        self.login()
+        assert self.count_queries(ARTICLE_URL, 2) == self.count_queries(ARTICLE_URL, 10)
+
+    def test_feed_query_count_is_fixed(self):
+        self.login()
+        feed_url = '/api/articles/feed/'
+        assert self.count_queries(feed_url, 2) == self.count_queries(feed_url, 10)
+
+    def test_list_annotations(self):
+        self.login()
+        response = self.client.get(ARTICLE_URL, {'author': 'taehee', 'limit': 1})
+        article = parse_body(response)['articles'][0]
+        assert article['favorited'] is True
+        assert article['favoritesCount'] == 1
+        assert article['author']['following'] is True
+
+
+class ArticleCursorPaginationTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        for i in range(5):
+            cls.create_article(cls.profile_1, f"제목{i}", "개요", "내용", [])
+
+    def get_page(self, cursor='', **params):
+        response = self.client.get(ARTICLE_URL, {'cursor': cursor, 'limit': 3, **params})
+        self.assert_200_OK(response)
+        return parse_body(response)
+
+    @staticmethod
+    def get_titles(body):
+        return [article['title'] for article in body['articles']]
+
+    def test_cursor_pages_match_offset_order(self):
+        expected = self.get_titles(parse_body(self.client.get(ARTICLE_URL)))
+
+        first = self.get_page()
+        assert first['prevCursor'] is None
+        assert first['articlesCount'] == 7
+        second = self.get_page(first['nextCursor'])
+        third = self.get_page(second['nextCursor'])
+        assert third['nextCursor'] is None
+
+        actual = self.get_titles(first) + self.get_titles(second) + self.get_titles(third)
+        assert actual == expected
+
+        back = self.get_page(third['prevCursor'])
+        assert self.get_titles(back) == self.get_titles(second)
+        first_again = self.get_page(back['prevCursor'])
+        assert self.get_titles(first_again) == self.get_titles(first)
+        assert first_again['prevCursor'] is None
+
+    def test_cursor_without_count(self):
+        body = self.get_page(count='false')
+        assert 'articlesCount' not in body
+        assert len(body['articles']) == 3
+
+    def test_offset_without_count(self):
+        response = self.client.get(ARTICLE_URL, {'limit': 2, 'offset': 2, 'count': 'false'})
+        self.assert_200_OK(response)
+        body = parse_body(response)
+        assert 'articlesCount' not in body
+        assert len(body['articles']) == 2
+
+    def test_invalid_cursor(self):
+        response = self.client.get(ARTICLE_URL, {'cursor': 'not-a-cursor'})
+        self.assert_404_NOT_FOUND(response)
+
+
+class TagResolveTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+
+    def test_resolve_existing_tags_in_one_query(self):
+        with self.assertNumQueries(1):
+            tags = Tag.objects.resolve(['react', 'django', 'react'])
+        assert [tag.tag for tag in tags] == ['react', 'django']
+
+    def test_resolve_new_tags(self):
+        with self.assertNumQueries(3):
+            tags = Tag.objects.resolve(['react', '새태그', 'New'])
+        assert [tag.slug for tag in tags] == ['react', '새태그', 'new']
+        assert all(tag.pk is not None for tag in tags)
+
+    def test_resolve_by_slug(self):
+        tags = Tag.objects.resolve(['REACT'])
+        assert tags[0].tag == 'react'
+        assert Tag.objects.filter(slug='react').count() == 1
+
+    def test_create_article_with_many_tags(self):
+        self.login()
+        # force_authenticate 는 같은 user 인스턴스를 계속 쓰므로 viewer 의 social graph 를 먼저 읽어둔다.
+        self.assert_201_created(self.client.post(ARTICLE_URL, get_article_data("제목", "개요", "내용", ['react']), format='json'))
+        data = get_article_data("제목", "개요", "내용", ['react', 'a', 'b', 'c', 'd'])
+        with CaptureQueriesContext(connection) as small:
+            self.assert_201_created(self.client.post(ARTICLE_URL, data, format='json'))
+        data = get_article_data("제목", "개요", "내용", ['react', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'])
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(ARTICLE_URL, data, format='json')
+        self.assert_201_created(response)
+        assert len(small) == len(large)
+        assert set(parse_body(response)['article']['tagList']) == set(data['article']['tagList'])
+
+
+class PopularTagTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.article_3 = cls.create_article(cls.profile_2, "제목3", "개요", "내용", [])
+        cls.article_3.tags.add(*Tag.objects.filter(slug__in=['react', '태그']))
+
+    def get_counts(self):
+        return dict(Tag.objects.values_list('tag', 'articles_count'))
+
+    def test_articles_count(self):
+        assert self.get_counts() == {'react': 2, '태그': 2, 'django': 1, '태그4': 1}
+
+    def test_articles_count_after_remove_and_delete(self):
+        self.article_3.tags.remove(Tag.objects.get(slug='react'), Tag.objects.get(slug='django'))
+        assert self.get_counts()['react'] == 1
+        assert self.get_counts()['django'] == 1
+
+        self.article_1.delete()
+        assert self.get_counts() == {'react': 0, '태그': 1, 'django': 1, '태그4': 1}
+
+        Tag.objects.get(slug='태그').articles.clear()
+        assert self.get_counts()['태그'] == 0
+
+    def test_rebuild_articles_count(self):
+        Tag.objects.update(articles_count=0)
+        Tag.objects.rebuild_articles_count()
+        assert self.get_counts() == {'react': 2, '태그': 2, 'django': 1, '태그4': 1}
+
+    def test_popular_tags(self):
+        response = self.client.get(TAG_URL, {'top': 2})
+        self.assert_200_OK(response)
+        assert parse_body(response)['tags'] == ['react', '태그']
+
+    def test_popular_tags_wrong_top(self):
+        self.assert_400_BAD_REQUEST(self.client.get(TAG_URL, {'top': 'many'}))
+        self.assert_400_BAD_REQUEST(self.client.get(TAG_URL, {'top': 0}))
+
+    def test_tag_list_etag(self):
+        response = self.client.get(TAG_URL, {'top': 3})
+        assert parse_body(response)['tags'] == ['react', '태그', 'django']
+        etag = response['ETag']
+        not_modified = self.client.get(TAG_URL, {'top': 3}, HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == 304
+
+        self.article_1.tags.add(Tag.objects.get(slug='태그4'))
+        response = self.client.get(TAG_URL, {'top': 3}, HTTP_IF_NONE_MATCH=etag)
+        self.assert_200_OK(response)
+        assert parse_body(response)['tags'] == ['react', '태그', '태그4']
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN 형식은 SQLite 기준')
+class ArticleQueryPlanTest(TestCaseWithAuth):
+    """
+    목록 필터가 테이블 전체를 훑지 않는지 EXPLAIN QUERY PLAN 으로 확인한다.
+    through 테이블에는 created_at 이 없으므로 tag, favorited 는 걸러진 행만 정렬한다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.profile_1.favorite(cls.article_1)
+        cls.username = cls.profile_1.user.username
+
+    def get_plan(self, params):
+        """
+        목록 view 와 같은 순서로 for_listing 뒤에 planner 를 건다.
+        """
+        queryset = ArticleFilterPlanner(QueryDict(urlencode(params, doseq=True))).filter(
+            Article.objects.for_listing(self.profile_2)
+        )
+        return article_values(queryset)[:20].explain()
+
+    def assert_no_full_scan(self, plan):
+        assert not re.search(r'\bSCAN \w+$', plan, re.MULTILINE), plan
+
+    def test_list_uses_ordered_index(self):
+        plan = self.get_plan({})
+        self.assert_no_full_scan(plan)
+        assert 'USING INDEX article_created_at_id_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_author_filter_uses_composite_index(self):
+        plan = self.get_plan({'author': self.username})
+        self.assert_no_full_scan(plan)
+        assert 'article_author_created_at_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_tag_filter_searches_through_table(self):
+        plan = self.get_plan({'tag': 'react'})
+        self.assert_no_full_scan(plan)
+        assert 'article_tags_tag_article_idx (tag_id=?)' in plan
+        assert 'articles_tag' not in plan
+
+    def test_favorited_filter_searches_through_table(self):
+        plan = self.get_plan({'favorited': self.username})
+        self.assert_no_full_scan(plan)
+        assert 'SEARCH profiles_profile_favorites USING COVERING INDEX' in plan
+
+    def test_any_tags_subquery_searches_through_table(self):
+        plan = self.get_plan({'tag': ['react', 'django'], 'tag_mode': 'any'})
+        self.assert_no_full_scan(plan)
+        assert 'article_tags_tag_article_idx (tag_id=?)' in plan
+
+    @override_settings(ARTICLE_FILTER_IN_MEMORY_LIMIT=0)
+    def test_combined_subqueries_search_indexes(self):
+        """
+        pk IN (subquery) 는 각 subquery 가 인덱스만 읽고, 글은 그 id 로만 찾는다.
+        """
+        plan = self.get_plan({'tag': 'react', 'author': self.username, 'favorited': self.username})
+        self.assert_no_full_scan(plan)
+        assert 'SEARCH articles_article USING INTEGER PRIMARY KEY' in plan
+        assert 'COVERING INDEX article_tags_tag_article_idx (tag_id=?)' in plan
+        assert re.search(r'COVERING INDEX articles_article_author_id_\w+ \(author_id=\?\)', plan), plan
+        assert re.search(r'COVERING INDEX profiles_profile_favorites_\w+ \(profile_id=\?\)', plan), plan
+
+    def test_unknown_name_skips_article_query(self):
+        for params in ({'tag': '없는태그'}, {'author': 'nobody'}, {'favorited': 'nobody'}):
+            with self.assertNumQueries(1):
+                assert not ArticleFilterPlanner(QueryDict(urlencode(params))).filter(Article.objects.all())
+
+    def test_filtered_list_view(self):
+        response = self.client.get(ARTICLE_URL, {'tag': 'react', 'author': self.username})
+        self.assert_200_OK(response)
+        assert [article['slug'] for article in parse_body(response)['articles']] == [self.slug_1]
+
+
+class ArticleFilterPlannerTest(TestCaseWithAuth):
+    """
+    tag, author, favorited 를 같이 줄 때 중복 없이, 가장 작은 집합부터 거르는지
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        react, django = Tag.objects.get(tag='react'), Tag.objects.get(tag='django')
+        cls.article_3 = cls.create_article(cls.profile_2, "제목3", "개요", "내용", [])
+        cls.article_3.tags.add(react, django)
+        cls.article_4 = cls.create_article(cls.profile_2, "제목4", "개요", "내용", [])
+        cls.article_4.tags.add(django)
+        for article in (cls.article_1, cls.article_3, cls.article_4):
+            cls.profile_1.favorite(article)
+        cls.profile_2.favorite(cls.article_3)
+
+    def get_slugs(self, params):
+        response = self.client.get('/api/articles', params)
+        self.assert_200_OK(response)
+        body = parse_body(response)
+        slugs = [article['slug'] for article in body['articles']]
+        assert body['articlesCount'] == len(slugs)
+        return slugs
+
+    def test_tag_and_favorited_without_duplicates(self):
+        slugs = self.get_slugs({'tag': 'django', 'favorited': 'stelo'})
+        assert slugs == [self.article_4.slug, self.article_3.slug]
+
+    def test_all_filters(self):
+        params = {'tag': 'react', 'favorited': 'taehee', 'author': 'taehee'}
+        assert self.get_slugs(params) == [self.article_3.slug]
+        assert self.get_slugs({**params, 'author': 'stelo'}) == []
+
+    def test_multiple_tags(self):
+        assert self.get_slugs({'tag': ['react', 'django']}) == [self.article_3.slug]
+        assert self.get_slugs({'tag': ['react', 'django'], 'tag_mode': 'any'}) == [
+            self.article_4.slug, self.article_3.slug, self.article_2.slug, self.article_1.slug
+        ]
+        assert self.get_slugs({'tag': ['react', 'nothing']}) == []
+        assert self.get_slugs({'tag': ['react', 'nothing'], 'tag_mode': 'any'}) == [
+            self.article_3.slug, self.article_1.slug
+        ]
+
+    def test_invalid_tag_mode(self):
+        response = self.client.get('/api/articles', {'tag': 'react', 'tag_mode': 'some'})
+        self.assert_400_BAD_REQUEST(response)
+
+    def test_subquery_plan_matches_in_memory_plan(self):
+        cases = [
+            {'tag': 'django', 'favorited': 'stelo'},
+            {'tag': ['react', 'django'], 'author': 'taehee'},
+            {'tag': ['react', '태그4'], 'tag_mode': 'any', 'favorited': 'stelo'},
+        ]
+        expected = [self.get_slugs(params) for params in cases]
+        with self.settings(ARTICLE_FILTER_IN_MEMORY_LIMIT=0):
+            assert [self.get_slugs(params) for params in cases] == expected
+
+    def test_smallest_set_first(self):
+        """
+        tag 의 articles_count 가 한도 안이면 favorited 는 세지 않고, tag 의 id 안에서만 확인한다.
+        """
+        request = SimpleNamespace(query_params=QueryDict('tag=react&favorited=stelo'))
+        planner = ArticleFilterPlanner(request.query_params)
+        with CaptureQueriesContext(connection) as queries:
+            ids = list(planner.filter(Article.objects.all()).values_list('pk', flat=True))
+        assert ids == [self.article_3.pk, self.article_1.pk]
+        sql = [query['sql'] for query in queries.captured_queries]
+        assert not any('COUNT' in query for query in sql), sql
+        assert len(sql) == 5, sql
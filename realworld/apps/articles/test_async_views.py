@@ -0,0 +1,71 @@
+from django.test import override_settings
+
+from realworld.apps.articles.models import Comment
+from realworld.strings import ARTICLE_DOES_NOT_EXIST, NO_USER_FOUND_WITH_USERNAME
+from realworld.testing_util import TestCaseWithAuth, get_article_data, parse_body
+
+
+class AsyncReadViewTest(TestCaseWithAuth):
+    """
+    realworld.asgi_urls 의 async GET view 와 realworld.urls 의 DRF view 응답이 바이트 단위로 같은지 비교
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.profile_1.follow(cls.profile_2)
+        cls.profile_1.favorite(cls.article_2)
+        Comment.objects.create(author=cls.profile_2, article=cls.article_1, body="댓글1")
+        Comment.objects.create(author=cls.profile_1, article=cls.article_1, body="댓글2")
+
+    def get_both(self, url, data=None):
+        sync_response = self.client.get(url, data)
+        with override_settings(ROOT_URLCONF='realworld.asgi_urls'):
+            async_response = self.client.get(url, data)
+        assert async_response.status_code == sync_response.status_code, async_response.content
+        assert async_response.content == sync_response.content
+        return async_response
+
+    def get_urls(self):
+        return [
+            ('/api/articles', None),
+            ('/api/articles', {'limit': 1}),
+            ('/api/articles', {'tag': 'react'}),
+            ('/api/articles', {'cursor': '', 'limit': 1, 'count': 'false'}),
+            (f'/api/articles/{self.slug_1}', None),
+            (f'/api/articles/{self.article_2.slug}', None),
+            (f'/api/articles/{self.slug_1}/comments/', None),
+            ('/api/profiles/taehee', None),
+        ]
+
+    def test_anonymous(self):
+        for url, data in self.get_urls():
+            self.assert_200_OK(self.get_both(url, data))
+
+    def test_viewer(self):
+        self.login()
+        for url, data in self.get_urls() + [('/api/articles/feed/', None)]:
+            self.assert_200_OK(self.get_both(url, data))
+
+    def test_not_found(self):
+        response = self.get_both('/api/articles/no-such-article')
+        self.assert_404_NOT_FOUND(response)
+        assert parse_body(response)['errors']['article'] == ARTICLE_DOES_NOT_EXIST
+
+        response = self.get_both('/api/profiles/nobody')
+        self.assert_404_NOT_FOUND(response)
+        assert NO_USER_FOUND_WITH_USERNAME in response.content.decode()
+
+    def test_feed_requires_login(self):
+        response = self.get_both('/api/articles/feed/')
+        self.assert_403_FORBIDDEN(response)
+
+    @override_settings(ROOT_URLCONF='realworld.asgi_urls')
+    def test_write_goes_to_sync_view(self):
+        self.login()
+        response = self.client.post('/api/articles', get_article_data("async", "개요", "내용", []), format='json')
+        self.assert_201_created(response)
+
+        response = self.client.get(f"/api/articles/{parse_body(response)['article']['slug']}")
+        self.assert_200_OK(response)
@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from realworld.apps.articles.cache import article_response_cache
+from realworld.apps.articles.test_articles import ARTICLE_URL, UPDATE_DATA
+from realworld.testing_util import TestCaseWithAuth, parse_body
+
+
+@override_settings(ARTICLE_RESPONSE_CACHE=True)
+class ArticleResponseCacheTest(TestCaseWithAuth):
+
+    def setUp(self):
+        cache.clear()
+        article_response_cache.clear()
+        self.create_users_1_2()
+        self.create_articles_1_2()
+        self.SLUG_ARTICLE_URL = ARTICLE_URL + '/' + self.slug_1
+        self.FAVORITE_URL = self.SLUG_ARTICLE_URL + '/favorite/'
+
+    def tearDown(self) -> None:
+        self.client.force_authenticate()
+        self.delete_users_1_2()
+
+    def get_article(self):
+        response = self.client.get(self.SLUG_ARTICLE_URL)
+        self.assert_200_OK(response)
+        return parse_body(response)['article']
+
+    def test_retrieve_hit_needs_no_query(self):
+        expected = self.get_article()
+        with self.assertNumQueries(0):
+            assert self.get_article() == expected
+        assert article_response_cache.stats()['hits'] == 1
+
+    def test_write_while_building_is_not_cached(self):
+        """
+        snapshot 을 받은 뒤 (본문을 읽은 뒤) 에 쓰기가 있으면 옛 본문을 넣지 않는다.
+        commit 때 한 번 더 올리므로 commit 전에 받은 snapshot 으로 넣은 본문도 버려진다.
+        """
+        request = Request(APIRequestFactory().get(self.SLUG_ARTICLE_URL))
+        data = self.get_article()
+        rows = [(self.article_1.pk, self.profile_1.pk)]
+
+        article_response_cache.clear()
+        snapshot = article_response_cache.snapshot()
+        self.article_1.save()
+        article_response_cache.set(request, data, rows, snapshot=snapshot)
+        assert article_response_cache.get(request) is None
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article_1.save()
+            snapshot = article_response_cache.snapshot()
+            article_response_cache.set(request, data, rows, snapshot=snapshot)
+            assert article_response_cache.get(request) is not None
+        assert article_response_cache.get(request) is None
+
+    def test_update_invalidates_retrieve(self):
+        self.get_article()
+        self.login()
+        self.assert_200_OK(self.client.put(self.SLUG_ARTICLE_URL, UPDATE_DATA, format='json'))
+        assert self.get_article()['title'] == UPDATE_DATA['article']['title']
+
+    def test_viewer_fields_applied_on_cached_body(self):
+        self.login()
+        self.assert_201_created(self.client.post(self.FAVORITE_URL))
+        article = self.get_article()
+        assert article['favorited'] is True
+        assert article['favoritesCount'] == 1
+
+        self.client.force_authenticate()
+        article = self.get_article()
+        assert article['favorited'] is False
+        assert article['favoritesCount'] == 1
+
+        self.login()
+        assert self.get_article()['favorited'] is True
+        assert article_response_cache.stats()['hits'] == 2
+
+    def test_following_applied_on_cached_list(self):
+        self.client.get(ARTICLE_URL)
+        self.login()
+        self.assert_201_created(self.client.post(f"/api/profiles/{self.user_2.username}/follow"))
+        articles = parse_body(self.client.get(ARTICLE_URL))['articles']
+        following = {article['author']['username']: article['author']['following'] for article in articles}
+        assert following == {'stelo': False, 'taehee': True}
+
+    def test_tag_list_invalidated_by_new_article(self):
+        titles = [article['title'] for article in parse_body(self.client.get(ARTICLE_URL, {'tag': 'react'}))['articles']]
+        assert titles == [self.article_1.title]
+
+        new_article = self.create_article(self.profile_2, "새 글", "개요", "내용", ['react-2'])
+        new_article.tags.add(self.article_1.tags.get(tag='react'))
+        response = self.client.get(ARTICLE_URL, {'tag': 'react'})
+        titles = [article['title'] for article in parse_body(response)['articles']]
+        assert titles == ["새 글", self.article_1.title]
+
+    def test_profile_update_invalidates_author(self):
+        self.get_article()
+        self.profile_1.bio = '새 소개'
+        self.profile_1.save()
+        assert self.get_article()['author']['bio'] == '새 소개'
+
+    def test_tag_list_hit_needs_no_query(self):
+        tags = parse_body(self.client.get('/api/tags/', {'top': 5}))['tags']
+        with self.assertNumQueries(0):
+            assert parse_body(self.client.get('/api/tags/', {'top': 5}))['tags'] == tags
+
+        self.article_2.tags.add(self.article_1.tags.get(tag='react'))
+        assert parse_body(self.client.get('/api/tags/', {'top': 1}))['tags'] == ['react']
+        assert parse_body(self.client.get('/api/tags/', {'top': 5}))['tags'][0] == 'react'
@@ -1,4 +1,9 @@
+from unittest import skipUnless
+
+from django.db import connection
+
 from realworld.apps.articles.models import Comment
+from realworld.apps.articles.readers import comment_values
 from realworld.apps.articles.test_articles import ARTICLE_URL
 from realworld.apps.articles.views import CommentsListCreateAPIView, CommentsDestroyAPIView
 from realworld.testing_util import TestCaseWithAuth, parse_body
@@ -154,3 +159,43 @@ class CommentTest(TestCaseWithAuth):
         assert self.article_1.__str__() == '타이틀'
         assert self.comment_1.__str__() == '바디'
         assert self.article_1.tags.first().__str__() in ['react', '태그']
+
+
+class CommentListTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.profile_1.follow(cls.profile_2)
+        cls.COMMENT_URL = ARTICLE_URL + '/' + cls.slug_1 + '/comments/'
+        Comment.objects.bulk_create([
+            Comment(author=profile, article=cls.article_1, body=f'댓글{i}')
+            for i, profile in enumerate([cls.profile_1, cls.profile_2] * 3)
+        ])
+
+    def get_bodies(self, response):
+        self.assert_200_OK(response)
+        return [comment['body'] for comment in parse_body(response)['comments']]
+
+    def test_list_query_count(self):
+        self.login()
+        with self.assertNumQueries(2):
+            body = parse_body(self.client.get(self.COMMENT_URL, {'cursor': '', 'count': 'false'}))
+        following = {comment['author']['username']: comment['author']['following'] for comment in body['comments']}
+        assert following == {self.user_1.username: False, self.user_2.username: True}
+
+    def test_cursor_pagination(self):
+        expected = self.get_bodies(self.client.get(self.COMMENT_URL, {'limit': 6}))
+        assert len(expected) == 6
+
+        first = self.client.get(self.COMMENT_URL, {'cursor': '', 'limit': 4})
+        second = self.client.get(self.COMMENT_URL, {'cursor': parse_body(first)['nextCursor'], 'limit': 4})
+        assert self.get_bodies(first) + self.get_bodies(second) == expected
+        assert parse_body(second)['nextCursor'] is None
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN 형식은 SQLite 기준')
+    def test_list_uses_article_index(self):
+        plan = comment_values(Comment.objects.filter(article_id=self.article_1.pk), self.profile_1)[:20].explain()
+        assert 'USING INDEX comment_article_created_at_idx (article_id=?)' in plan
+        assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,151 @@
+import time
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils.http import http_date
+
+from realworld.apps.articles.cache import article_response_cache
+from realworld.apps.articles.models import Comment, Tag
+from realworld.apps.articles.test_articles import ARTICLE_URL, TAG_URL
+from realworld.testing_util import TestCaseWithAuth, parse_body
+
+
+class ConditionalGetTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.SLUG_ARTICLE_URL = ARTICLE_URL + '/' + cls.slug_1
+        cls.COMMENT_URL = cls.SLUG_ARTICLE_URL + '/comments/'
+        Comment.objects.create(author=cls.profile_2, article=cls.article_1, body='댓글')
+
+    def tearDown(self):
+        self.client.force_authenticate()
+
+    def get_etag(self, url, **extra):
+        response = self.client.get(url, **extra)
+        self.assert_200_OK(response)
+        return response['ETag']
+
+    def assert_not_modified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response['ETag'] == etag
+        return response
+
+    def test_retrieve_not_modified_without_reading_body(self):
+        response = self.client.get(self.SLUG_ARTICLE_URL)
+        self.assert_200_OK(response)
+        assert 'Authorization' in response['Vary']
+        assert not response.has_header('Last-Modified')
+
+        with self.assertNumQueries(1):
+            not_modified = self.assert_not_modified(self.SLUG_ARTICLE_URL, response['ETag'])
+        assert 'Authorization' in not_modified['Vary']
+
+    def test_retrieve_etag_changes(self):
+        etag = self.get_etag(self.SLUG_ARTICLE_URL)
+
+        self.profile_2.favorite(self.article_1)
+        favorited_etag = self.get_etag(self.SLUG_ARTICLE_URL, HTTP_IF_NONE_MATCH=etag)
+        assert favorited_etag != etag
+
+        self.article_1.tags.add(Tag.objects.get(slug='django'))
+        tagged_etag = self.get_etag(self.SLUG_ARTICLE_URL, HTTP_IF_NONE_MATCH=favorited_etag)
+        assert tagged_etag != favorited_etag
+
+        self.profile_1.bio = '새 소개'
+        self.profile_1.save()
+        assert self.get_etag(self.SLUG_ARTICLE_URL, HTTP_IF_NONE_MATCH=tagged_etag) != tagged_etag
+
+    def test_retrieve_etag_depends_on_viewer(self):
+        anonymous_etag = self.get_etag(self.SLUG_ARTICLE_URL)
+        self.login()
+        assert self.get_etag(self.SLUG_ARTICLE_URL) == anonymous_etag
+
+        self.profile_1.favorite(self.article_1)
+        viewer_etag = self.get_etag(self.SLUG_ARTICLE_URL, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.client.force_authenticate()
+        assert self.get_etag(self.SLUG_ARTICLE_URL, HTTP_IF_NONE_MATCH=viewer_etag) != viewer_etag
+
+    def test_if_modified_since_is_ignored(self):
+        """
+        좋아요는 updated_at 을 바꾸지 않으므로 If-Modified-Since 로는 304 를 주지 않는다.
+        """
+        # 이전에 받아둔 어떤 Last-Modified 보다도 늦은 시각
+        since = http_date(time.time() + 60)
+        self.profile_2.favorite(self.article_1)
+        response = self.client.get(self.SLUG_ARTICLE_URL, HTTP_IF_MODIFIED_SINCE=since)
+        self.assert_200_OK(response)
+        assert parse_body(response)['article']['favoritesCount'] == 1
+
+        for url in (self.COMMENT_URL, TAG_URL):
+            self.assert_200_OK(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since))
+
+    def test_missing_article(self):
+        self.assert_404_NOT_FOUND(self.client.get(ARTICLE_URL + '/no-such-article', HTTP_IF_NONE_MATCH='*'))
+
+    def test_comment_list(self):
+        etag = self.get_etag(self.COMMENT_URL)
+        self.assert_not_modified(self.COMMENT_URL, etag)
+
+        comment = Comment.objects.create(author=self.profile_1, article=self.article_1, body='새 댓글')
+        new_etag = self.get_etag(self.COMMENT_URL, HTTP_IF_NONE_MATCH=etag)
+        comment.delete()
+        assert self.get_etag(self.COMMENT_URL, HTTP_IF_NONE_MATCH=new_etag) == etag
+
+    def test_comment_list_follow_changes_viewer_etag(self):
+        self.login()
+        etag = self.get_etag(self.COMMENT_URL)
+        with self.assertNumQueries(1):
+            self.assert_not_modified(self.COMMENT_URL, etag)
+
+        self.profile_1.follow(self.profile_2)
+        response = self.client.get(self.COMMENT_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assert_200_OK(response)
+        assert parse_body(response)['comments'][0]['author']['following'] is True
+
+    def test_tag_list(self):
+        response = self.client.get(TAG_URL)
+        self.assert_200_OK(response)
+        assert not response.has_header('Last-Modified')
+        with self.assertNumQueries(1):
+            self.assert_not_modified(TAG_URL, response['ETag'])
+
+        Tag.objects.create(tag='새태그', slug='새태그')
+        response = self.client.get(TAG_URL, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assert_200_OK(response)
+        assert '새태그' in parse_body(response)['tags']
+
+
+@override_settings(ARTICLE_RESPONSE_CACHE=True)
+class CachedConditionalGetTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.SLUG_ARTICLE_URL = ARTICLE_URL + '/' + cls.slug_1
+
+    def setUp(self):
+        cache.clear()
+        article_response_cache.clear()
+
+    def tearDown(self):
+        self.client.force_authenticate()
+
+    def test_cached_retrieve_keeps_etag(self):
+        etag = self.client.get(self.SLUG_ARTICLE_URL)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.SLUG_ARTICLE_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        self.login()
+        self.profile_1.favorite(self.article_1)
+        response = self.client.get(self.SLUG_ARTICLE_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assert_200_OK(response)
+        cached_response = self.client.get(self.SLUG_ARTICLE_URL)
+        assert article_response_cache.stats()['hits'] >= 1
+        assert cached_response['ETag'] == response['ETag']
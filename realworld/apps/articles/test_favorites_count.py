@@ -0,0 +1,67 @@
+from django.core.management import call_command
+
+from realworld.apps.articles.models import Article
+from realworld.testing_util import TestCaseWithAuth
+
+
+class FavoritesCountTest(TestCaseWithAuth):
+
+    def setUp(self):
+        self.create_users_1_2()
+        self.create_articles_1_2()
+
+    def tearDown(self) -> None:
+        self.delete_users_1_2()
+
+    def get_favorites_count(self, article=None):
+        article = article or self.article_1
+        return Article.objects.get(pk=article.pk).favorites_count
+
+    def test_favorite(self):
+        self.profile_1.favorite(self.article_1)
+        assert self.article_1.favorites_count == 1
+        assert self.get_favorites_count() == 1
+
+    def test_favorite_twice(self):
+        self.profile_1.favorite(self.article_1)
+        self.profile_1.favorite(self.article_1)
+        assert self.get_favorites_count() == 1
+
+    def test_unfavorite(self):
+        self.profile_1.favorite(self.article_1)
+        self.profile_1.unfavorite(self.article_1)
+        self.profile_1.unfavorite(self.article_1)
+        assert self.article_1.favorites_count == 0
+        assert self.get_favorites_count() == 0
+
+    def test_m2m_add_remove(self):
+        self.profile_1.favorites.add(self.article_1, self.article_2)
+        self.article_1.favorited_by.add(self.profile_2)
+        assert self.get_favorites_count(self.article_1) == 2
+        assert self.get_favorites_count(self.article_2) == 1
+
+        self.article_1.favorited_by.remove(self.profile_1, self.profile_1)
+        self.profile_2.favorites.remove(self.article_2)
+        assert self.get_favorites_count(self.article_1) == 1
+        assert self.get_favorites_count(self.article_2) == 1
+
+    def test_m2m_clear(self):
+        self.profile_1.favorites.add(self.article_1, self.article_2)
+        self.profile_2.favorites.add(self.article_1)
+        self.article_1.favorited_by.clear()
+        assert self.get_favorites_count(self.article_1) == 0
+        assert self.get_favorites_count(self.article_2) == 1
+
+    def test_delete_profile(self):
+        self.profile_1.favorite(self.article_2)
+        self.profile_1.delete()
+        assert self.get_favorites_count(self.article_2) == 0
+
+    def test_rebuild_favorites_count(self):
+        self.profile_1.favorites.add(self.article_1)
+        self.profile_2.favorites.add(self.article_1)
+        Article.objects.update(favorites_count=0)
+
+        call_command('rebuild_favorites_count', stdout=None)
+        assert self.get_favorites_count(self.article_1) == 2
+        assert self.get_favorites_count(self.article_2) == 0
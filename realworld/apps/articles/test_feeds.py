@@ -0,0 +1,134 @@
+import re
+
+from django.test import override_settings
+
+from realworld.apps.articles.feeds import Feed, get_range
+from realworld.apps.articles.models import Article, FeedEntry
+from realworld.apps.profiles.models import Profile
+from realworld.testing_util import TestCaseWithAuth
+
+
+class FeedTest(TestCaseWithAuth):
+
+    def setUp(self):
+        self.create_users_1_2()
+        self.create_articles_1_2()
+
+    def tearDown(self) -> None:
+        self.delete_users_1_2()
+
+    def get_feed(self, profile=None):
+        keys = Feed(profile or self.profile_1).get_keys(20)
+        articles = Article.objects.in_bulk([key.id for key in keys])
+        return [articles[key.id] for key in keys]
+
+    def test_follow_backfills_feed(self):
+        self.profile_1.follow(self.profile_2)
+        assert self.get_feed() == [self.article_2]
+        assert FeedEntry.objects.filter(follower=self.profile_1).count() == 1
+
+    def test_new_article_fans_out(self):
+        self.profile_1.follow(self.profile_2)
+        article = self.create_article(self.profile_2, "새 글", "개요", "내용", [])
+        assert self.get_feed() == [article, self.article_2]
+
+    def test_unfollow_trims_feed(self):
+        self.profile_1.follow(self.profile_2)
+        self.profile_1.unfollow(self.profile_2)
+        assert self.get_feed() == []
+        assert not FeedEntry.objects.filter(follower=self.profile_1).exists()
+
+    def test_clear_follows_trims_feed(self):
+        self.profile_1.follow(self.profile_2)
+        self.profile_2.followed_by.clear()
+        assert self.get_feed() == []
+
+    def test_delete_article_removes_feed_entry(self):
+        self.profile_1.follow(self.profile_2)
+        self.article_2.delete()
+        assert self.get_feed() == []
+
+    def test_follow_updates_followers_count(self):
+        self.profile_1.follow(self.profile_2)
+        self.profile_1.follows.remove(self.profile_2, self.profile_1)
+        self.profile_2.followed_by.add(self.profile_1)
+        assert Profile.objects.get(pk=self.profile_2.pk).followers_count == 1
+        self.profile_2.followed_by.clear()
+        assert Profile.objects.get(pk=self.profile_2.pk).followers_count == 0
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=0)
+    def test_hybrid_fan_out_on_read(self):
+        self.profile_1.follow(self.profile_2)
+        article = self.create_article(self.profile_2, "새 글", "개요", "내용", [])
+        assert not FeedEntry.objects.exists()
+        assert self.get_feed() == [article, self.article_2]
+        assert Feed(self.profile_1).count() == 2
+
+    def test_fan_out_on_read_is_sticky(self):
+        self.profile_1.follow(self.profile_2)
+        with override_settings(FEED_FANOUT_MAX_FOLLOWERS=0):
+            self.profile_2.followed_by.add(self.profile_2)
+            article = self.create_article(self.profile_2, "새 글", "개요", "내용", [])
+        self.profile_2.followed_by.remove(self.profile_2)
+
+        # 펼쳐둔 글과 작성자 범위의 글이 겹쳐도 한 번만 나온다.
+        assert Profile.objects.get(pk=self.profile_2.pk).fan_out_on_read
+        assert self.get_feed() == [article, self.article_2]
+        assert Feed(self.profile_1).count() == 2
+
+    def test_keys_page_by_cursor(self):
+        self.profile_1.follow(self.profile_2)
+        articles = [self.create_article(self.profile_2, f"글 {i}", "개요", "내용", []) for i in range(3)]
+        with override_settings(FEED_FANOUT_MAX_FOLLOWERS=0):
+            self.profile_1.follow(self.profile_1)
+        articles.append(self.create_article(self.profile_1, "내 글", "개요", "내용", []))
+
+        feed = Feed(self.profile_1)
+        keys = feed.get_keys(10)
+        assert [key.id for key in keys] == [
+            article.pk for article in [articles[3], articles[2], articles[1], articles[0], self.article_2, self.article_1]
+        ]
+        assert feed.get_keys(2, position=keys[1]) == keys[2:4]
+        assert feed.get_keys(2, position=keys[3], reverse=True) == [keys[2], keys[1]]
+        assert feed.get_keys(2, offset=4) == keys[4:]
+
+
+class FeedQueryPlanTest(TestCaseWithAuth):
+    """
+    피드는 (follower, created_at, article) 인덱스와 작성자 인덱스 범위로만 읽는다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.profile_1.follow(cls.profile_2)
+        with override_settings(FEED_FANOUT_MAX_FOLLOWERS=0):
+            cls.profile_2.follow(cls.profile_1)
+
+    def get_plans(self, profile, position=None):
+        return [
+            queryset.explain()
+            for queryset in Feed(profile).get_ranges(20, position)
+        ]
+
+    def assert_index_range(self, plan, index):
+        assert not re.search(r'\bSCAN \w+$', plan, re.MULTILINE), plan
+        assert index in plan, plan
+        assert 'TEMP B-TREE' not in plan, plan
+
+    def test_feed_entries_use_follower_index(self):
+        plan, = self.get_plans(self.profile_1)
+        self.assert_index_range(plan, 'feed_follower_created_id_idx (follower_id=?)')
+
+        plan, = self.get_plans(self.profile_1, (self.article_2.created_at, self.article_2.pk))
+        self.assert_index_range(plan, 'feed_follower_created_id_idx (follower_id=? AND created_at<?)')
+
+    def test_on_read_authors_use_author_index(self):
+        entries_plan, author_plan = self.get_plans(self.profile_2)
+        self.assert_index_range(entries_plan, 'feed_follower_created_id_idx')
+        self.assert_index_range(author_plan, 'article_author_created_at_idx')
+
+    def test_range_orders_by_index(self):
+        queryset = get_range(FeedEntry.objects.filter(follower_id=self.profile_1.pk), 'article_id', 20)
+        assert list(queryset) == [(self.article_2.created_at, self.article_2.pk)]
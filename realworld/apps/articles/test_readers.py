@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+from django.contrib.auth.models import AnonymousUser
+
+from realworld.apps.articles.models import Article, Comment
+from realworld.apps.articles.readers import article_values, read_articles, comment_values, read_comments
+from realworld.apps.articles.renderers import ArticleJSONRenderer, CommentJSONRenderer
+from realworld.apps.articles.serializers import ArticleSerializer, CommentSerializer
+from realworld.apps.profiles.readers import get_profile_row, read_profile_row
+from realworld.apps.profiles.renderers import ProfileJSONRenderer
+from realworld.apps.profiles.serializers import ProfileSerializer
+from realworld.testing_util import TestCaseWithAuth
+
+
+class ReaderTest(TestCaseWithAuth):
+    """
+    읽기 전용 경로(readers)와 ModelSerializer 의 렌더링 결과가 바이트 단위로 같은지 비교
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.article_3 = cls.create_article(cls.profile_2, "태그 없음", "개요", "내용", [])
+        cls.profile_2.bio = '자기소개'
+        cls.profile_2.image = 'https://example.com/taehee.png'
+        cls.profile_2.save()
+        cls.profile_1.follow(cls.profile_2)
+        cls.profile_1.favorite(cls.article_2)
+        cls.profile_2.favorite(cls.article_2)
+        Comment.objects.create(author=cls.profile_1, article=cls.article_1, body="댓글1")
+        Comment.objects.create(author=cls.profile_2, article=cls.article_1, body="댓글2")
+
+    def get_contexts(self):
+        return [
+            (None, {'request': SimpleNamespace(user=AnonymousUser())}),
+            (self.profile_1, {'request': SimpleNamespace(user=self.user_1)}),
+            (self.profile_2, {'request': SimpleNamespace(user=self.user_2)}),
+        ]
+
+    def test_articles(self):
+        renderer = ArticleJSONRenderer()
+        for viewer, context in self.get_contexts():
+            queryset = Article.objects.for_listing(viewer)
+            serialized = ArticleSerializer(list(queryset), many=True, context=context).data
+            read = read_articles(article_values(queryset))
+            assert renderer.render({'count': 3, 'results': read}) == \
+                renderer.render({'count': 3, 'results': serialized})
+
+    def test_article(self):
+        renderer = ArticleJSONRenderer()
+        for viewer, context in self.get_contexts():
+            queryset = Article.objects.for_listing(viewer).filter(pk=self.article_2.pk)
+            serialized = ArticleSerializer(queryset.get(), context=context).data
+            read = read_articles(article_values(queryset))[0]
+            assert renderer.render(read) == renderer.render(serialized)
+
+    def test_comments(self):
+        renderer = CommentJSONRenderer()
+        for viewer, context in self.get_contexts():
+            queryset = Comment.objects.filter(article=self.article_1).select_related('author', 'author__user')
+            serialized = CommentSerializer(list(queryset), many=True, context=context).data
+            read = read_comments(comment_values(queryset, viewer))
+            assert renderer.render({'count': 2, 'results': read}) == \
+                renderer.render({'count': 2, 'results': serialized})
+
+    def test_profile(self):
+        renderer = ProfileJSONRenderer()
+        for viewer, context in self.get_contexts():
+            for profile in (self.profile_1, self.profile_2):
+                serialized = ProfileSerializer(profile, context=context).data
+                read = read_profile_row(get_profile_row(profile.user.username, viewer))
+                assert renderer.render(read) == renderer.render(serialized)
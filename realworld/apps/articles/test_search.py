@@ -0,0 +1,169 @@
+import re
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from realworld.apps.articles.models import Article, SearchPosting
+from realworld.apps.articles.search import FTS_TABLE, Fts5SearchBackend, PythonSearchBackend, get_query_terms, \
+    has_fts_table, tokenize
+from realworld.apps.articles.test_articles import ARTICLE_URL
+from realworld.strings import SEARCH_QUERY_REQUIRED
+from realworld.testing_util import TestCaseWithAuth, get_article_data, parse_body
+
+SEARCH_URL = '/api/articles/search'
+
+
+def test_tokenize():
+    assert tokenize('Hello, Django-REST 한글 검색!') == ['hello', 'django', 'rest', '한글', '검색']
+    assert get_query_terms('django Django react') == ['django', 'react']
+
+
+class SearchTestMixin:
+    backend = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.django = cls.create_article(
+            cls.profile_1, 'Django ORM tips', 'django django', 'select_related and prefetch_related', ['python']
+        )
+        cls.react = cls.create_article(cls.profile_2, 'React hooks', 'state', 'useState with django backend', [])
+        cls.cache = cls.create_article(cls.profile_2, 'Caching', 'redis', 'memcached and locmem', ['django'])
+
+    def setUp(self):
+        settings_override = override_settings(ARTICLE_SEARCH_BACKEND=self.backend)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('rebuild_search_index', stdout=StringIO())
+
+    def search(self, q, **params):
+        response = self.client.get(SEARCH_URL, {'q': q, **params})
+        self.assert_200_OK(response)
+        return parse_body(response)
+
+    def get_slugs(self, body):
+        return [article['slug'] for article in body['articles']]
+
+    def test_ranked_by_bm25(self):
+        body = self.search('django')
+        assert body['articlesCount'] == 3
+        assert self.get_slugs(body)[0] == self.django.slug
+        assert set(self.get_slugs(body)) == {self.django.slug, self.react.slug, self.cache.slug}
+
+    def test_tag_and_body_terms(self):
+        assert self.get_slugs(self.search('python')) == [self.django.slug]
+        assert self.get_slugs(self.search('MEMCACHED')) == [self.cache.slug]
+        assert self.search('nothing')['articles'] == []
+
+    def test_incremental_index(self):
+        """
+        색인은 transaction 이 commit 될 때 들어간다.
+        """
+        self.react.title = 'Vue composition'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.react.save()
+        assert self.get_slugs(self.search('vue')) == [self.react.slug]
+        assert self.search('hooks')['articles'] == []
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.react.tags.add(self.cache.tags.get())
+        assert self.search('django')['articlesCount'] == 3
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cache.tags.clear()
+        assert self.get_slugs(self.search('redis')) == [self.cache.slug]
+
+        self.cache.delete()
+        assert self.search('redis')['articles'] == []
+
+    def test_untagged_article_created_outside_api(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(author=self.profile_1, title='Phoenix', description='elixir', body='')
+        assert self.get_slugs(self.search('phoenix')) == [article.slug]
+
+    def test_cursor_pagination(self):
+        first = self.search('django', limit=1)
+        slugs = self.get_slugs(first)
+        cursor = first['nextCursor']
+        while cursor is not None:
+            body = self.search('django', limit=1, cursor=cursor, count='false')
+            assert 'articlesCount' not in body
+            slugs += self.get_slugs(body)
+            cursor = body['nextCursor']
+        assert slugs == self.get_slugs(self.search('django'))
+
+    def test_viewer_state(self):
+        self.profile_1.favorite(self.cache)
+        self.login()
+        article = self.search('redis')['articles'][0]
+        assert article['favorited'] and article['favoritesCount'] == 1
+
+    def test_empty_query(self):
+        for q in ('', '  !!  '):
+            response = self.client.get(SEARCH_URL, {'q': q})
+            self.assert_400_BAD_REQUEST(response)
+            assert parse_body(response)['errors']['q'] == SEARCH_QUERY_REQUIRED
+
+    def test_invalid_cursor(self):
+        self.assert_404_NOT_FOUND(self.client.get(SEARCH_URL, {'q': 'django', 'cursor': 'nope'}))
+
+
+class PythonSearchTest(SearchTestMixin, TestCaseWithAuth):
+    backend = PythonSearchBackend.name
+
+    def setUp(self):
+        PythonSearchBackend.stats.clear()
+        super().setUp()
+
+    def test_new_article_is_indexed_once(self):
+        self.login()
+        for tags in (['elixir'], []):
+            data = get_article_data('Phoenix', 'elixir web', 'channels', tags)
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                self.assert_201_created(self.client.post(ARTICLE_URL, data, format='json'))
+            inserts = [query for query in queries if re.match(r'INSERT .*INTO "articles_searchdocument"', query['sql'])]
+            assert len(inserts) == 1
+        assert self.search('phoenix')['articlesCount'] == 2
+        assert self.search('elixir')['articlesCount'] == 2
+
+    def test_reinsert_is_idempotent(self):
+        backend = PythonSearchBackend()
+        postings = SearchPosting.objects.filter(article=self.django).count()
+        backend.insert([self.django.pk])
+        backend.index([self.django.pk])
+        assert SearchPosting.objects.filter(article=self.django).count() == postings
+
+    def test_top_hits_after_cursor(self):
+        backend = PythonSearchBackend()
+        ranked, total = backend.search(['django'], 10)
+        assert total == 3 and [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+        article_id, score = ranked[0]
+        assert backend.search(['django'], 1, (score, article_id))[0] == ranked[1:2]
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN 형식은 SQLite 기준')
+    def test_postings_are_read_by_term(self):
+        plan = SearchPosting.objects.filter(term__in=['django', 'react']).values_list(
+            'term', 'article_id', 'frequency', 'length'
+        ).explain()
+        assert not re.search(r'\bSCAN \w+$', plan, re.MULTILINE), plan
+        assert 'SEARCH articles_searchposting USING INDEX' in plan and '(term=?)' in plan
+
+
+class Fts5SearchTest(SearchTestMixin, TestCaseWithAuth):
+    backend = Fts5SearchBackend.name
+
+    def setUp(self):
+        if not has_fts_table():
+            self.skipTest('SQLite FTS5 가 없다.')
+        super().setUp()
+
+    def test_match_uses_fts_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'EXPLAIN QUERY PLAN SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', ['"django"']
+            )
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'VIRTUAL TABLE INDEX' in plan, plan
@@ -0,0 +1,121 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from realworld.apps.articles.models import Article, SlugBlock
+from realworld.apps.authentication.models import JwtUser
+from realworld.apps.articles.slugs import MAXIMUM_SLUG_LENGTH, SLUG_BLOCK_SIZE, SlugAllocator, allocate_slugs, \
+    encode_base36, make_slug, parse_slug_number, slug_allocator, truncate_slug
+from realworld.apps.profiles.models import Profile
+from realworld.testing_util import TestCaseWithAuth
+
+
+def test_encode_base36():
+    assert encode_base36(0) == '0'
+    assert encode_base36(35) == 'z'
+    assert encode_base36(36) == '10'
+    assert int(encode_base36(123456789), 36) == 123456789
+
+
+def test_truncate_slug():
+    assert truncate_slug('hello-world', 20) == 'hello-world'
+    assert truncate_slug('hello-world-again', 13) == 'hello-world'
+    assert truncate_slug('hello-world-again', 11) == 'hello-world'
+    assert truncate_slug('helloworld', 5) == 'hello'
+
+
+def test_make_slug():
+    assert make_slug('Hello World', 1000) == 'hello-world--rs'
+    assert make_slug('타이틀', 1000) == '--rs'
+    slug = make_slug('word ' * 100, 10 ** 12)
+    assert len(slug) <= MAXIMUM_SLUG_LENGTH
+    assert slug.endswith('--' + encode_base36(10 ** 12)) and slug.count('--') == 1
+
+
+def test_parse_slug_number():
+    assert parse_slug_number('hello-world--rs') == 1000
+    assert parse_slug_number('--rs') == 1000
+    # allocator 가 만들지 않은 slug (이전 방식의 무작위 접미사 포함)
+    assert parse_slug_number('hello-world') is None
+    assert parse_slug_number('hello-world-a1b2c3') is None
+    assert parse_slug_number('hello--') is None
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork 가 없는 플랫폼')
+def test_forked_worker_reserves_new_block():
+    saved = slug_allocator.next, slug_allocator.end
+    slug_allocator.next, slug_allocator.end = 5, SLUG_BLOCK_SIZE
+    try:
+        with slug_allocator.lock:
+            pid = os.fork()
+            if pid == 0:
+                fresh = (slug_allocator.next, slug_allocator.end) == (0, 0)
+                os._exit(0 if fresh and slug_allocator.lock.acquire(timeout=1) else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        assert (slug_allocator.next, slug_allocator.end) == (5, SLUG_BLOCK_SIZE)
+    finally:
+        slug_allocator.next, slug_allocator.end = saved
+
+
+class SlugAllocatorTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+
+    def setUp(self):
+        slug_allocator.reset()
+
+    def test_bulk_allocation_reserves_blocks(self):
+        with self.assertNumQueries(3):
+            slugs = allocate_slugs(['same title'] * (SLUG_BLOCK_SIZE * 2 + 1))
+        assert len(set(slugs)) == len(slugs)
+        assert SlugBlock.objects.count() == 3
+        with self.assertNumQueries(0):
+            allocate_slugs(['same title'] * 10)
+
+    def test_same_title(self):
+        articles = [self.create_article(self.profile_1, 'Same Title', '개요', '내용', []) for _ in range(3)]
+        slugs = [article.slug for article in articles]
+        assert len(set(slugs)) == 3
+        assert all(slug.startswith('same-title--') for slug in slugs)
+
+
+class ConcurrentSlugTest(TransactionTestCase):
+    """
+    프로세스마다 allocator 가 따로 있는 것처럼 스레드마다 SlugAllocator 를 만들어 같은 제목의 글을 동시에 만든다.
+    테스트의 in-memory SQLite 는 동시에 쓰면 바로 table lock 오류를 내므로 DB 쓰기만 lock 으로 줄 세운다.
+    """
+
+    def test_no_collision(self):
+        profile = Profile.objects.create(user=JwtUser.objects.create_user('slug', 'slug@example.com', 'test1234'))
+        database_lock = threading.Lock()
+
+        class LockedSlugAllocator(SlugAllocator):
+            @staticmethod
+            def reserve():
+                with database_lock:
+                    return SlugAllocator.reserve()
+
+        def create_articles(_):
+            allocator = LockedSlugAllocator()
+            try:
+                for _ in range(20):
+                    slug = make_slug('Same Title', allocator.allocate()[0])
+                    with database_lock:
+                        Article.objects.create(
+                            slug=slug, title='Same Title', description='개요', body='내용', author=profile,
+                        )
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(create_articles, range(4)))
+        assert Article.objects.values('slug').distinct().count() == Article.objects.count() == 80
+        assert SlugBlock.objects.count() == 4
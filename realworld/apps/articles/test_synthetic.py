@@ -0,0 +1,77 @@
+import json
+import random
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from realworld.apps.articles.benchmark import percentile
+from realworld.apps.articles.models import Article, FeedEntry, Tag
+from realworld.apps.articles.synthetic import DatasetGenerator, ZipfSampler
+from realworld.apps.profiles.models import Profile
+
+
+def test_zipf_sampler_prefers_low_rank():
+    sampler = ZipfSampler(range(100), 1.1, random.Random(0))
+    picked = sampler.choose(10000)
+    assert picked.count(0) > picked.count(10) > picked.count(99)
+    assert len(set(sampler.sample(20))) == 20
+    assert sorted(sampler.sample(100)) == list(range(100))
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 0.5) == 51
+    assert percentile(samples, 0.95) == 95
+    assert percentile([3], 0.95) == 3
+
+
+class DatasetGeneratorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.counts = DatasetGenerator(users=30, articles=100, tags=10, follows=3, favorites=5, comments=2).generate()
+
+    def test_counts(self):
+        assert self.counts['users'] == Profile.objects.count() == 30
+        assert self.counts['articles'] == Article.objects.count() == 100
+        assert self.counts['follows'] == Profile.follows.through.objects.count()
+        assert self.counts['feed entries'] == FeedEntry.objects.count()
+
+    def test_counters_are_rebuilt(self):
+        for article in Article.objects.all():
+            assert article.favorites_count == article.favorited_by.count()
+        for tag in Tag.objects.all():
+            assert tag.articles_count == tag.articles.count()
+
+    def test_feed_matches_follows(self):
+        profile = Profile.objects.filter(follows__isnull=False).first()
+        expected = set(Article.objects.filter(author__followed_by=profile).values_list('pk', flat=True))
+        assert set(profile.feed_entries.values_list('article_id', flat=True)) == expected
+
+    def test_bench_endpoints(self):
+        out = StringIO()
+        call_command('bench_endpoints', iterations=2, warmup=0, json=True, stdout=out)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert {result['name'] for result in results} >= {'articles', 'feed', 'favorite', 'login'}
+        assert all(result['status'] in (200, 201) for result in results), results
+        assert all(result['queries'] >= 0 and result['p95_ms'] >= result['p50_ms'] for result in results)
+        assert Profile.favorites.through.objects.count() == self.counts['favorites']
+        assert Profile.follows.through.objects.count() == self.counts['follows']
+
+
+class ConcurrencyBenchmarkTest(TransactionTestCase):
+    """
+    handler 를 다른 스레드에서 부르므로 데이터가 commit 되어 있어야 한다.
+    """
+
+    @override_settings(ROOT_URLCONF='realworld.asgi_urls')
+    def test_bench_concurrency(self):
+        DatasetGenerator(users=10, articles=20, tags=5, follows=2, favorites=2, comments=1).generate()
+        out = StringIO()
+        call_command('bench_concurrency', requests=4, concurrency=[2], only=['articles', 'feed'], json=True, stdout=out)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert {(result['name'], result['interface']) for result in results} == {
+            ('articles', 'wsgi'), ('articles', 'asgi'), ('feed', 'wsgi'), ('feed', 'asgi'),
+        }
+        assert all(result['status'] == 200 and result['requests_per_second'] > 0 for result in results), results
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Max
+
+from realworld.apps.articles.models import Article, FeedEntry, SlugBlock, Tag
+from realworld.apps.articles.slugs import SLUG_BLOCK_SIZE, SlugAllocator, make_slug, parse_slug_number, \
+    slug_allocator
+from realworld.apps.articles.transfer import ArticleImporter, export_articles
+from realworld.testing_util import TestCaseWithAuth
+
+
+class ArticleTransferTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        # 앞 테스트들이 rollback 한 block 을 이 프로세스가 나눠준 것으로 기억하지 않게 한다.
+        slug_allocator.reset()
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.article_3 = cls.create_article(cls.profile_2, "태그 없음", "개요", "내용", [])
+        cls.profile_1.favorite(cls.article_2)
+        cls.profile_2.favorite(cls.article_2)
+        cls.profile_1.follow(cls.profile_2)
+
+    def setUp(self):
+        # SQLite 는 rollback 된 block 의 pk 를 다시 주므로 테스트가 예약한 block 을 다음 테스트로 넘기지 않는다.
+        state = slug_allocator.next, slug_allocator.end, set(slug_allocator.blocks)
+
+        def restore():
+            slug_allocator.next, slug_allocator.end, slug_allocator.blocks = state
+        self.addCleanup(restore)
+
+    def export(self, chunk_size=2):
+        stream = StringIO()
+        export_articles(stream, chunk_size=chunk_size)
+        return stream.getvalue()
+
+    def test_export(self):
+        # 글 row 한 번 + chunk 마다 태그, 좋아요
+        with self.assertNumQueries(1 + 2 * 2):
+            lines = self.export().splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [record['slug'] for record in records] == [self.slug_1, self.article_2.slug, self.article_3.slug]
+        assert records[1]['favoritedBy'] == ['stelo', 'taehee']
+        assert set(records[0]['tagList']) == {'react', '태그'}
+        assert records[2]['tagList'] == [] and records[0]['author'] == 'stelo'
+
+    def test_round_trip(self):
+        exported = self.export()
+        Article.objects.all().delete()
+        FeedEntry.objects.all().delete()
+
+        counts = ArticleImporter(chunk_size=2).run(StringIO(exported))
+        assert counts['articles'] == 3 and counts['favorites'] == 2 and counts['article tags'] == 4
+        assert self.export() == exported
+
+        article = Article.objects.get(slug=self.article_2.slug)
+        assert article.favorites_count == 2
+        assert article.created_at == self.article_2.created_at
+        assert Tag.objects.get(tag='django').articles_count == 1
+        assert set(self.profile_1.feed_entries.values_list('article_id', flat=True)) == set(
+            Article.objects.filter(author=self.profile_2).values_list('pk', flat=True)
+        )
+
+    def test_conflicting_slug_and_unknown_author(self):
+        records = [json.loads(line) for line in self.export().splitlines()]
+        records[1]['author'] = 'nobody'
+        records[2]['slug'] = ''
+        lines = [json.dumps(record) for record in records]
+
+        counts = ArticleImporter().run(lines)
+        assert counts['articles'] == 2 and counts['skipped'] == 1
+        assert Article.objects.count() == 5
+        assert Article.objects.filter(title=records[0]['title']).values('slug').distinct().count() == 2
+
+    def test_kept_slug_does_not_collide_with_new_slugs(self):
+        record = json.loads(self.export().splitlines()[0])
+        next_block = (SlugBlock.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+        record['slug'] = make_slug(record['title'], next_block * SLUG_BLOCK_SIZE)
+        ArticleImporter().run([json.dumps(record)])
+        assert Article.objects.filter(slug=record['slug']).exists()
+
+        # 다른 worker 처럼 block 없이 시작해도 가져온 번호 뒤의 block 을 받는다.
+        slug_allocator.reset()
+        article = self.create_article(self.profile_1, record['title'], "개요", "내용", [])
+        assert parse_slug_number(article.slug) >= (next_block + 1) * SLUG_BLOCK_SIZE
+
+    def test_kept_slug_in_live_block_is_reallocated(self):
+        # 다른 프로세스가 아직 나눠주고 있는 block 안의 번호는 그대로 쓰면 겹칠 수 있다.
+        number = SlugAllocator().allocate()[0]
+        record = json.loads(self.export().splitlines()[0])
+        record['slug'] = make_slug(record['title'], number + 1)
+        ArticleImporter().run([json.dumps(record)])
+        assert not Article.objects.filter(slug=record['slug']).exists()
+        assert Article.objects.filter(title=record['title']).count() == 2
+
+    def test_legacy_slug_is_kept_without_reserving(self):
+        record = json.loads(self.export().splitlines()[0])
+        record['slug'] = 'legacy-title-a1b2c3'
+        blocks = SlugBlock.objects.count()
+        ArticleImporter().run([json.dumps(record)])
+        assert Article.objects.filter(slug=record['slug']).exists()
+        assert SlugBlock.objects.count() == blocks
+
+    def test_commands(self):
+        out = StringIO()
+        call_command('export_articles', stdout=out, stderr=StringIO())
+        exported = out.getvalue()
+        assert len(exported.splitlines()) == 3
+
+        path = self.get_temp_path(exported)
+        Article.objects.all().delete()
+        out = StringIO()
+        call_command('import_articles', path, chunk_size=1, stdout=out)
+        assert '3 articles imported' in out.getvalue()
+        assert Article.objects.count() == 3
+
+    def get_temp_path(self, content):
+        temp = tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False, encoding='utf-8')
+        with temp:
+            temp.write(content)
+        self.addCleanup(os.remove, temp.name)
+        return temp.name
@@ -0,0 +1,205 @@
+"""
+환경 사이에 글을 옮기는 NDJSON import / export (한 줄에 글 하나)
+{"slug", "title", "description", "body", "tagList", "author", "favoritedBy", "createdAt", "updatedAt"}
+author, favoritedBy 는 username 이고, 그 사용자는 받는 쪽에 미리 있어야 한다.
+둘 다 chunk_size 줄씩 처리해서 메모리 사용량이 전체 글 수와 상관없다.
+"""
+import json
+from collections import Counter
+
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from realworld.apps.articles.cache import ALL_TAGS, article_response_cache, tag_version_key
+from realworld.apps.articles.feeds import fan_out_articles
+from realworld.apps.articles.models import Article, Tag
+from realworld.apps.articles.readers import get_tag_lists
+from realworld.apps.articles.search import get_search_backend
+from realworld.apps.articles.slugs import allocate_slugs, reserve_kept_slugs
+from realworld.apps.core.utils import chunked
+from realworld.apps.profiles.models import Profile
+from realworld.apps.profiles.signals import favorites_changed
+
+DEFAULT_CHUNK_SIZE = 1000
+
+ArticleTag = Article.tags.through
+Favorite = Profile.favorites.through
+
+
+def encode_datetime(value):
+    """
+    DjangoJSONEncoder 는 밀리초에서 자르므로 마이크로초까지 그대로 옮긴다.
+    """
+    return value.isoformat()
+
+
+def get_favorited_by(article_ids):
+    favorited_by = {}
+    rows = Favorite.objects.filter(article_id__in=article_ids).order_by('profile__user__username').values_list(
+        'article_id', 'profile__user__username'
+    )
+    for article_id, username in rows:
+        favorited_by.setdefault(article_id, []).append(username)
+    return favorited_by
+
+
+def export_articles(stream, queryset=None, chunk_size=DEFAULT_CHUNK_SIZE) -> int:
+    """
+    id 순서로 stream 에 쓴다. 태그와 좋아요는 chunk 마다 한 번씩 읽는다. 쓴 글 수를 돌려준다.
+    """
+    if queryset is None:
+        queryset = Article.objects.all()
+    rows = queryset.order_by('id').values(
+        'id', 'slug', 'title', 'description', 'body', 'created_at', 'updated_at', 'author__user__username'
+    ).iterator(chunk_size=chunk_size)
+
+    written = 0
+    for chunk in chunked(rows, chunk_size):
+        article_ids = [row['id'] for row in chunk]
+        tag_lists = get_tag_lists(article_ids)
+        favorited_by = get_favorited_by(article_ids)
+        stream.write(''.join(
+            json.dumps({
+                'slug': row['slug'],
+                'title': row['title'],
+                'description': row['description'],
+                'body': row['body'],
+                'tagList': tag_lists[row['id']],
+                'author': row['author__user__username'],
+                'favoritedBy': favorited_by.get(row['id'], []),
+                'createdAt': row['created_at'],
+                'updatedAt': row['updated_at'],
+            }, default=encode_datetime, ensure_ascii=False) + '\n'
+            for row in chunk
+        ))
+        written += len(chunk)
+    return written
+
+
+class ArticleImporter:
+    """
+    chunk 하나가 transaction 하나다. 글, 태그, 태그 through, 좋아요 through 를 모두 bulk_create 로 넣고
+    signal 을 거치지 않으므로 카운터, 피드, 검색 색인, 응답 캐시는 chunk 마다 한 번에 맞춘다.
+    slug 는 받는 쪽에 이미 있거나 비어 있으면 새로 할당한다.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.counts = Counter()
+
+    def run(self, lines):
+        records = (json.loads(line) for line in lines if line.strip())
+        for chunk in chunked(records, self.chunk_size):
+            with transaction.atomic():
+                self.import_chunk(chunk)
+        return self.counts
+
+    def import_chunk(self, records):
+        usernames = {record['author'] for record in records}
+        usernames.update(username for record in records for username in record.get('favoritedBy', ()))
+        profile_ids = dict(Profile.objects.filter(user__username__in=usernames).values_list('user__username', 'pk'))
+
+        importable = [record for record in records if record['author'] in profile_ids]
+        self.counts['skipped'] += len(records) - len(importable)
+        if not importable:
+            return
+
+        slugs = self.get_slugs(importable)
+        Article.objects.bulk_create([
+            Article(
+                slug=slug,
+                title=record['title'],
+                description=record.get('description', ''),
+                body=record.get('body', ''),
+                author_id=profile_ids[record['author']],
+            )
+            for slug, record in zip(slugs, importable)
+        ])
+        articles = Article.objects.in_bulk(slugs, field_name='slug')
+        articles = [articles[slug] for slug in slugs]
+        self.restore_timestamps(articles, importable)
+        self.counts['articles'] += len(articles)
+
+        tag_ids = self.add_tags(articles, importable)
+        favoriter_ids = self.add_favorites(articles, importable, profile_ids)
+
+        article_ids = [article.pk for article in articles]
+        Article.objects.filter(pk__in=article_ids).rebuild_favorites_count()
+        Tag.objects.filter(pk__in=tag_ids).rebuild_articles_count()
+        self.counts['feed entries'] += fan_out_articles(
+            [(article.pk, article.author_id, article.created_at) for article in articles]
+        )
+        get_search_backend().index(article_ids)
+        favorites_changed.send(sender=Profile, article_ids=article_ids, profile_ids=favoriter_ids)
+        article_response_cache.bump(
+            ALL_TAGS, *[tag_version_key(tag) for tag in Tag.objects.filter(pk__in=tag_ids).values_list('tag', flat=True)]
+        )
+
+    @staticmethod
+    def get_slugs(records):
+        """
+        원래 slug 를 되도록 유지한다. 이미 있거나 chunk 안에서 겹치면 한 번에 새로 할당한다.
+        유지할 slug 의 번호는 reserve_kept_slugs 로 예약하고, 살아 있는 block 에 든 번호면 새로 할당한다.
+        """
+        wanted = [record.get('slug') or None for record in records]
+        taken = set(Article.objects.filter(slug__in=[slug for slug in wanted if slug]).values_list('slug', flat=True))
+        slugs = []
+        for slug in wanted:
+            if slug is None or slug in taken:
+                slug = None
+            else:
+                taken.add(slug)
+            slugs.append(slug)
+
+        kept = reserve_kept_slugs(slug for slug in slugs if slug is not None)
+        slugs = [slug if slug in kept else None for slug in slugs]
+        new_slugs = iter(allocate_slugs(
+            record['title'] for slug, record in zip(slugs, records) if slug is None
+        ))
+        return [slug if slug is not None else next(new_slugs) for slug in slugs]
+
+    @staticmethod
+    def restore_timestamps(articles, records):
+        """
+        auto_now_add, auto_now 가 덮어쓴 시각을 원래 값으로 (bulk_update 는 auto_now 를 적용하지 않는다)
+        """
+        changed = []
+        for article, record in zip(articles, records):
+            created_at = parse_datetime(record['createdAt']) if record.get('createdAt') else None
+            updated_at = parse_datetime(record['updatedAt']) if record.get('updatedAt') else None
+            if created_at is None and updated_at is None:
+                continue
+            article.created_at = created_at or article.created_at
+            article.updated_at = updated_at or article.created_at
+            changed.append(article)
+        if changed:
+            Article.objects.bulk_update(changed, ['created_at', 'updated_at'])
+
+    def add_tags(self, articles, records):
+        names = [name for record in records for name in record.get('tagList', ())]
+        tags = {tag.slug: tag for tag in Tag.objects.resolve(names)}
+        rows = {
+            (article.pk, tags[name.lower()].pk)
+            for article, record in zip(articles, records)
+            for name in record.get('tagList', ())
+        }
+        ArticleTag.objects.bulk_create(
+            [ArticleTag(article_id=article_id, tag_id=tag_id) for article_id, tag_id in rows],
+            ignore_conflicts=True
+        )
+        self.counts['article tags'] += len(rows)
+        return [tag.pk for tag in tags.values()]
+
+    def add_favorites(self, articles, records, profile_ids):
+        rows = {
+            (profile_ids[username], article.pk)
+            for article, record in zip(articles, records)
+            for username in record.get('favoritedBy', ())
+            if username in profile_ids
+        }
+        Favorite.objects.bulk_create(
+            [Favorite(profile_id=profile_id, article_id=article_id) for profile_id, article_id in rows],
+            ignore_conflicts=True
+        )
+        self.counts['favorites'] += len(rows)
+        return list({profile_id for profile_id, _ in rows})
@@ -2,12 +2,14 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from realworld.apps.articles.views import ArticleViewSet, ArticlesFeedAPIView, ArticlesFavoriteAPIView, \
-    CommentsListCreateAPIView, CommentsDestroyAPIView, TagListAPIView
+    ArticleSearchAPIView, CommentsListCreateAPIView, CommentsDestroyAPIView, TagListAPIView
 
 router = DefaultRouter(trailing_slash=False)
 router.register('articles', ArticleViewSet)
 
 urlpatterns = [
+    # router 의 articles/<slug> 보다 먼저
+    path('articles/search', ArticleSearchAPIView.as_view()),
     path('', include(router.urls)),
     path('articles/feed/', ArticlesFeedAPIView.as_view()),
     path('articles/<str:article_slug>/favorite/',
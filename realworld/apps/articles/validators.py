@@ -0,0 +1,80 @@
+"""
+조건부 GET 용 Validators (core.conditional)
+본문을 읽기 전에 좁은 query 한 번으로, 응답이 바뀌면 반드시 같이 바뀌는 값만 읽는다.
+- updated_at (auto_now) 의 최댓값: 새로 생기거나 고친 row 는 항상 이전 최댓값보다 크다.
+- 개수: 지워진 row 는 개수로 드러난다. (새 row 가 같이 생기면 최댓값이 바뀐다)
+- favorites_count, favorited, following 은 시각이 남지 않으므로 값 그대로 넣는다.
+그래서 시각 하나로 나타낼 수 없고 ETag 만 준다. (core.conditional)
+"""
+from django.db.models import Count, Max, OuterRef, Subquery
+
+from realworld.apps.articles.models import Article, Comment, Tag
+from realworld.apps.core.conditional import VARY_VIEWER, Validators
+from realworld.apps.profiles.models import Profile
+
+ARTICLE_VALIDATOR_VALUES = (
+    'id', 'updated_at', 'favorites_count',
+    'author_id', 'author__updated_at', 'author__user__username', 'author__user__updated_at',
+    'favorited', 'author_following',
+    'tags__id', 'tags__tag',
+)
+
+
+def get_article_validators(slug, viewer=None):
+    """
+    (viewer 와 상관없는 Validators, favorited, author_following). 글이 없으면 None
+    태그마다 한 줄씩 나오므로 태그 목록도 같이 읽힌다.
+    """
+    rows = list(
+        Article.objects.filter(slug=slug).with_viewer_state(viewer).order_by().values_list(*ARTICLE_VALIDATOR_VALUES)
+    )
+    if not rows:
+        return None
+
+    (article_id, updated_at, favorites_count, author_id, author_updated_at, username, user_updated_at,
+     favorited, author_following, *_) = rows[0]
+    tags = sorted((tag_id, tag) for *_, tag_id, tag in rows if tag_id is not None)
+    validators = Validators(
+        (article_id, updated_at, favorites_count, author_id, author_updated_at, username, user_updated_at, tags),
+        vary=VARY_VIEWER,
+    )
+    return validators, favorited, author_following
+
+
+def aggregate_subquery(queryset, group_field, expression):
+    return Subquery(queryset.order_by().values(group_field).annotate(value=expression).values('value'))
+
+
+def get_comment_list_validators(slug, viewer=None):
+    """
+    (article_id, Validators). article_id 를 같은 query 로 읽어서 목록 query 가 slug 를 다시 찾지 않는다.
+    viewer 상태는 댓글 작성자 중 viewer 가 팔로우하는 관계 row 의 개수와 최대 id 로 본다.
+    """
+    comments = Comment.objects.filter(article_id=OuterRef('pk'))
+    annotations = {
+        'comment_count': aggregate_subquery(comments, 'article_id', Count('id')),
+        'comment_updated_at': aggregate_subquery(comments, 'article_id', Max('updated_at')),
+        'author_updated_at': aggregate_subquery(comments, 'article_id', Max('author__updated_at')),
+        'user_updated_at': aggregate_subquery(comments, 'article_id', Max('author__user__updated_at')),
+    }
+    if viewer is not None:
+        follows = Profile.follows.through.objects.filter(
+            from_profile_id=viewer.pk,
+            to_profile_id__in=Comment.objects.filter(article_id=OuterRef(OuterRef('pk'))).values('author_id'),
+        )
+        annotations['follow_count'] = aggregate_subquery(follows, 'from_profile_id', Count('id'))
+        annotations['follow_last_id'] = aggregate_subquery(follows, 'from_profile_id', Max('id'))
+
+    row = Article.objects.filter(slug=slug).annotate(**annotations).values('pk', *annotations).first()
+    if row is None:
+        return None, Validators((None,), vary=VARY_VIEWER)
+
+    return row['pk'], Validators(tuple(row.values()), vary=VARY_VIEWER)
+
+
+def get_tag_list_validators():
+    """
+    전체 태그 목록 (?top 없이). 생성 순서로 정렬하므로 개수와 updated_at 최댓값이면 충분하다.
+    """
+    row = Tag.objects.order_by().aggregate(count=Count('id'), updated_at=Max('updated_at'))
+    return Validators((row['count'], row['updated_at']))
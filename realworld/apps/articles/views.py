@@ -4,44 +4,58 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticate
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from realworld.apps.articles.cache import article_response_cache, ALL_ARTICLES, ALL_TAGS, tag_version_key
+from realworld.apps.articles.feeds import Feed, FeedPagination
 from realworld.apps.articles.models import Article, Tag, Comment
+from realworld.apps.articles.planner import ArticleFilterPlanner
+from realworld.apps.articles.readers import article_values, read_articles, get_cache_rows, comment_values, \
+    read_comments, article_values_in_order
 from realworld.apps.articles.renderers import ArticleJSONRenderer, CommentJSONRenderer
+from realworld.apps.articles.search import SearchPagination, get_query_terms, get_search_backend
 from realworld.apps.articles.serializers import ArticleSerializer, TagSerializer, CommentSerializer
-from realworld.strings import ARTICLE_DOES_NOT_EXIST, YOU_CANT_DELETE_OTHERS_COMMENT, YOU_CANT_DELETE_OTHERS_ARTICLE
-
-
-def get_article_from_slug_or_404(slug):
+from realworld.apps.articles.validators import get_article_validators, get_comment_list_validators, \
+    get_tag_list_validators
+from realworld.apps.core.conditional import Validators
+from realworld.apps.core.metrics import RequestMetricsMixin
+from realworld.apps.core.pagination import KeysetPagination
+from realworld.apps.profiles import write_behind
+from realworld.strings import ARTICLE_DOES_NOT_EXIST, YOU_CANT_DELETE_OTHERS_COMMENT, YOU_CANT_DELETE_OTHERS_ARTICLE, \
+    INVALID_TOP, SEARCH_QUERY_REQUIRED
+
+
+def get_article_from_slug_or_404(slug, queryset=None):
+    if queryset is None:
+        queryset = Article.objects.with_author()
     try:
-        article = Article.objects.select_related('author', 'author__user').get(slug=slug)
+        article = queryset.get(slug=slug)
     except Article.DoesNotExist:
         raise NotFound(ARTICLE_DOES_NOT_EXIST)
     return article
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
+def filter_by_article_id(queryset, article_id):
+    if article_id is None:
+        return queryset.none()
+    return queryset.filter(article_id=article_id)
+
+
+def get_viewer_profile(request):
+    if request is None or not request.user.is_authenticated:
+        return None
+    return request.user.profile
+
+
+class ArticleViewSet(RequestMetricsMixin, viewsets.ModelViewSet):
     lookup_field = 'slug'
     queryset = Article.objects.select_related('author', 'author__user')
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
     renderer_classes = (ArticleJSONRenderer,)
     serializer_class = ArticleSerializer
 
     def get_queryset(self):
-        queryset = self.queryset
-        filter_dict = {
-            'favorited': 'favorited_by__user__username',
-            'tag': 'tags__tag',
-            'author': 'author__user__username'
-        }
-
-        for param_name, field_name in filter_dict.items():
-            queryset = self.filter_by(queryset, param_name, field_name)
-        return queryset
-
-    def filter_by(self, queryset, param_name, field_name):
-        param = self.request.query_params.get(param_name, None)
-        if param is not None:
-            queryset = queryset.filter(**{field_name: param})
-        return queryset
+        queryset = self.queryset.for_listing(get_viewer_profile(self.request))
+        return ArticleFilterPlanner(self.request.query_params).filter(queryset)
 
     def create(self, request, *args, **kwargs):
         serializer_context = {
@@ -59,28 +73,59 @@ class ArticleViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    def list(self, request, *args, **kwargs):
-        serializer_context = {'request': request}
-        page = self.paginate_queryset(self.get_queryset())
+    def get_membership_key(self):
+        """
+        tag 한 개로만 거른 목록은 그 tag 의 버전만 보면 되고, 나머지는 전체 목록 버전을 본다.
+        """
+        params = set(self.request.query_params.keys()) & {'favorited', 'tag', 'author'}
+        if params == {'tag'} and len(self.request.query_params.getlist('tag')) == 1:
+            return tag_version_key(self.request.query_params['tag'])
+        return ALL_ARTICLES
 
-        serializer = self.serializer_class(
-            data=page,
-            context=serializer_context,
-            many=True
+    def list(self, request, *args, **kwargs):
+        cached = article_response_cache.get(request, get_viewer_profile(request))
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
+
+        snapshot = article_response_cache.snapshot()
+        page = self.paginate_queryset(article_values(self.get_queryset()))
+        response = self.get_paginated_response(read_articles(page))
+        article_response_cache.set(
+            request, response.data, get_cache_rows(page), self.get_membership_key(), snapshot=snapshot
         )
-        serializer.is_valid()
-
-        return self.get_paginated_response(serializer.data)
+        return response
 
     def retrieve(self, request, slug):
-        context = {'request': request}
-        article = get_article_from_slug_or_404(slug)
-        serializer = self.serializer_class(
-            article,
-            context=context
+        """
+        본문을 읽기 전에 조건부 GET 을 확인한다.
+        응답 cache 에 있으면 같이 넣어둔 Validators 를, 없으면 get_article_validators 의 query 한 번을 쓴다.
+        """
+        viewer = get_viewer_profile(request)
+        cached, validators = article_response_cache.get_with_validators(request, viewer)
+        if cached is not None and validators is not None:
+            validators = validators.extend(cached['favorited'], cached['author']['following'])
+            if validators.is_not_modified(request):
+                return validators.not_modified()
+            return validators.apply(Response(cached, status=status.HTTP_200_OK))
+
+        snapshot = article_response_cache.snapshot()
+        found = get_article_validators(slug, viewer)
+        if found is None:
+            raise NotFound(ARTICLE_DOES_NOT_EXIST)
+        shared_validators, favorited, author_following = found
+        validators = shared_validators.extend(favorited, author_following)
+        if validators.is_not_modified(request):
+            return validators.not_modified()
+
+        rows = list(article_values(Article.objects.for_listing(viewer).filter(slug=slug)))
+        data = read_articles(rows)
+        if not data:
+            raise NotFound(ARTICLE_DOES_NOT_EXIST)
+
+        article_response_cache.set(
+            request, data[0], get_cache_rows(rows), validators=shared_validators, snapshot=snapshot
         )
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return validators.apply(Response(data[0], status=status.HTTP_200_OK))
 
     def update(self, request, slug):
         context = {'request': request}
@@ -112,20 +157,36 @@ class ArticleViewSet(viewsets.ModelViewSet):
                 code=status.HTTP_403_FORBIDDEN)
 
 
-class CommentsListCreateAPIView(generics.ListCreateAPIView):
+class CommentsListCreateAPIView(RequestMetricsMixin, generics.ListCreateAPIView):
     lookup_field = 'article__slug'
     lookup_url_kwarg = 'article_slug'
     permission_classes = (IsAuthenticatedOrReadOnly,)
-    queryset = Comment.objects.select_related(
-        'article', 'article__author', 'article__author__user',
-        'author', 'author__user'
-    )
+    pagination_class = KeysetPagination
+    queryset = Comment.objects.all()
     renderer_classes = (CommentJSONRenderer,)
     serializer_class = CommentSerializer
 
     def filter_queryset(self, queryset):
-        filters = {self.lookup_field: self.kwargs[self.lookup_url_kwarg]}
-        return queryset.filter(**filters)
+        """
+        slug 를 article id 로 먼저 바꿔서 (article_id, created_at, id) 인덱스만 읽는다.
+        """
+        article_id = Article.objects.filter(
+            slug=self.kwargs[self.lookup_url_kwarg]
+        ).values_list('pk', flat=True).first()
+        return filter_by_article_id(queryset, article_id)
+
+    def list(self, request, *args, **kwargs):
+        """
+        article id 는 조건부 GET 의 validator query 에서 같이 읽는다.
+        """
+        viewer = get_viewer_profile(request)
+        article_id, validators = get_comment_list_validators(self.kwargs[self.lookup_url_kwarg], viewer)
+        if validators.is_not_modified(request):
+            return validators.not_modified()
+
+        queryset = comment_values(filter_by_article_id(self.get_queryset(), article_id), viewer)
+        page = self.paginate_queryset(queryset)
+        return validators.apply(self.get_paginated_response(read_comments(page)))
 
     def create(self, request, article_slug=None):
         data = request.data.get('comment', {})
@@ -141,7 +202,7 @@ class CommentsListCreateAPIView(generics.ListCreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class CommentsDestroyAPIView(generics.DestroyAPIView):
+class CommentsDestroyAPIView(RequestMetricsMixin, generics.DestroyAPIView):
     lookup_url_kwarg = 'comment_pk'
     permission_classes = (IsAuthenticatedOrReadOnly,)
     queryset = Comment.objects.all()
@@ -168,7 +229,7 @@ class CommentsDestroyAPIView(generics.DestroyAPIView):
                 code=status.HTTP_403_FORBIDDEN)
 
 
-class ArticlesFavoriteAPIView(APIView):
+class ArticlesFavoriteAPIView(RequestMetricsMixin, APIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ArticleJSONRenderer,)
     serializer_class = ArticleSerializer
@@ -176,14 +237,14 @@ class ArticlesFavoriteAPIView(APIView):
     def delete(self, request, article_slug=None):
         return self.context(
             request, article_slug,
-            strategy=lambda profile, article: profile.unfavorite(article),
+            strategy=write_behind.unfavorite,
             status_code=status.HTTP_200_OK
         )
 
     def post(self, request, article_slug=None):
         return self.context(
             request, article_slug,
-            strategy=lambda profile, article: profile.favorite(article),
+            strategy=write_behind.favorite,
             status_code=status.HTTP_201_CREATED
         )
 
@@ -198,39 +259,98 @@ class ArticlesFavoriteAPIView(APIView):
         return Response(serializer.data, status=status_code)
 
 
-class TagListAPIView(generics.ListAPIView):
+class TagListAPIView(RequestMetricsMixin, generics.ListAPIView):
     queryset = Tag.objects.all()
     pagination_class = None
     permission_classes = (AllowAny,)
     serializer_class = TagSerializer
+    top_query_param = 'top'
+    max_top = 100
 
-    def list(self, request):
-        serializer_data = self.get_queryset()
-        serializer = self.serializer_class(serializer_data, many=True)
-
-        return Response({
-            'tags': serializer.data
-        }, status=status.HTTP_200_OK)
-
+    def get_queryset(self):
+        top = self.get_top()
+        if top is None:
+            return self.queryset.all()
+        return self.queryset.popular(top)
+
+    def get_top(self):
+        """
+        ?top=N 이면 articles_count 가 큰 순서로 N 개만
+        """
+        top = self.request.query_params.get(self.top_query_param, None)
+        if top is None:
+            return None
+        try:
+            top = int(top)
+        except ValueError:
+            raise exceptions.ValidationError({self.top_query_param: INVALID_TOP})
+        if top <= 0:
+            raise exceptions.ValidationError({self.top_query_param: INVALID_TOP})
+        return min(top, self.max_top)
 
-class ArticlesFeedAPIView(generics.ListAPIView):
+    def list(self, request):
+        """
+        전체 목록은 읽기 전에 validator 로 조건부 GET 을 확인한다.
+        ?top 은 순서가 articles_count 에 달려 있어서 (cache 된) 태그 이름 목록 자체로 ETag 를 만든다.
+        """
+        top = self.get_top()
+        validators = None
+        if top is None:
+            validators = get_tag_list_validators()
+            if validators.is_not_modified(request):
+                return validators.not_modified()
+
+        data = article_response_cache.get_plain(request)
+        if data is None:
+            snapshot = article_response_cache.snapshot()
+            serializer_data = self.get_queryset()
+            serializer = self.serializer_class(serializer_data, many=True)
+            data = {'tags': serializer.data}
+            article_response_cache.set_plain(request, data, [ALL_TAGS], snapshot=snapshot)
+
+        if validators is None:
+            validators = Validators(data['tags'])
+            if validators.is_not_modified(request):
+                return validators.not_modified()
+        return validators.apply(Response(data, status=status.HTTP_200_OK))
+
+
+class ArticlesFeedAPIView(RequestMetricsMixin, generics.ListAPIView):
+    pagination_class = FeedPagination
     permission_classes = (IsAuthenticated,)
     queryset = Article.objects.all()
     renderer_classes = (ArticleJSONRenderer,)
     serializer_class = ArticleSerializer
 
     def get_queryset(self):
-        return Article.objects.filter(
-            author__in=self.request.user.profile.follows.all()
-        )
+        return Article.objects.for_listing(self.request.user.profile)
+
+    def get_feed(self):
+        return Feed(self.request.user.profile)
 
     def list(self, request):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
+        keys = self.paginator.paginate_feed(self.get_feed(), request)
+        page = article_values_in_order(self.get_queryset(), [key.id for key in keys])
+        return self.get_paginated_response(read_articles(page))
 
-        serializer_context = {'request': request}
-        serializer = self.serializer_class(
-            page, context=serializer_context, many=True
-        )
 
-        return self.get_paginated_response(serializer.data)
+class ArticleSearchAPIView(RequestMetricsMixin, generics.GenericAPIView):
+    """
+    ?q= 의 단어 중 하나라도 들어간 글을 BM25 점수 순으로 (?cursor=, ?limit=, ?count=false)
+    """
+    pagination_class = SearchPagination
+    permission_classes = (AllowAny,)
+    renderer_classes = (ArticleJSONRenderer,)
+    search_query_param = 'q'
+
+    def get(self, request):
+        terms = get_query_terms(request.query_params.get(self.search_query_param, ''))
+        if not terms:
+            raise exceptions.ValidationError({self.search_query_param: SEARCH_QUERY_REQUIRED})
+
+        hits = self.paginator.paginate_search(get_search_backend(), terms, request)
+        page = article_values_in_order(
+            Article.objects.for_listing(get_viewer_profile(request)),
+            [article_id for article_id, _ in hits],
+        )
+        return self.get_paginated_response(read_articles(page))
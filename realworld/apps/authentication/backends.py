@@ -5,6 +5,7 @@ from django.conf import settings
 from jwt import PyJWTError
 from rest_framework import authentication, exceptions
 
+from .cache import jwt_user_cache
 from .models import JwtUser
 from ...strings import COULD_NOT_DECODE_TOKEN, NO_USER_FOUND_WITH_TOKEN, USER_HAS_BEEN_DEACTIVATED
 
@@ -32,19 +33,26 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
         return self._authenticate_credentials(token)
 
+    @classmethod
+    def _authenticate_credentials(cls, token) -> Tuple[JwtUser, str]:
+        user = jwt_user_cache.get(token)
+        if user is None:
+            user = cls._load_user(token)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(USER_HAS_BEEN_DEACTIVATED)
+
+        return user, token
+
     @staticmethod
-    def _authenticate_credentials(token) -> Tuple[JwtUser, str]:
+    def _load_user(token) -> JwtUser:
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
         except PyJWTError:
             raise exceptions.AuthenticationFailed(COULD_NOT_DECODE_TOKEN)
 
         try:
-            user = JwtUser.objects.get(pk=payload['id'])
+            user = jwt_user_cache.load(token, payload)
         except JwtUser.DoesNotExist:
             raise exceptions.AuthenticationFailed(NO_USER_FOUND_WITH_TOKEN)
-
-        if not user.is_active:
-            raise exceptions.AuthenticationFailed(USER_HAS_BEEN_DEACTIVATED)
-
-        return user, token
+        return user
@@ -0,0 +1,129 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import router
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from realworld.apps.authentication.models import JwtUser
+from realworld.apps.core.cache import LRUCache
+from realworld.apps.profiles.models import Profile
+
+DEFAULT_JWT_AUTH_CACHE_SIZE = 1024
+DEFAULT_JWT_AUTH_CACHE_TTL = 60
+
+# 인증된 요청에 필요한 필드만 담는다. password (hash) 는 공유 cache 에 넣지 않는다.
+# 빠진 필드는 deferred 라서 save() 할 때도 쓰지 않는다. (followers_count 같은 카운터를 오래된 값으로 덮지 않는다)
+USER_SNAPSHOT_FIELDS = (
+    'id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser', 'last_login', 'created_at', 'updated_at',
+)
+PROFILE_SNAPSHOT_FIELDS = ('id', 'user_id', 'bio', 'image', 'created_at', 'updated_at')
+
+
+def take_snapshot(obj, field_names):
+    return {name: getattr(obj, name) for name in field_names}
+
+
+def build_from_snapshot(model, snapshot):
+    # from_db 는 일부 필드만 받을 때 concrete_fields 순서를 기대한다.
+    field_names = [field.attname for field in model._meta.concrete_fields if field.attname in snapshot]
+    values = [snapshot[name] for name in field_names]
+    return model.from_db(router.db_for_read(model), field_names, values)
+
+
+class JwtUserCache:
+    """
+    검증된 token -> user + profile snapshot
+    1. 프로세스 내 LRU (token 단위, TTL)
+    2. 선택적으로 Django cache (JWT_AUTH_SHARED_CACHE, user id 단위)
+    다른 프로세스의 LRU 는 지울 수 없으므로 JWT_AUTH_CACHE_TTL 안에서만 오래된 값이 보일 수 있다.
+    """
+    shared_key_prefix = 'jwt-auth:user:'
+
+    def __init__(self):
+        self.tokens = LRUCache(
+            maxsize=getattr(settings, 'JWT_AUTH_CACHE_SIZE', DEFAULT_JWT_AUTH_CACHE_SIZE)
+        )
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'JWT_AUTH_CACHE_TTL', DEFAULT_JWT_AUTH_CACHE_TTL)
+
+    @property
+    def shared_cache(self):
+        alias = getattr(settings, 'JWT_AUTH_SHARED_CACHE', None)
+        if alias is None:
+            return None
+        return caches[alias]
+
+    def get(self, token):
+        snapshot = self.tokens.get(token)
+        if snapshot is None:
+            return None
+        return self.build_user(snapshot)
+
+    def load(self, token, payload):
+        """
+        token 이 가리키는 user 를 읽어 캐시에 넣는다. 없으면 JwtUser.DoesNotExist
+        """
+        snapshot = self.get_shared(payload['id'])
+        if snapshot is None:
+            user = JwtUser.objects.select_related('profile').get(pk=payload['id'])
+            snapshot = self.take_user_snapshot(user)
+            self.set_shared(user.pk, snapshot)
+
+        ttl = self.ttl
+        if 'exp' in payload:
+            ttl = min(ttl, payload['exp'] - time.time())
+        if ttl > 0:
+            self.tokens.set(token, snapshot, ttl)
+        return self.build_user(snapshot)
+
+    def invalidate_user(self, user_id):
+        self.tokens.delete_matching(lambda snapshot: snapshot['user']['id'] == user_id)
+        if self.shared_cache is not None:
+            self.shared_cache.delete(self.shared_key_prefix + str(user_id))
+
+    def clear(self):
+        self.tokens.clear()
+
+    def get_shared(self, user_id):
+        if self.shared_cache is None:
+            return None
+        return self.shared_cache.get(self.shared_key_prefix + str(user_id))
+
+    def set_shared(self, user_id, snapshot):
+        if self.shared_cache is not None:
+            self.shared_cache.set(self.shared_key_prefix + str(user_id), snapshot, self.ttl)
+
+    @staticmethod
+    def take_user_snapshot(user):
+        try:
+            profile = take_snapshot(user.profile, PROFILE_SNAPSHOT_FIELDS)
+        except ObjectDoesNotExist:
+            profile = None
+        return {'user': take_snapshot(user, USER_SNAPSHOT_FIELDS), 'profile': profile}
+
+    @staticmethod
+    def build_user(snapshot):
+        user = build_from_snapshot(JwtUser, snapshot['user'])
+        if snapshot['profile'] is not None:
+            user.profile = build_from_snapshot(Profile, snapshot['profile'])
+        return user
+
+
+jwt_user_cache = JwtUserCache()
+
+
+@receiver(post_save, sender=JwtUser)
+@receiver(post_delete, sender=JwtUser)
+def invalidate_cached_user(sender, instance, *args, **kwargs):
+    jwt_user_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(sender, instance, *args, **kwargs):
+    jwt_user_cache.invalidate_user(instance.user_id)
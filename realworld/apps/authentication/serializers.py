@@ -1,6 +1,7 @@
 from django.contrib.auth import authenticate
 from rest_framework import serializers
 
+from realworld.apps.authentication.cache import jwt_user_cache
 from realworld.apps.authentication.models import JwtUser
 from realworld.apps.profiles.serializers import ProfileSerializer
 from realworld.strings import NO_USER_FOUND_WITH_EMAIL_PASSWORD
@@ -81,5 +82,6 @@ class UserSerializer(serializers.ModelSerializer):
         for (key, value) in profile_data.items():
             setattr(instance.profile, key, value)
         instance.profile.save()
+        jwt_user_cache.invalidate_user(instance.pk)
 
         return instance
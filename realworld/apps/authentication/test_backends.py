@@ -1,7 +1,14 @@
+import json
 from datetime import datetime
 
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from realworld.apps.authentication.cache import jwt_user_cache
 from realworld.apps.authentication.models import JwtUser
 from realworld.apps.authentication.renderers import JwtUserJSONRenderer
+from realworld.apps.profiles.models import Profile
+from realworld.testing_util import TestCaseWithAuth, REGISTER_DATA, REGISTER_URL, parse_body
 
 EXPECTED_TOKEN = "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.eyJpZCI6bnVsbC"
 dt = datetime(2021, 1, 16, 13, 43, 39, 452056)
@@ -20,8 +27,76 @@ def test_json_renderer():
         "email": 'twinstae@gmail.com',
         "token": EXPECTED_TOKEN
     })
-    assert rendered_json == EXPECTED_JSON
+    assert json.loads(rendered_json) == json.loads(EXPECTED_JSON)
 
 
 def test_get_token():
     assert user.get_token(user.pk, dt)[:50] == EXPECTED_TOKEN[:50]
+
+
+class JWTAuthenticationCacheTest(TestCaseWithAuth):
+
+    def setUp(self) -> None:
+        jwt_user_cache.clear()
+        self.user_1 = self.create_get_user(REGISTER_DATA)
+        self.token_client = APIClient()
+        self.token_client.credentials(HTTP_AUTHORIZATION='Token ' + self.user_1.token)
+
+    def tearDown(self) -> None:
+        self.user_1.delete()
+        jwt_user_cache.clear()
+
+    def retrieve(self):
+        return self.token_client.get(REGISTER_URL + f'{self.user_1.pk}/')
+
+    def test_cached_user_needs_no_query(self):
+        self.assert_200_OK(self.retrieve())
+        with self.assertNumQueries(0):
+            response = self.retrieve()
+        self.assert_200_OK(response)
+        assert parse_body(response)['user']['username'] == self.user_1.username
+
+    def test_invalidate_on_profile_update(self):
+        self.assert_200_OK(self.retrieve())
+        response = self.token_client.put(
+            REGISTER_URL + f'{self.user_1.pk}/',
+            {'user': {'bio': '새 소개'}},
+            format='json'
+        )
+        self.assert_200_OK(response)
+        assert parse_body(self.retrieve())['user']['bio'] == '새 소개'
+
+    def test_invalidate_on_deactivation(self):
+        self.assert_200_OK(self.retrieve())
+        self.user_1.is_active = False
+        self.user_1.save()
+        self.assert_403_FORBIDDEN(self.retrieve())
+
+    def test_invalidate_user(self):
+        self.assert_200_OK(self.retrieve())
+        JwtUser.objects.filter(pk=self.user_1.pk).update(email='changed@gmail.com')
+        jwt_user_cache.invalidate_user(self.user_1.pk)
+        assert parse_body(self.retrieve())['user']['email'] == 'changed@gmail.com'
+
+    @override_settings(
+        JWT_AUTH_SHARED_CACHE='jwt-auth',
+        CACHES={'jwt-auth': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'jwt-auth'}},
+    )
+    def test_shared_snapshot_has_no_password(self):
+        self.assert_200_OK(self.retrieve())
+        snapshot = jwt_user_cache.get_shared(self.user_1.pk)
+        assert snapshot['user']['username'] == self.user_1.username
+        assert 'password' not in snapshot['user']
+        assert self.user_1.password not in repr(snapshot)
+
+    def test_profile_update_keeps_counters(self):
+        self.assert_200_OK(self.retrieve())
+        # 카운터는 signal 없이 UPDATE 로 바뀌므로 cache 된 profile 은 모른다.
+        Profile.objects.filter(pk=self.user_1.profile.pk).update(followers_count=3)
+        self.assert_200_OK(self.token_client.put(
+            REGISTER_URL + f'{self.user_1.pk}/',
+            {'user': {'bio': '새 소개'}},
+            format='json'
+        ))
+        self.user_1.profile.refresh_from_db()
+        assert self.user_1.profile.followers_count == 3
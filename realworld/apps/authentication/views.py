@@ -6,9 +6,10 @@ from rest_framework.views import APIView
 
 from realworld.apps.authentication.renderers import JwtUserJSONRenderer
 from realworld.apps.authentication.serializers import RegistrationSerializer, LoginSerializer, UserSerializer
+from realworld.apps.core.metrics import RequestMetricsMixin
 
 
-class RegistrationAPIView(APIView):
+class RegistrationAPIView(RequestMetricsMixin, APIView):
     permission_classes = (AllowAny,)
     renderer_classes = (JwtUserJSONRenderer,)
     serializer_class = RegistrationSerializer
@@ -22,7 +23,7 @@ class RegistrationAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class LoginAPIView(APIView):
+class LoginAPIView(RequestMetricsMixin, APIView):
     permission_classes = (AllowAny,)
     renderer_classes = (JwtUserJSONRenderer,)
     serializer_class = LoginSerializer
@@ -42,7 +43,7 @@ def get_validated_user_serializer(request, serializer_class):
     return serializer
 
 
-class UserRetrieveUpdateAPIView(RetrieveUpdateAPIView):
+class UserRetrieveUpdateAPIView(RequestMetricsMixin, RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (JwtUserJSONRenderer,)
     serializer_class = UserSerializer
@@ -2,4 +2,11 @@ from django.apps import AppConfig
 
 
 class CoreConfig(AppConfig):
-    name = 'core'
+    name = 'realworld.apps.core'
+    label = 'core'
+
+    def ready(self):
+        import realworld.apps.core.metrics
+
+
+default_app_config = 'realworld.apps.core.CoreConfig'
@@ -0,0 +1,111 @@
+"""
+ASGI 에서 GET 을 받는 async view 용 도구
+Django 3.2 에는 async ORM (aget, async for) 이 없고, DRF 3.12 의 APIView 는 async handler 를 지원하지 않는다.
+- ORM 호출은 database_sync_to_async 로 스레드에서 돌린다.
+  ASYNC_DB_CONCURRENCY 가 True 면 thread_sensitive=False 로, 서로 독립인 query 가 각자의 connection 으로 동시에 돈다.
+  기본값(False)은 thread_sensitive=True 라서 테스트의 transaction 안 데이터가 그대로 보이지만,
+  Django 3.2 의 ASGIHandler 는 요청마다 따로 스레드를 주지 않으므로 모든 async view 의 DB 작업이
+  프로세스 전체에서 스레드 하나로 차례로 돈다. ASGI 로 배포할 때는 ASYNC_DB_CONCURRENCY = True 로 켠다.
+- AsyncReadView 는 같은 route 의 DRF view 로 인증, 권한, 예외 처리, 렌더링을 그대로 한다.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.exceptions import MethodNotAllowed
+
+
+def database_sync_to_async(func):
+    """
+    ASYNC_DB_CONCURRENCY 가 꺼져 있으면 (기본) 다른 요청의 DB 작업과 같은 스레드에서 차례로 돈다. (모듈 docstring)
+    """
+    if not getattr(settings, 'ASYNC_DB_CONCURRENCY', False):
+        return sync_to_async(func, thread_sensitive=True)
+
+    def run_in_pool_thread(*args, **kwargs):
+        # pool 의 스레드는 요청이 끝날 때 connection 을 정리해주지 않으므로 직접 한다. (CONN_MAX_AGE 기준)
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run_in_pool_thread, thread_sensitive=False)
+
+
+async def gather(*calls):
+    """
+    calls: (func, *args) 묶음. 결과는 같은 순서의 list
+    """
+    return await asyncio.gather(*(database_sync_to_async(func)(*args) for func, *args in calls))
+
+
+async def paginate(paginator, queryset, request):
+    """
+    KeysetPagination 의 페이지 row 와 count 를 동시에 읽는다.
+    """
+    page_queryset = paginator.get_page_queryset(queryset, request)
+    if page_queryset is None:
+        page_queryset = queryset
+    if not paginator.count_enabled:
+        rows, = await gather((list, page_queryset))
+        paginator.count = None
+    else:
+        rows, paginator.count = await gather((list, page_queryset), (paginator.get_count, queryset))
+    return paginator.get_page(rows)
+
+
+class AsyncReadView:
+    """
+    view_class(**view_initkwargs) 인스턴스를 만들어 DRF 의 dispatch 와 같은 순서로 처리한다.
+    하위 클래스는 async def get(self, view, request, *args, **kwargs) -> Response 를 구현한다.
+    """
+    view_class = None
+    view_initkwargs = {}
+
+    @classmethod
+    def as_view(cls):
+        async def view(request, *args, **kwargs):
+            return await cls().dispatch(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        view = self.view_class(**self.view_initkwargs)
+        view.args = args
+        view.kwargs = kwargs
+        request = view.initialize_request(request, *args, **kwargs)
+        view.request = request
+        view.headers = view.default_response_headers
+
+        try:
+            if request.method != 'GET':
+                raise MethodNotAllowed(request.method)
+            await database_sync_to_async(view.initial)(request, *args, **kwargs)
+            response = await self.get(view, request, *args, **kwargs)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+
+        response = view.finalize_response(request, response, *args, **kwargs)
+        return response.render()
+
+    async def get(self, view, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+def get_or_sync_view(async_view, sync_view):
+    """
+    GET 은 async view 로, 나머지 method 는 DRF view 로 (ASGI 에서 Django 가 sync view 를 부르는 것과 같이)
+    """
+    sync_view = sync_to_async(sync_view, thread_sensitive=True)
+
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET':
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    return view
@@ -0,0 +1,58 @@
+"""
+조건부 GET (If-None-Match)
+view 는 본문을 읽고 직렬화하기 전에 좁은 query 로 Validators 를 만들고, 요청 조건에 맞으면 본문 없이 304 를 돌려준다.
+- ETag 는 strong 이다. parts 에는 응답 본문에 들어가는 값이 바뀌면 반드시 같이 바뀌는 값을 모두 넣는다.
+- Last-Modified / If-Modified-Since 는 쓰지 않는다. 글, 댓글, 태그 응답은 모두 좋아요 수, 팔로우, 삭제처럼
+  updated_at 을 바꾸지 않는 변경에도 달라지므로, 시각만 보는 client 가 바뀐 응답을 304 로 받게 되기 때문이다.
+- viewer 에 따라 본문이 달라지는 응답은 vary=('Authorization',) 로 만든다. (200, 304 모두 Vary 를 붙인다)
+"""
+import hashlib
+
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+VARY_VIEWER = ('Authorization',)
+
+
+def make_etag(parts) -> str:
+    return quote_etag(hashlib.md5(repr(tuple(parts)).encode('utf-8')).hexdigest())
+
+
+class Validators:
+    def __init__(self, parts, vary=()):
+        self.parts = tuple(parts)
+        self.vary = tuple(vary)
+
+    def extend(self, *parts):
+        """
+        viewer 상태처럼 공유 cache 에 넣을 수 없는 값을 덧붙인 새 Validators
+        """
+        return Validators(self.parts + parts, self.vary)
+
+    @property
+    def etag(self) -> str:
+        return make_etag(self.parts)
+
+    def is_not_modified(self, request) -> bool:
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is None:
+            return False
+        etags = parse_etags(if_none_match)
+        return '*' in etags or self.etag in etags
+
+    def get_headers(self) -> dict:
+        return {'ETag': self.etag}
+
+    def apply(self, response):
+        for name, value in self.get_headers().items():
+            response[name] = value
+        if self.vary:
+            patch_vary_headers(response, self.vary)
+        return response
+
+    def not_modified(self):
+        return self.apply(Response(status=status.HTTP_304_NOT_MODIFIED))
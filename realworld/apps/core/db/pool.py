@@ -0,0 +1,315 @@
+"""
+database alias 마다 raw DB-API connection 을 모아두고 다시 쓰는 connection pool
+Django 는 CONN_MAX_AGE=0 이면 요청이 끝날 때마다 connection 을 닫고 다음 요청에서 다시 연다.
+pool 을 쓰는 backend (backends/sqlite3, backends/postgresql) 는 닫는 대신 pool 에 돌려주고, 열 때 pool 에서 꺼낸다.
+connection 은 스레드와 상관없이 pool 에 돌아가므로 ASGI 에서 요청마다 스레드가 바뀌어도 다시 쓴다.
+
+    'default': {
+        'ENGINE': 'realworld.apps.core.db.backends.sqlite3',  # 또는 ...backends.postgresql
+        'NAME': ...,
+        'CONN_MAX_AGE': 0,
+        'POOL': {'MAX_SIZE': 10, 'IDLE_TIMEOUT': 300, 'CHECKOUT_TIMEOUT': 5, 'HEALTH_CHECK': True},
+    }
+
+- MAX_SIZE: 빌려준 것과 쉬는 것을 합친 최대 connection 수. 다 빌려줬으면 CHECKOUT_TIMEOUT 초까지 기다린다.
+- IDLE_TIMEOUT: 이보다 오래 쉰 connection 은 꺼낼 때 닫고 새로 연다. (None 이면 무제한)
+- HEALTH_CHECK: 쉬던 connection 을 꺼낼 때 SELECT 1 로 확인하고, 실패하면 닫고 다음 것을 꺼낸다.
+통계는 stats() 와 /metrics/ 의 db_pool_* 로 본다.
+prefork 서버의 worker 는 fork 뒤에 부모의 pool 을 비우고 새로 시작한다. (reset_pools_after_fork)
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from realworld.apps.core.metrics import registry
+
+DEFAULT_MAX_SIZE = 10
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_CHECKOUT_TIMEOUT = 5.0
+
+POOL_COUNTERS = ('created', 'reused', 'closed', 'health_check_failures', 'expired', 'timeouts')
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def check_health(raw_connection):
+    cursor = raw_connection.cursor()
+    try:
+        cursor.execute('SELECT 1')
+        cursor.fetchall()
+    finally:
+        cursor.close()
+    # autocommit 이 아닌 connection 에 열린 transaction 을 남기지 않는다.
+    raw_connection.rollback()
+
+
+def close_quietly(raw_connection):
+    try:
+        raw_connection.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    def __init__(self, alias, max_size=DEFAULT_MAX_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT, health_check=True):
+        self.alias = alias
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check = health_check
+        # 쉬는 (connection, 돌려받은 시각). 가장 최근에 돌려받은 것부터 꺼내고, 오래 쉰 것은 왼쪽 끝에서 닫는다.
+        self.idle = deque()
+        self.in_use = 0
+        self.bypass = False
+        self.counters = dict.fromkeys(POOL_COUNTERS, 0)
+        self.connect_seconds = 0.0
+        self.checkout_seconds = 0.0
+        self.condition = threading.Condition()
+
+    @classmethod
+    def from_settings(cls, alias, settings_dict):
+        options = settings_dict.get('POOL') or {}
+        return cls(
+            alias,
+            max_size=options.get('MAX_SIZE', DEFAULT_MAX_SIZE),
+            idle_timeout=options.get('IDLE_TIMEOUT', DEFAULT_IDLE_TIMEOUT),
+            checkout_timeout=options.get('CHECKOUT_TIMEOUT', DEFAULT_CHECKOUT_TIMEOUT),
+            health_check=options.get('HEALTH_CHECK', True),
+        )
+
+    @property
+    def size(self):
+        return self.in_use + len(self.idle)
+
+    def checkout(self, connect):
+        """
+        쉬는 connection 을 꺼내거나, 자리가 있으면 connect() 로 새로 연다.
+        health check 는 lock 밖에서 쉬던 connection 에만 한다.
+        """
+        started = time.perf_counter()
+        while True:
+            raw_connection = self.reserve(started)
+            if raw_connection is None:
+                break
+            if not self.health_check or self.is_healthy(raw_connection):
+                self.observe_checkout(started, 'reused')
+                return raw_connection
+
+        connect_started = time.perf_counter()
+        try:
+            raw_connection = connect()
+        except Exception:
+            self.release_slot()
+            raise
+        with self.condition:
+            self.counters['created'] += 1
+            self.connect_seconds += time.perf_counter() - connect_started
+        self.observe_checkout(started, 'created')
+        return raw_connection
+
+    def reserve(self, started):
+        """
+        쉬는 connection 하나를 빌려주거나, 없으면 새로 열 자리를 잡고 None 을 돌려준다. (둘 다 in_use 에 센다)
+        """
+        with self.condition:
+            while True:
+                raw_connection = self.take_idle()
+                if raw_connection is not None or self.size < self.max_size:
+                    self.in_use += 1
+                    return raw_connection
+                remaining = self.checkout_timeout - (time.perf_counter() - started)
+                if remaining <= 0 or not self.condition.wait(remaining):
+                    self.counters['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'{self.alias}: no connection available in {self.checkout_timeout}s (max size {self.max_size})'
+                    )
+
+    def take_idle(self):
+        """
+        condition 을 잡은 채로 부른다. IDLE_TIMEOUT 이 지난 것을 먼저 닫는다.
+        """
+        if self.idle_timeout is not None:
+            expires_before = time.monotonic() - self.idle_timeout
+            while self.idle and self.idle[0][1] < expires_before:
+                self.counters['expired'] += 1
+                self.discard_idle(self.idle.popleft()[0])
+        if not self.idle or self.bypass:
+            return None
+        return self.idle.pop()[0]
+
+    def is_healthy(self, raw_connection):
+        try:
+            check_health(raw_connection)
+        except Exception:
+            with self.condition:
+                self.counters['health_check_failures'] += 1
+            self.discard(raw_connection)
+            return False
+        return True
+
+    def release_slot(self):
+        with self.condition:
+            self.in_use -= 1
+            self.condition.notify()
+
+    def observe_checkout(self, started, source):
+        elapsed = time.perf_counter() - started
+        with self.condition:
+            if source == 'reused':
+                self.counters['reused'] += 1
+            self.checkout_seconds += elapsed
+        registry.observe('db_pool_checkout_seconds', elapsed, alias=self.alias, source=source)
+
+    def discard_idle(self, raw_connection):
+        self.counters['closed'] += 1
+        close_quietly(raw_connection)
+
+    def checkin(self, raw_connection):
+        with self.condition:
+            self.in_use -= 1
+            if self.bypass or self.size >= self.max_size:
+                self.counters['closed'] += 1
+                close_quietly(raw_connection)
+            else:
+                self.idle.append((raw_connection, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, raw_connection):
+        """
+        빌려간 connection 이 쓸 수 없게 되었을 때 (health check 실패, transaction 중에 닫힘, DB 오류) 돌려받지 않고 닫는다.
+        """
+        close_quietly(raw_connection)
+        with self.condition:
+            self.in_use -= 1
+            self.counters['closed'] += 1
+            self.condition.notify()
+
+    def reset_after_fork(self):
+        """
+        fork 한 자식에서 부른다. 쉬던 connection 은 부모와 socket 을 나눠 쓰므로 닫지 않고 버린다.
+        fork 할 때 다른 스레드가 잡고 있던 lock 은 풀리지 않으므로 condition 도 새로 만든다.
+        """
+        self.condition = threading.Condition()
+        self.idle = deque()
+        self.in_use = 0
+        self.counters = dict.fromkeys(POOL_COUNTERS, 0)
+        self.connect_seconds = 0.0
+        self.checkout_seconds = 0.0
+
+    def clear(self):
+        with self.condition:
+            while self.idle:
+                self.discard_idle(self.idle.pop()[0])
+
+    @contextmanager
+    def bypassed(self):
+        """
+        pool 없이 매번 열고 닫는 것과 비교할 때 쓴다. (bench_concurrency --compare-pool)
+        """
+        self.clear()
+        self.bypass = True
+        try:
+            yield
+        finally:
+            self.bypass = False
+
+    def stats(self):
+        with self.condition:
+            return dict(
+                self.counters,
+                alias=self.alias,
+                in_use=self.in_use,
+                idle=len(self.idle),
+                max_size=self.max_size,
+                connect_seconds=self.connect_seconds,
+                checkout_seconds=self.checkout_seconds,
+            )
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool.from_settings(alias, settings_dict)
+    return pool
+
+
+def get_pools():
+    return list(_pools.values())
+
+
+def reset_pools_after_fork():
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    for pool in list(_pools.values()):
+        pool.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_pools_after_fork)
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    backend 의 DatabaseWrapper 앞에 섞는다. 여는 것과 닫는 것만 pool 로 바꾸고 나머지는 그대로다.
+    connect() 는 다시 쓰는 connection 에도 set_autocommit, init_connection_state 를 다시 한다.
+    fork 전에 부모가 열어둔 connection 은 자식의 pool 에 돌려주거나 닫지 않고 버린다.
+    """
+    pool_pid = None
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        self.pool_pid = os.getpid()
+        try:
+            return self.pool.checkout(lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params))
+        except PoolTimeout as error:
+            # wrap_database_errors 가 django.db.utils.OperationalError 로 바꾼다.
+            raise self.Database.OperationalError(str(error)) from error
+
+    def _close(self):
+        if self.connection is None or self.pool_pid != os.getpid():
+            return
+        # transaction 중에 닫히거나 오류가 난 뒤 쓸 수 없게 된 connection 은 돌려주지 않고 닫는다.
+        usable = not self.in_atomic_block and (not self.errors_occurred or self.is_usable())
+        if usable and not self.autocommit:
+            try:
+                self.connection.rollback()
+            except self.Database.Error:
+                usable = False
+        if usable:
+            self.pool.checkin(self.connection)
+        else:
+            self.pool.discard(self.connection)
+
+
+def collect_pool_connections():
+    for pool in get_pools():
+        stats = pool.stats()
+        yield {'alias': pool.alias, 'state': 'in_use'}, stats['in_use']
+        yield {'alias': pool.alias, 'state': 'idle'}, stats['idle']
+
+
+def collect_pool_events():
+    for pool in get_pools():
+        stats = pool.stats()
+        for name in POOL_COUNTERS:
+            yield {'alias': pool.alias, 'event': name}, stats[name]
+
+
+registry.register('db_pool_checkout_seconds', 'Time to get a connection from the pool (wait + connect)')
+registry.register_gauge('db_pool_connections', 'Pooled connections by state', collect_pool_connections)
+registry.register_gauge('db_pool_events', 'Pool connection events', collect_pool_events, kind='counter')
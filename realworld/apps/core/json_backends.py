@@ -0,0 +1,64 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.conf import settings
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def default(obj):
+    """
+    두 backend 가 직접 처리하지 못하는 값 (lazy 번역 문자열, Decimal 등)
+    """
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+class StdlibJSONBackend:
+    name = 'stdlib'
+
+    @staticmethod
+    def dumps(data) -> bytes:
+        return json.dumps(
+            data, default=default, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+
+
+class OrjsonBackend:
+    name = 'orjson'
+
+    @staticmethod
+    def dumps(data) -> bytes:
+        return orjson.dumps(data, default=default)
+
+
+JSON_BACKENDS = {
+    StdlibJSONBackend.name: StdlibJSONBackend,
+    OrjsonBackend.name: OrjsonBackend,
+}
+
+
+def get_json_backend(name=None):
+    """
+    REALWORLD_JSON_BACKEND 로 고를 수 있고, 없으면 orjson 이 설치되어 있을 때 orjson 을 쓴다.
+    """
+    name = name or getattr(settings, 'REALWORLD_JSON_BACKEND', None)
+    if name is None:
+        name = OrjsonBackend.name if orjson is not None else StdlibJSONBackend.name
+    if name == OrjsonBackend.name and orjson is None:
+        name = StdlibJSONBackend.name
+    return JSON_BACKENDS[name]
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from realworld.apps.core.replication import SqliteReplicator
+from realworld.apps.core.routers import get_replicas
+
+
+class Command(BaseCommand):
+    help = 'primary SQLite 파일을 --lag 초마다 replica 파일로 복사해서 복제 지연을 흉내냅니다. (Ctrl-C 로 끝냅니다)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', default=None, help='replica alias (기본: DATABASE_REPLICAS 의 첫 번째)')
+        parser.add_argument('--lag', type=float, default=2.0)
+        parser.add_argument('--once', action='store_true', help='한 번만 복사하고 끝냅니다.')
+
+    def handle(self, *args, **options):
+        replica = options['replica'] or next(iter(get_replicas()), None)
+        if replica is None:
+            raise CommandError('DATABASE_REPLICAS 가 비어 있습니다. --replica 로 alias 를 주세요.')
+        try:
+            replicator = SqliteReplicator.from_aliases(replica, lag=options['lag'])
+        except (KeyError, ValueError) as error:
+            raise CommandError(f'{replica}: {error}')
+
+        self.stdout.write(f'{replicator.primary_path} -> {replicator.replica_path} every {options["lag"]}s')
+        try:
+            replicator.run(iterations=1 if options['once'] else None)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f'{replicator.syncs} syncs.')
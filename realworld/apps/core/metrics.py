@@ -0,0 +1,233 @@
+"""
+요청 단위 계측 (query 수, SQL 시간, 직렬화 시간, 렌더링 시간)
+RequestMetricsMiddleware 가 요청마다 RequestMetrics 를 만들어 contextvar 에 두면, 모든 connection 에 걸어둔
+record_query 가 query 를 센다. 끝나면 route 별 히스토그램(registry)에 넣고,
+REQUEST_METRICS_SERVER_TIMING 을 켜면 Server-Timing 헤더로도 내보낸다.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+DEFAULT_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+DEFAULT_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_current_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    요청 하나의 query 수, SQL 시간, 구간별 시간
+    async view 에서는 여러 스레드가 동시에 더하므로 lock 을 잡는다.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.timings = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.queries += 1
+                self.sql_time += elapsed
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.timings[name] += seconds
+
+    def get_server_timing(self, total):
+        entries = [f'db;desc="{self.queries} queries";dur={self.sql_time * 1000:.2f}']
+        entries += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in self.timings.items()]
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+
+def get_request_metrics():
+    return _current_metrics.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    모든 connection 에 걸어두는 execute_wrapper. 계측 중인 요청이 아니면 그대로 실행한다.
+    contextvar 를 따라가므로 sync_to_async 로 넘어간 스레드의 query 도 그 요청에 센다.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # 같은 DatabaseWrapper 가 다시 연결될 때마다 불리므로 한 번만 건다.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def start_request_metrics():
+    metrics = RequestMetrics()
+    return metrics, _current_metrics.set(metrics)
+
+
+def stop_request_metrics(token):
+    _current_metrics.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """
+    계측 중인 요청이 아니면 아무것도 하지 않는다.
+    """
+    metrics = get_request_metrics()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - start)
+
+
+class RequestMetricsMixin:
+    """
+    DRF view 에 섞어 쓴다. handler 에서 SQL 을 뺀 시간을 serialize 로 기록한다.
+    (queryset 평가를 뺀 나머지 대부분이 serializer / reader 에서 dict 를 만드는 시간)
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        metrics = get_request_metrics()
+        if metrics is not None:
+            self._metrics_start = (time.perf_counter(), metrics.sql_time)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        metrics = get_request_metrics()
+        start = getattr(self, '_metrics_start', None)
+        if metrics is not None and start is not None:
+            started_at, sql_time = start
+            elapsed = time.perf_counter() - started_at
+            metrics.add('serialize', max(elapsed - (metrics.sql_time - sql_time), 0.0))
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class Histogram:
+    """
+    Prometheus 형식의 히스토그램 (le 는 누적이 아니라 구간별로 세고 출력할 때 누적한다)
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+    def __init__(self, namespace='realworld'):
+        self.namespace = namespace
+        self.definitions = {}
+        self.histograms = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, description, buckets=DEFAULT_TIME_BUCKETS):
+        self.definitions[name] = (description, tuple(buckets))
+
+    def register_gauge(self, name, description, collect, kind='gauge'):
+        """
+        값을 따로 모으지 않고 render 할 때마다 collect() 로 (labels dict, value) 들을 읽는다.
+        """
+        self.gauges[name] = (description, collect, kind)
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key, None)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.definitions[name][1])
+            histogram.observe(value)
+
+    def get(self, name, **labels):
+        return self.histograms.get((name, tuple(sorted(labels.items()))), None)
+
+    def clear(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def render(self):
+        """
+        Prometheus text exposition format (0.0.4)
+        """
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            snapshots = [(key, list(h.cumulative_counts()), h.sum, h.count) for key, h in histograms]
+
+        lines = []
+        for name, (description, _) in self.definitions.items():
+            full_name = f'{self.namespace}_{name}'
+            lines.append(f'# HELP {full_name} {description}')
+            lines.append(f'# TYPE {full_name} histogram')
+            for (histogram_name, labels), counts, total, count in snapshots:
+                if histogram_name != name:
+                    continue
+                for bound, cumulative in counts:
+                    lines.append(f'{full_name}_bucket{{{format_labels(labels, le=bound)}}} {cumulative}')
+                lines.append(f'{full_name}_sum{{{format_labels(labels)}}} {total}')
+                lines.append(f'{full_name}_count{{{format_labels(labels)}}} {count}')
+        for name, (description, collect, kind) in self.gauges.items():
+            full_name = f'{self.namespace}_{name}'
+            lines.append(f'# HELP {full_name} {description}')
+            lines.append(f'# TYPE {full_name} {kind}')
+            for labels, value in collect():
+                lines.append(f'{full_name}{{{format_labels(labels.items())}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    return ','.join(f'{key}="{escape_label(value)}"' for key, value in items)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+registry.register('request_duration_seconds', 'Total request time')
+registry.register('request_queries', 'SQL queries per request', DEFAULT_QUERY_BUCKETS)
+registry.register('request_sql_seconds', 'SQL time per request')
+registry.register('request_serialize_seconds', 'View handler time excluding SQL')
+registry.register('request_render_seconds', 'Renderer time')
+
+
+def observe_request(method, route, total, metrics):
+    labels = {'method': method, 'route': route}
+    registry.observe('request_duration_seconds', total, **labels)
+    registry.observe('request_queries', metrics.queries, **labels)
+    registry.observe('request_sql_seconds', metrics.sql_time, **labels)
+    for name in ('serialize', 'render'):
+        if name in metrics.timings:
+            registry.observe(f'request_{name}_seconds', metrics.timings[name], **labels)
@@ -0,0 +1,142 @@
+import asyncio
+import random
+import time
+
+from django.conf import settings
+
+from realworld.apps.core.metrics import observe_request, start_request_metrics, stop_request_metrics
+from realworld.apps.core.routers import is_pinned_to_primary, pin_to_primary, start_request_routing, \
+    stop_request_routing
+
+UNRESOLVED_ROUTE = 'unresolved'
+REPLICA_READ_METHODS = ('GET', 'HEAD')
+
+
+class RequestMetricsMiddleware:
+    """
+    REQUEST_METRICS_SAMPLE_RATE (0 ~ 1, 기본 1) 비율의 요청만 계측한다.
+    계측하지 않는 요청은 query 마다 contextvar 하나를 읽는 것 말고는 비용이 없다.
+
+    query 는 모든 alias, 모든 스레드의 connection 에 걸어둔 metrics.record_query 가 센다.
+    sync_to_async 로 넘어간 스레드는 요청의 context 를 물려받으므로 async view 의 query 도 센다.
+    요청 안에서 직접 띄운 threading.Thread 는 context 를 물려받지 않으므로 세지 않는다.
+
+    Server-Timing 헤더는 내부 구간과 query 수를 드러내므로 기본으로 붙이지 않는다.
+    REQUEST_METRICS_SERVER_TIMING 이 True 면 모든 응답에, 'staff' 면 is_staff 사용자의 응답에만 붙인다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        mark_async_if_needed(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.should_sample():
+            return self.get_response(request)
+
+        metrics, token = start_request_metrics()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self.should_sample():
+            return await self.get_response(request)
+
+        metrics, token = start_request_metrics()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    @staticmethod
+    def finish(request, response, metrics, total):
+        observe_request(request.method, get_route(request), total, metrics)
+        if should_expose_server_timing(request):
+            response['Server-Timing'] = metrics.get_server_timing(total)
+        return response
+
+    @staticmethod
+    def should_sample():
+        rate = getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 1.0)
+        return rate >= 1 or random.random() < rate
+
+
+def mark_async_if_needed(middleware):
+    """
+    get_response 가 coroutine 이면 Django 가 middleware 도 coroutine 으로 부르도록 표시한다.
+    (Django 3.2 의 MiddlewareMixin._async_check 와 같다)
+    """
+    if asyncio.iscoroutinefunction(middleware.get_response):
+        middleware._is_coroutine = asyncio.coroutines._is_coroutine
+
+
+def should_expose_server_timing(request):
+    expose = getattr(settings, 'REQUEST_METRICS_SERVER_TIMING', False)
+    if expose == 'staff':
+        # DRF 가 인증한 user 는 view 가 끝난 뒤 request.user 에도 들어 있다.
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_staff)
+    return bool(expose)
+
+
+def get_route(request):
+    """
+    실제 경로가 아니라 url pattern 으로 묶는다. (slug 마다 라벨이 생기지 않도록)
+    router 가 만든 정규식 pattern 은 끝의 $ 만 뗀다.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.route:
+        return UNRESOLVED_ROUTE
+    return '/' + match.route.rstrip('$')
+
+
+class ReadYourWritesMiddleware:
+    """
+    routers.ReplicaRouter 와 같이 쓴다.
+    GET, HEAD 요청의 읽기는 replica 로 보내고, 쓰기가 있었던 요청의 응답에는 cookie 를 붙여서
+    READ_YOUR_WRITES_SECONDS 동안 그 클라이언트의 읽기를 primary 로 묶는다.
+    routing 은 contextvar 라서 async view 가 sync_to_async 로 넘긴 query 에도 그대로 적용된다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        mark_async_if_needed(self)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        routing, token = start_request_routing(self.should_use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_routing(token)
+        return self.finish(routing, response)
+
+    async def __acall__(self, request):
+        routing, token = start_request_routing(self.should_use_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_request_routing(token)
+        return self.finish(routing, response)
+
+    @staticmethod
+    def should_use_replica(request):
+        return request.method in REPLICA_READ_METHODS and not is_pinned_to_primary(request)
+
+    @staticmethod
+    def finish(routing, response):
+        if routing.wrote:
+            pin_to_primary(response)
+        return response
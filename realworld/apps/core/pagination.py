@@ -0,0 +1,137 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+
+INVALID_CURSOR = 'Invalid cursor'
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """
+    ?cursor= 가 주어지면 (created_at, id) 기준 keyset 페이지네이션, 아니면 기존 limit/offset
+    ?count=false 를 주면 COUNT(*) 를 생략한다.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    keyset_fields = ('created_at', 'id')
+
+    cursor_mode = False
+    count_enabled = True
+    position = None
+    reverse = False
+    next_cursor = None
+    previous_cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        self.count = self.get_count(queryset) if self.count_enabled else None
+        if self.count is not None and self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        return self.get_page(list(page_queryset))
+
+    def get_count_enabled(self, request):
+        param = request.query_params.get(self.count_query_param, 'true')
+        return param.lower() not in ('false', '0')
+
+    def get_page_queryset(self, queryset, request):
+        """
+        아직 평가하지 않은 페이지 queryset (count 와 따로, 동시에 읽을 수 있도록)
+        결과 list 는 get_page 로 넘겨야 cursor 가 채워진다.
+        """
+        self.request = request
+        self.count_enabled = self.get_count_enabled(request)
+        self.cursor_mode = self.cursor_query_param in request.query_params
+
+        if self.cursor_mode:
+            return self.get_cursor_page_queryset(queryset, request)
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        return queryset[self.offset:self.offset + self.limit]
+
+    def get_cursor_page_queryset(self, queryset, request):
+        self.limit = self.get_limit(request) or self.default_limit
+        self.next_cursor = None
+        self.previous_cursor = None
+
+        self.position, self.reverse = self.decode_cursor(request.query_params[self.cursor_query_param])
+        queryset = queryset.order_by(*self.get_ordering(self.reverse))
+        if self.position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.position, self.reverse))
+        return queryset[:self.limit + 1]
+
+    def get_page(self, results):
+        if not self.cursor_mode:
+            return results
+
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if self.reverse:
+            results.reverse()
+
+        if results:
+            first, last = results[0], results[-1]
+            if self.reverse:
+                self.previous_cursor = self.encode_cursor(first, reverse=True) if has_more else None
+                self.next_cursor = self.encode_cursor(last, reverse=False)
+            else:
+                self.previous_cursor = self.encode_cursor(first, reverse=True) if self.position else None
+                self.next_cursor = self.encode_cursor(last, reverse=False) if has_more else None
+        return results
+
+    def get_ordering(self, reverse):
+        prefix = '' if reverse else '-'
+        return [prefix + field for field in self.keyset_fields]
+
+    def get_keyset_filter(self, position, reverse):
+        (major_field, minor_field), (major, minor) = self.keyset_fields, position
+        lookup = 'gt' if reverse else 'lt'
+        return Q(**{f'{major_field}__{lookup}': major}) | Q(
+            **{major_field: major, f'{minor_field}__{lookup}': minor}
+        )
+
+    def encode_cursor(self, item, reverse):
+        major, minor = [
+            item[field] if isinstance(item, dict) else getattr(item, field)
+            for field in self.keyset_fields
+        ]
+        payload = json.dumps({
+            'c': major.isoformat(),
+            'i': minor,
+            'r': int(reverse),
+        }, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(encoded):
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position = (datetime.fromisoformat(payload['c']), int(payload['i']))
+            return position, bool(payload['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(INVALID_CURSOR)
+
+    def get_paginated_response(self, data):
+        if self.cursor_mode:
+            return Response(OrderedDict([
+                ('count', self.count),
+                ('next_cursor', self.next_cursor),
+                ('previous_cursor', self.previous_cursor),
+                ('results', data),
+            ]))
+        if self.count_enabled:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', None),
+            ('results', data),
+        ]))
@@ -1,22 +1,40 @@
-import json
-
 from rest_framework.renderers import JSONRenderer
 
+from realworld.apps.core.json_backends import get_json_backend
+from realworld.apps.core.metrics import timed
+
 
 class RealworldJSONRenderer(JSONRenderer):
     charset = 'utf-8'
     object_label = 'object'
     pagination_object_label = 'objects'
     pagination_count_label = 'count'
+    pagination_next_cursor_label = 'nextCursor'
+    pagination_previous_cursor_label = 'prevCursor'
+    json_backend = None
 
     def render(self, data, media_type=None, renderer_context=None):
+        with timed('render'):
+            return self.render_body(data)
+
+    def render_body(self, data):
+        if data is None:
+            return b''
+
+        dumps = get_json_backend(self.json_backend).dumps
         if data.get('results', None) is not None:
-            return json.dumps({
-                self.pagination_object_label: data['results'],
-                self.pagination_count_label: data['count']
-            })
+            return dumps(self.get_pagination_body(data))
         elif data.get('errors', None) is not None:
-            return super(RealworldJSONRenderer, self).render(data)
+            return dumps(data)
 
         else:
-            return json.dumps({self.object_label: data})
+            return dumps({self.object_label: data})
+
+    def get_pagination_body(self, data):
+        body = {self.pagination_object_label: data['results']}
+        if data.get('count', None) is not None:
+            body[self.pagination_count_label] = data['count']
+        if 'next_cursor' in data:
+            body[self.pagination_next_cursor_label] = data['next_cursor']
+            body[self.pagination_previous_cursor_label] = data['previous_cursor']
+        return body
@@ -0,0 +1,51 @@
+"""
+로컬에서 replica 의 복제 지연을 흉내낸다. (routers.ReplicaRouter 확인용)
+primary SQLite 파일을 lag 초마다 replica 파일에 통째로 복사한다. (sqlite3 online backup)
+복사 사이에는 replica 가 최대 lag 초 전의 데이터를 돌려준다.
+"""
+import sqlite3
+import threading
+from contextlib import closing
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+def get_sqlite_path(alias):
+    database = settings.DATABASES[alias]
+    if database['ENGINE'] != 'django.db.backends.sqlite3':
+        raise ValueError(f'{alias} is not a SQLite database.')
+    return str(database['NAME'])
+
+
+class SqliteReplicator:
+    def __init__(self, primary_path, replica_path, lag=2.0):
+        self.primary_path = primary_path
+        self.replica_path = replica_path
+        self.lag = lag
+        self.syncs = 0
+        self.stopped = threading.Event()
+
+    @classmethod
+    def from_aliases(cls, replica, primary=DEFAULT_DB_ALIAS, lag=2.0):
+        return cls(get_sqlite_path(primary), get_sqlite_path(replica), lag)
+
+    def sync(self):
+        with closing(sqlite3.connect(self.primary_path)) as source, \
+                closing(sqlite3.connect(self.replica_path)) as target:
+            source.backup(target)
+        self.syncs += 1
+
+    def run(self, iterations=None):
+        """
+        stop() 하거나 iterations 번 복사할 때까지 lag 초마다 복사한다.
+        """
+        while True:
+            self.sync()
+            if iterations is not None and self.syncs >= iterations:
+                return
+            if self.stopped.wait(self.lag):
+                return
+
+    def stop(self):
+        self.stopped.set()
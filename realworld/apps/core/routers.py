@@ -0,0 +1,110 @@
+"""
+읽기 replica 로 보내는 database router (read-your-writes)
+- GET, HEAD 요청을 처리하는 동안의 ORM 읽기만 DATABASE_REPLICAS 중 하나로 보낸다.
+  요청 밖 (management command, 백그라운드 스레드) 과 primary 의 transaction 안에서의 읽기는 primary 로 간다.
+- 쓰기는 항상 primary 로 간다. 요청 중에 쓰기가 있으면 그 요청의 남은 읽기도 primary 로 가고,
+  ReadYourWritesMiddleware 가 응답에 cookie 를 붙여서 READ_YOUR_WRITES_SECONDS 동안 그 클라이언트의 읽기를 primary 에 묶는다.
+- 요청 간에 공유하는 cache (응답 cache, social graph) 를 채우는 읽기는 read_primary_from_now 로 primary 에서 한다.
+  지연된 replica 의 값이 현재 버전으로 cache 에 들어가면 다음 버전이 오를 때까지 남기 때문이다.
+
+로컬에서는 SQLite 파일 두 개와 simulate_replication 명령으로 복제 지연을 흉내낸다.
+    DATABASES = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db.sqlite3'},
+        'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'replica.sqlite3',
+                    'TEST': {'MIRROR': 'default'}},
+    }
+    DATABASE_ROUTERS = ['realworld.apps.core.routers.ReplicaRouter']
+    DATABASE_REPLICAS = ['replica']
+    MIDDLEWARE 에 'realworld.apps.core.middleware.ReadYourWritesMiddleware'
+"""
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DEFAULT_READ_YOUR_WRITES_SECONDS = 5.0
+DEFAULT_READ_YOUR_WRITES_COOKIE = 'read_primary_until'
+
+_current_routing = contextvars.ContextVar('replica_routing', default=None)
+
+
+class RequestRouting:
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def start_request_routing(use_replica):
+    routing = RequestRouting(use_replica)
+    return routing, _current_routing.set(routing)
+
+
+def stop_request_routing(token):
+    _current_routing.reset(token)
+
+
+def read_primary_from_now():
+    """
+    요청의 남은 읽기를 primary 로 보낸다.
+    """
+    routing = _current_routing.get()
+    if routing is not None:
+        routing.use_replica = False
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def get_pin_seconds():
+    return getattr(settings, 'READ_YOUR_WRITES_SECONDS', DEFAULT_READ_YOUR_WRITES_SECONDS)
+
+
+def get_pin_cookie():
+    return getattr(settings, 'READ_YOUR_WRITES_COOKIE', DEFAULT_READ_YOUR_WRITES_COOKIE)
+
+
+def is_pinned_to_primary(request) -> bool:
+    """
+    쓰기 직후의 cookie 가 아직 유효한지. 창보다 먼 미래 값은 무시한다. (cookie 로 primary 를 계속 쓰지 못하도록)
+    """
+    try:
+        until = float(request.COOKIES.get(get_pin_cookie(), ''))
+    except ValueError:
+        return False
+    now = time.time()
+    return now < until <= now + get_pin_seconds()
+
+
+def pin_to_primary(response):
+    seconds = get_pin_seconds()
+    response.set_cookie(
+        get_pin_cookie(), f'{time.time() + seconds:.3f}', max_age=int(seconds) + 1, httponly=True, samesite='Lax'
+    )
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _current_routing.get()
+        if routing is None or not routing.use_replica or routing.wrote:
+            return DEFAULT_DB_ALIAS
+        replicas = get_replicas()
+        if not replicas or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        routing = _current_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica 는 primary 의 복사본이므로 어느 쪽에서 읽은 객체끼리도 관계를 맺을 수 있다.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replica 의 스키마는 복제로 따라온다.
+        return db not in get_replicas()
@@ -0,0 +1,120 @@
+from django.test import modify_settings, override_settings
+
+from realworld.apps.core.metrics import Histogram, MetricsRegistry, registry
+from realworld.testing_util import TestCaseWithAuth
+
+ARTICLE_URL = '/api/articles'
+METRICS_URL = '/metrics/'
+ARTICLE_ROUTE = {'method': 'GET', 'route': '/api/articles'}
+
+
+def test_histogram_buckets():
+    histogram = Histogram((1, 5))
+    for value in (0, 1, 2, 7):
+        histogram.observe(value)
+    assert list(histogram.cumulative_counts()) == [(1, 2), (5, 3), ('+Inf', 4)]
+    assert histogram.sum == 10
+    assert histogram.count == 4
+
+
+def test_registry_render():
+    metrics = MetricsRegistry(namespace='test')
+    metrics.register('queries', 'SQL queries', (1, 5))
+    metrics.observe('queries', 3, route='/api/"x"')
+    rendered = metrics.render()
+    assert '# TYPE test_queries histogram' in rendered
+    assert 'test_queries_bucket{route="/api/\\"x\\"",le="1"} 0' in rendered
+    assert 'test_queries_bucket{route="/api/\\"x\\"",le="5"} 1' in rendered
+    assert 'test_queries_count{route="/api/\\"x\\""} 1' in rendered
+
+
+@modify_settings(MIDDLEWARE={'append': 'realworld.apps.core.middleware.RequestMetricsMiddleware'})
+class RequestMetricsMiddlewareTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+
+    def setUp(self):
+        registry.clear()
+
+    def test_server_timing_is_off_by_default(self):
+        response = self.client.get(ARTICLE_URL)
+        self.assert_200_OK(response)
+        assert not response.has_header('Server-Timing')
+        assert registry.get('request_queries', **ARTICLE_ROUTE).count == 1
+
+    @override_settings(REQUEST_METRICS_SERVER_TIMING='staff')
+    def test_server_timing_for_staff(self):
+        self.login()
+        assert not self.client.get(ARTICLE_URL).has_header('Server-Timing')
+        self.user_1.is_staff = True
+        self.user_1.save()
+        assert self.client.get(ARTICLE_URL).has_header('Server-Timing')
+
+    @override_settings(REQUEST_METRICS_SERVER_TIMING=True)
+    def test_server_timing(self):
+        response = self.client.get(ARTICLE_URL)
+        self.assert_200_OK(response)
+        timing = response['Server-Timing']
+        assert timing.startswith('db;desc="')
+        for name in ('serialize;dur=', 'render;dur=', 'total;dur='):
+            assert name in timing
+
+    def test_query_count_by_route(self):
+        self.client.get(ARTICLE_URL)
+        self.client.get(ARTICLE_URL, {'limit': 1})
+        queries = registry.get('request_queries', **ARTICLE_ROUTE)
+        assert queries.count == 2
+        assert queries.sum > 0
+        assert registry.get('request_render_seconds', **ARTICLE_ROUTE).count == 2
+
+    def test_slug_routes_are_grouped(self):
+        self.client.get(ARTICLE_URL + '/' + self.slug_1)
+        self.client.get(ARTICLE_URL + '/' + self.article_2.slug)
+        routes = {dict(labels)['route'] for _, labels in registry.histograms}
+        assert len(routes) == 1
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0, REQUEST_METRICS_SERVER_TIMING=True)
+    def test_not_sampled(self):
+        response = self.client.get(ARTICLE_URL)
+        assert not response.has_header('Server-Timing')
+        assert registry.get('request_queries', **ARTICLE_ROUTE) is None
+
+    def test_metrics_view_needs_admin(self):
+        self.login()
+        assert self.client.get(METRICS_URL).status_code == 403
+
+    def test_metrics_view(self):
+        self.client.get(ARTICLE_URL)
+        self.user_1.is_staff = True
+        self.login()
+        response = self.client.get(METRICS_URL)
+        self.assert_200_OK(response)
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        assert 'realworld_request_queries_count{method="GET",route="/api/articles"} 1' in response.content.decode()
+
+
+@modify_settings(MIDDLEWARE={'append': 'realworld.apps.core.middleware.RequestMetricsMiddleware'})
+@override_settings(ROOT_URLCONF='realworld.asgi_urls', REQUEST_METRICS_SERVER_TIMING=True)
+class AsyncRequestMetricsMiddlewareTest(TestCaseWithAuth):
+    """
+    ASGI 에서는 middleware 도 async 로 돌고, async view 가 스레드로 넘긴 query 도 센다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+
+    def setUp(self):
+        registry.clear()
+
+    async def test_async_view_queries_are_counted(self):
+        response = await self.async_client.get(ARTICLE_URL)
+        assert response.status_code == 200
+        queries = registry.get('request_queries', **ARTICLE_ROUTE)
+        assert queries.count == 1
+        assert queries.sum > 0
+        assert response['Server-Timing'].startswith(f'db;desc="{int(queries.sum)} queries"')
@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import tempfile
+
+import pytest
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from realworld.apps.core.db.pool import ConnectionPool, PoolTimeout, get_pool
+from realworld.apps.core.metrics import registry
+
+POOLED_SQLITE = 'realworld.apps.core.db.backends.sqlite3'
+
+
+def connect():
+    return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+def test_checkin_reuses_connection():
+    pool = ConnectionPool('test-reuse')
+    first = pool.checkout(connect)
+    pool.checkin(first)
+    assert pool.checkout(connect) is first
+    stats = pool.stats()
+    assert (stats['created'], stats['reused'], stats['in_use'], stats['idle']) == (1, 1, 1, 0)
+
+
+def test_checkout_waits_then_times_out():
+    pool = ConnectionPool('test-timeout', max_size=1, checkout_timeout=0.05)
+    pool.checkout(connect)
+    with pytest.raises(PoolTimeout):
+        pool.checkout(connect)
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_idle_timeout_and_health_check_replace_connections():
+    pool = ConnectionPool('test-expire', idle_timeout=0)
+    expired = pool.checkout(connect)
+    pool.checkin(expired)
+    assert pool.checkout(connect) is not expired
+    assert pool.stats()['expired'] == 1
+
+    pool = ConnectionPool('test-health')
+    broken = pool.checkout(connect)
+    broken.close()
+    pool.checkin(broken)
+    assert pool.checkout(connect) is not broken
+    stats = pool.stats()
+    assert (stats['health_check_failures'], stats['created'], stats['in_use']) == (1, 2, 1)
+
+
+def test_bypassed_pool_closes_on_checkin():
+    pool = ConnectionPool('test-bypass')
+    with pool.bypassed():
+        pool.checkin(pool.checkout(connect))
+        pool.checkin(pool.checkout(connect))
+    stats = pool.stats()
+    assert (stats['created'], stats['reused'], stats['idle']) == (2, 0, 0)
+
+
+class TrackedConnection:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork 가 없는 플랫폼')
+def test_forked_worker_starts_with_empty_pool():
+    pool = get_pool('test-fork', {'POOL': {'HEALTH_CHECK': False}})
+    idle = TrackedConnection()
+    pool.checkout(TrackedConnection)
+    pool.checkout(lambda: idle)
+    pool.checkin(idle)
+    with pool.condition:
+        pid = os.fork()
+        if pid == 0:
+            stats = pool.stats()
+            fresh = (stats['in_use'], stats['idle'], stats['created']) == (0, 0, 0)
+            os._exit(0 if fresh and not idle.closed else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    stats = pool.stats()
+    assert (stats['in_use'], stats['idle'], stats['created']) == (1, 1, 2)
+    assert pool.checkout(TrackedConnection) is idle
+
+
+class PooledBackendTest(SimpleTestCase):
+    """
+    전역 connections 와 따로 만든 ConnectionHandler 로 pool 을 쓰는 SQLite backend 를 연다.
+    """
+    alias = 'pooled'
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.handler = ConnectionHandler({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'},
+            self.alias: {
+                'ENGINE': POOLED_SQLITE,
+                'NAME': os.path.join(directory.name, 'pooled.sqlite3'),
+                'POOL': {'MAX_SIZE': 1, 'CHECKOUT_TIMEOUT': 0.05},
+            },
+        })
+
+    def tearDown(self):
+        self.handler.close_all()
+        self.handler[self.alias].pool.clear()
+
+    def test_close_returns_connection_to_pool(self):
+        connection = self.handler[self.alias]
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (name TEXT)')
+        raw_connection = connection.connection
+        connection.close()
+        assert connection.pool.stats()['idle'] == 1
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM item')
+            assert cursor.fetchone() == (0,)
+        assert connection.connection is raw_connection
+        assert 'realworld_db_pool_connections{alias="pooled",state="in_use"} 1' in registry.render()
+
+    def test_full_pool_raises_operational_error(self):
+        self.handler[self.alias].ensure_connection()
+        other = self.handler.create_connection(self.alias)
+        with self.assertRaises(OperationalError):
+            other.ensure_connection()
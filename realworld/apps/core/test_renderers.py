@@ -0,0 +1,49 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from rest_framework.exceptions import ErrorDetail
+
+from realworld.apps.articles.renderers import ArticleJSONRenderer
+from realworld.apps.core.json_backends import JSON_BACKENDS, OrjsonBackend, orjson
+
+CREATED_AT = datetime(2021, 1, 16, 13, 43, 39, 452056, tzinfo=timezone.utc)
+ARTICLE = {
+    'title': '타이틀',
+    'tagList': ['react', '태그'],
+    'createdAt': CREATED_AT,
+}
+
+
+@pytest.fixture(params=list(JSON_BACKENDS))
+def renderer(request):
+    if request.param == OrjsonBackend.name and orjson is None:
+        pytest.skip('orjson is not installed')
+    renderer = ArticleJSONRenderer()
+    renderer.json_backend = request.param
+    return renderer
+
+
+def test_render_object(renderer):
+    rendered = renderer.render(ARTICLE)
+    assert isinstance(rendered, bytes)
+    assert json.loads(rendered) == {'article': dict(ARTICLE, createdAt=CREATED_AT.isoformat())}
+
+
+def test_render_pagination(renderer):
+    rendered = renderer.render({'count': 1, 'results': [ARTICLE]})
+    assert json.loads(rendered)['articlesCount'] == 1
+    assert json.loads(rendered)['articles'][0]['createdAt'] == CREATED_AT.isoformat()
+
+
+def test_render_errors(renderer):
+    rendered = renderer.render({'errors': {'error': [ErrorDetail('잘못된 요청', code='invalid')]}})
+    assert json.loads(rendered) == {'errors': {'error': ['잘못된 요청']}}
+
+
+def test_backends_render_same_bytes():
+    if orjson is None:
+        pytest.skip('orjson is not installed')
+    data = {'articles': [ARTICLE] * 3, 'articlesCount': 3}
+    outputs = {backend.dumps(data) for backend in JSON_BACKENDS.values()}
+    assert len(outputs) == 1
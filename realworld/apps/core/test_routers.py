@@ -0,0 +1,166 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, modify_settings, override_settings
+
+from realworld.apps.articles.cache import article_response_cache
+from realworld.apps.articles.test_articles import ARTICLE_URL
+from realworld.apps.core.middleware import ReadYourWritesMiddleware
+from realworld.apps.core.replication import SqliteReplicator
+from realworld.apps.core.routers import ReplicaRouter, start_request_routing, stop_request_routing
+from realworld.testing_util import TestCaseWithAuth
+
+ROUTER = 'realworld.apps.core.routers.ReplicaRouter'
+MIDDLEWARE = 'realworld.apps.core.middleware.ReadYourWritesMiddleware'
+COOKIE = 'read_primary_until'
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(SimpleTestCase):
+    router = ReplicaRouter()
+
+    def read_in_request(self, use_replica, write_first=False):
+        _, token = start_request_routing(use_replica)
+        try:
+            if write_first:
+                assert self.router.db_for_write(None) == 'default'
+            return self.router.db_for_read(None)
+        finally:
+            stop_request_routing(token)
+
+    def test_reads_outside_request_use_primary(self):
+        assert self.router.db_for_read(None) == 'default'
+
+    def test_safe_request_reads_use_replica(self):
+        assert self.read_in_request(use_replica=True) == 'replica'
+        assert self.read_in_request(use_replica=False) == 'default'
+
+    def test_write_pins_rest_of_request(self):
+        assert self.read_in_request(use_replica=True, write_first=True) == 'default'
+
+    @override_settings(ARTICLE_RESPONSE_CACHE=True)
+    def test_cache_filling_reads_use_primary(self):
+        _, token = start_request_routing(True)
+        try:
+            assert self.router.db_for_read(None) == 'replica'
+            article_response_cache.snapshot()
+            assert self.router.db_for_read(None) == 'default'
+        finally:
+            stop_request_routing(token)
+
+    def test_no_migrate_on_replica(self):
+        assert self.router.allow_migrate('replica', 'articles') is False
+        assert self.router.allow_migrate('default', 'articles') is True
+
+
+class ReadYourWritesMiddlewareTest(SimpleTestCase):
+    factory = RequestFactory()
+
+    def call(self, request, write=False):
+        routed = {}
+
+        def get_response(request):
+            if write:
+                ReplicaRouter().db_for_write(None)
+            routed['read'] = ReplicaRouter().db_for_read(None)
+            return HttpResponse()
+
+        with override_settings(DATABASE_REPLICAS=['replica']):
+            response = ReadYourWritesMiddleware(get_response)(request)
+        return routed['read'], response
+
+    def test_write_sets_cookie(self):
+        read, response = self.call(self.factory.post('/'), write=True)
+        assert read == 'default'
+        assert float(response.cookies[COOKIE].value) > time.time()
+
+        read, response = self.call(self.factory.get('/'))
+        assert read == 'replica'
+        assert COOKIE not in response.cookies
+
+    def test_async_write_sets_cookie(self):
+        routed = {}
+
+        async def get_response(request):
+            routed['read'] = await sync_to_async(ReplicaRouter().db_for_read)(None)
+            await sync_to_async(ReplicaRouter().db_for_write)(None)
+            return HttpResponse()
+
+        middleware = ReadYourWritesMiddleware(get_response)
+        assert asyncio.iscoroutinefunction(middleware)
+        with override_settings(DATABASE_REPLICAS=['replica']):
+            response = async_to_sync(middleware)(self.factory.get('/'))
+        assert routed['read'] == 'replica'
+        assert COOKIE in response.cookies
+
+    def test_cookie_pins_reads(self):
+        request = self.factory.get('/')
+        request.COOKIES[COOKIE] = str(time.time() + 2)
+        assert self.call(request)[0] == 'default'
+
+        request.COOKIES[COOKIE] = str(time.time() - 1)
+        assert self.call(request)[0] == 'replica'
+
+        # 창보다 먼 미래 값은 무시한다.
+        request.COOKIES[COOKIE] = str(time.time() + 3600)
+        assert self.call(request)[0] == 'replica'
+
+
+@override_settings(DATABASE_ROUTERS=[ROUTER], DATABASE_REPLICAS=[])
+@modify_settings(MIDDLEWARE={'append': MIDDLEWARE})
+class ReadYourWritesViewTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+
+    def tearDown(self):
+        self.client.force_authenticate()
+        self.client.cookies.pop(COOKIE, None)
+
+    @override_settings(SOCIAL_GRAPH_CACHE='default')
+    def test_shared_social_graph_is_read_from_primary(self):
+        self.addCleanup(cache.clear)
+        routing, token = start_request_routing(True)
+        try:
+            self.profile_1.social_graph.following
+            assert routing.use_replica is False
+        finally:
+            stop_request_routing(token)
+
+    def test_favorite_pins_client_to_primary(self):
+        self.assert_200_OK(self.client.get(ARTICLE_URL))
+        assert COOKIE not in self.client.cookies
+
+        self.login()
+        self.assert_201_created(self.client.post(f'{ARTICLE_URL}/{self.slug_1}/favorite/'))
+        assert COOKIE in self.client.cookies
+
+
+def test_sqlite_replicator_lags_until_sync():
+    with tempfile.TemporaryDirectory() as directory:
+        primary_path = os.path.join(directory, 'primary.sqlite3')
+        replica_path = os.path.join(directory, 'replica.sqlite3')
+        replicator = SqliteReplicator(primary_path, replica_path, lag=0)
+
+        with closing(sqlite3.connect(primary_path)) as primary:
+            primary.execute('CREATE TABLE item (name TEXT)')
+            primary.execute("INSERT INTO item VALUES ('first')")
+            primary.commit()
+            replicator.run(iterations=1)
+            primary.execute("INSERT INTO item VALUES ('second')")
+            primary.commit()
+
+            with closing(sqlite3.connect(replica_path)) as replica:
+                assert replica.execute('SELECT name FROM item').fetchall() == [('first',)]
+                replicator.sync()
+                assert replica.execute('SELECT COUNT(*) FROM item').fetchone() == (2,)
+        assert replicator.syncs == 2
@@ -6,3 +6,17 @@ DEFAULT_CHAR_STRING = string.ascii_lowercase + string.digits
 
 def generate_random_string(chars=DEFAULT_CHAR_STRING, size=6):
     return ''.join(random.choice(chars) for _ in range(size))
+
+
+def chunked(iterable, size):
+    """
+    iterable 을 size 개씩 list 로 나눈다. (전체를 메모리에 올리지 않는다)
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,12 @@
+from django.conf.urls import url
+
+from realworld.apps.core.aio import get_or_sync_view
+from realworld.apps.profiles.async_views import AsyncProfileView
+from realworld.apps.profiles.views import ProfileRetrieveAPIView
+
+urlpatterns = [
+    url(r'^(?P<username>\w+)/?$', get_or_sync_view(
+        AsyncProfileView.as_view(),
+        ProfileRetrieveAPIView.as_view(),
+    )),
+]
@@ -0,0 +1,25 @@
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+from .models import Profile
+from .readers import get_profile_row, read_profile_row
+from .views import ProfileRetrieveAPIView
+from ..core.aio import AsyncReadView, database_sync_to_async
+from ...strings import NO_USER_FOUND_WITH_USERNAME
+
+
+def get_viewer_profile_row(request, username):
+    viewer = request.user.profile if request.user.is_authenticated else None
+    return get_profile_row(username, viewer)
+
+
+class AsyncProfileView(AsyncReadView):
+    view_class = ProfileRetrieveAPIView
+
+    async def get(self, view, request, username):
+        try:
+            row = await database_sync_to_async(get_viewer_profile_row)(request, username)
+        except Profile.DoesNotExist:
+            raise NotFound(NO_USER_FOUND_WITH_USERNAME)
+        return Response(read_profile_row(row), status=status.HTTP_200_OK)
@@ -0,0 +1,69 @@
+"""
+serializer context 에 두는 요청 단위 팔로우 여부 resolver
+필요한 profile id 를 먼저 모아두고, 처음 물어볼 때 모인 id 를 한 번의 query 로 읽는다.
+viewer 의 social graph 를 이미 읽었거나 공유 cache 에 있으면 query 없이 그 집합을 쓴다.
+"""
+from django.db import models
+from rest_framework import serializers
+
+from realworld.apps.profiles.graph import FOLLOWING
+from realworld.apps.profiles.models import Profile
+
+FOLLOW_STATE_CONTEXT_KEY = 'follow_state'
+
+
+class FollowStateResolver:
+    def __init__(self, viewer=None):
+        self.viewer = viewer
+        self.pending = set()
+        self.states = {}
+
+    def add(self, profile_ids):
+        if self.viewer is None:
+            return
+        self.pending.update(pk for pk in profile_ids if pk not in self.states)
+
+    def is_following(self, profile_id) -> bool:
+        if self.viewer is None:
+            return False
+        if profile_id not in self.states:
+            self.pending.add(profile_id)
+            self.fetch()
+        return self.states[profile_id]
+
+    def fetch(self):
+        graph = self.viewer.social_graph
+        if graph.is_cheap(FOLLOWING):
+            followed_ids = graph.following
+        else:
+            followed_ids = set(Profile.follows.through.objects.filter(
+                from_profile_id=self.viewer.pk,
+                to_profile_id__in=self.pending,
+            ).values_list('to_profile_id', flat=True))
+        self.states.update((pk, pk in followed_ids) for pk in self.pending)
+        self.pending.clear()
+
+
+def get_follow_state_resolver(context) -> FollowStateResolver:
+    """
+    nested serializer 들은 root 의 context 를 같이 쓰므로 요청 하나에 resolver 하나
+    """
+    resolver = context.get(FOLLOW_STATE_CONTEXT_KEY, None)
+    if resolver is None:
+        request = context.get('request', None)
+        viewer = None
+        if request is not None and request.user.is_authenticated:
+            viewer = request.user.profile
+        resolver = context[FOLLOW_STATE_CONTEXT_KEY] = FollowStateResolver(viewer)
+    return resolver
+
+
+class FollowStateListSerializer(serializers.ListSerializer):
+    """
+    many=True 일 때 child.get_followed_profile_ids(items) 로 id 를 먼저 모은다.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.Manager) else data)
+        get_follow_state_resolver(self.context).add(self.child.get_followed_profile_ids(items))
+        return super().to_representation(items)
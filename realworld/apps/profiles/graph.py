@@ -0,0 +1,174 @@
+"""
+viewer 의 팔로우 / 좋아요 집합 (social graph)
+Profile.social_graph 로 인스턴스마다 하나씩 만든다. request.user.profile 은 요청마다 새로 만들어지므로
+사실상 요청 단위 캐시이고, 처음 쓸 때 한 번만 읽는다.
+SOCIAL_GRAPH_CACHE 에 cache alias 를 주면 version key 와 함께 요청 간에 공유한다.
+SOCIAL_WRITE_BEHIND 이면 아직 flush 되지 않은 토글(SocialToggle)을 덮어써서 읽는다.
+"""
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import caches
+
+from realworld.apps.core.routers import read_primary_from_now
+
+FOLLOWING = 'following'
+FAVORITES = 'favorites'
+
+
+class IdSet:
+    """
+    정렬된 int64 배열. 포함 여부는 이분 탐색, cache 에는 bytes 로 넣는다.
+    """
+
+    def __init__(self, ids=()):
+        self.ids = array('q', sorted(set(ids)))
+
+    @classmethod
+    def from_bytes(cls, data):
+        id_set = cls()
+        id_set.ids.frombytes(data)
+        return id_set
+
+    def to_bytes(self):
+        return self.ids.tobytes()
+
+    def __contains__(self, pk):
+        index = bisect_left(self.ids, pk)
+        return index < len(self.ids) and self.ids[index] == pk
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, pk):
+        index = bisect_left(self.ids, pk)
+        if index == len(self.ids) or self.ids[index] != pk:
+            self.ids.insert(index, pk)
+
+    def discard(self, pk):
+        index = bisect_left(self.ids, pk)
+        if index < len(self.ids) and self.ids[index] == pk:
+            del self.ids[index]
+
+
+def get_shared_cache():
+    alias = getattr(settings, 'SOCIAL_GRAPH_CACHE', None)
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def is_write_behind_enabled():
+    return getattr(settings, 'SOCIAL_WRITE_BEHIND', False)
+
+
+def get_version_key(profile_id):
+    return f'social-graph:{profile_id}:version'
+
+
+def bump_social_graphs(profile_ids):
+    """
+    follows, favorites 가 바뀐 profile 의 공유 집합을 버린다. (signals 에서 부른다)
+    """
+    shared = get_shared_cache()
+    if shared is None:
+        return
+    for profile_id in set(profile_ids):
+        try:
+            shared.incr(get_version_key(profile_id))
+        except ValueError:
+            shared.set(get_version_key(profile_id), time.time_ns())
+
+
+class SocialGraph:
+    def __init__(self, profile):
+        self.profile = profile
+        self.sets = {}
+
+    @property
+    def following(self) -> IdSet:
+        return self.get(FOLLOWING)
+
+    @property
+    def favorites(self) -> IdSet:
+        return self.get(FAVORITES)
+
+    def is_following(self, profile_id) -> bool:
+        return profile_id in self.following
+
+    def has_favorited(self, article_id) -> bool:
+        return article_id in self.favorites
+
+    def is_cheap(self, kind) -> bool:
+        """
+        이미 읽었거나 공유 cache 가 있어서, 집합 전체를 쓰는 편이 따로 query 하는 것보다 싼지
+        """
+        return kind in self.sets or get_shared_cache() is not None
+
+    def get(self, kind) -> IdSet:
+        if kind not in self.sets:
+            self.sets[kind] = self.load(kind)
+        return self.sets[kind]
+
+    def added(self, kind, pk):
+        """
+        이 인스턴스가 직접 쓴 변경을 다시 읽지 않고 반영한다. (공유 cache 무효화는 signals 가 한다)
+        """
+        if kind in self.sets:
+            self.sets[kind].add(pk)
+
+    def removed(self, kind, pk):
+        if kind in self.sets:
+            self.sets[kind].discard(pk)
+
+    def load(self, kind) -> IdSet:
+        shared = get_shared_cache()
+        if shared is None:
+            return IdSet(self.query(kind))
+
+        key = f'social-graph:{self.profile.pk}:{kind}:{self.get_version(shared)}'
+        data = shared.get(key)
+        if data is not None:
+            return IdSet.from_bytes(data)
+        # 공유 cache 에 넣을 집합은 replica 가 아니라 primary 에서 읽는다.
+        read_primary_from_now()
+        id_set = IdSet(self.query(kind))
+        shared.set(key, id_set.to_bytes())
+        return id_set
+
+    def get_version(self, shared):
+        key = get_version_key(self.profile.pk)
+        version = shared.get(key)
+        if version is None:
+            shared.add(key, time.time_ns())
+            version = shared.get(key)
+        return version
+
+    def query(self, kind):
+        profile = self.profile
+        if kind == FOLLOWING:
+            ids = profile.follows.through.objects.filter(
+                from_profile_id=profile.pk
+            ).values_list('to_profile_id', flat=True)
+        else:
+            ids = profile.favorites.through.objects.filter(
+                profile_id=profile.pk
+            ).values_list('article_id', flat=True)
+        if not is_write_behind_enabled():
+            return ids
+
+        ids = set(ids)
+        toggles = profile.social_toggles.filter(kind=kind, flushed=False).order_by('id').values_list(
+            'target_id', 'active'
+        )
+        for target_id, active in toggles:
+            if active:
+                ids.add(target_id)
+            else:
+                ids.discard(target_id)
+        return ids
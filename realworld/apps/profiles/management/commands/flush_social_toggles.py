@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from realworld.apps.profiles.write_behind import flush_all
+
+
+class Command(BaseCommand):
+    help = 'write-behind 로 쌓인 팔로우 / 좋아요 토글을 through 테이블에 반영합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        flushed = flush_all(options['batch_size'])
+        self.stdout.write(f'{flushed} toggles flushed.')
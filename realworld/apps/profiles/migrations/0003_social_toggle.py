@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_profile_favorites'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SocialToggle',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('following', 'following'), ('favorites', 'favorites')], max_length=16)),
+                ('target_id', models.BigIntegerField()),
+                ('active', models.BooleanField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='social_toggles', to='profiles.profile')),
+            ],
+        ),
+    ]
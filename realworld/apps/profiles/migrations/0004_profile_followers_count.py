@@ -0,0 +1,42 @@
+# Generated by Django 3.2.25 on 2026-10-18 08:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# 앱 코드가 바뀌어도 migration 은 그대로 돌도록 articles.feeds 의 기본값을 옮겨 둔다.
+DEFAULT_FEED_FANOUT_MAX_FOLLOWERS = 5000
+
+
+def fill_followers_count(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    follows = Profile.follows.through.objects.filter(
+        to_profile_id=OuterRef('pk')
+    ).order_by().values('to_profile_id').annotate(count=Count('*')).values('count')
+    Profile.objects.update(
+        followers_count=Coalesce(Subquery(follows, output_field=IntegerField()), 0)
+    )
+    max_followers = getattr(settings, 'FEED_FANOUT_MAX_FOLLOWERS', DEFAULT_FEED_FANOUT_MAX_FOLLOWERS)
+    Profile.objects.filter(followers_count__gt=max_followers).update(fan_out_on_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_social_toggle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='fan_out_on_read',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_followers_count, migrations.RunPython.noop),
+    ]
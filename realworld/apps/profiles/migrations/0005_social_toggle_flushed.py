@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+def create_flush_lock(apps, schema_editor):
+    SocialFlushLock = apps.get_model('profiles', 'SocialFlushLock')
+    SocialFlushLock.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_profile_followers_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SocialFlushLock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('flushed_at', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='socialtoggle',
+            name='flushed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='socialtoggle',
+            index=models.Index(fields=['flushed', 'id'], name='social_toggle_flushed_id_idx'),
+        ),
+        migrations.RunPython(create_flush_lock, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,21 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import BooleanField, Count, Exists, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 
 from realworld.apps.core.models import TimestampedModel
+from realworld.apps.profiles.graph import FAVORITES, FOLLOWING, SocialGraph
+from realworld.apps.profiles.signals import favorites_changed
+
+
+class ProfileQuerySet(models.QuerySet):
+    def rebuild_followers_count(self):
+        follows = Profile.follows.through.objects.filter(
+            to_profile_id=OuterRef('pk')
+        ).order_by().values('to_profile_id').annotate(count=Count('*')).values('count')
+        return self.update(
+            followers_count=Coalesce(Subquery(follows, output_field=IntegerField()), 0)
+        )
 
 
 class Profile(TimestampedModel):
@@ -20,26 +35,102 @@ class Profile(TimestampedModel):
         related_name='favorited_by'
     )
 
+    # follows 의 m2m_changed 에서 갱신한다. (articles.signals)
+    followers_count = models.PositiveIntegerField(default=0)
+    # 팔로워가 FEED_FANOUT_MAX_FOLLOWERS 를 넘은 적이 있는 작성자. 피드를 읽을 때 합친다. (articles.feeds)
+    fan_out_on_read = models.BooleanField(default=False)
+
+    objects = ProfileQuerySet.as_manager()
+
     def __str__(self):
         return self.user.username
 
+    @cached_property
+    def social_graph(self):
+        return SocialGraph(self)
+
     def follow(self, profile):
         self.follows.add(profile)
+        self.social_graph.added(FOLLOWING, profile.pk)
 
     def unfollow(self, profile):
         self.follows.remove(profile)
+        self.social_graph.removed(FOLLOWING, profile.pk)
 
     def is_following(self, profile):
-        return self.follows.filter(pk=profile.pk).exists()
+        return self.social_graph.is_following(profile.pk)
 
     def is_followed_by(self, profile):
         return self.followed_by.filter(pk=profile.pk).exists()
 
     def favorite(self, article):
-        self.favorites.add(article)
+        with transaction.atomic():
+            _, created = self.favorites.through.objects.get_or_create(
+                profile=self, article=article
+            )
+            if created:
+                self._add_favorites_count(article, 1)
+        self.social_graph.added(FAVORITES, article.pk)
 
     def unfavorite(self, article):
-        self.favorites.remove(article)
+        with transaction.atomic():
+            deleted, _ = self.favorites.through.objects.filter(
+                profile=self, article=article
+            ).delete()
+            if deleted:
+                self._add_favorites_count(article, -deleted)
+        self.social_graph.removed(FAVORITES, article.pk)
+
+    def _add_favorites_count(self, article, delta):
+        """
+        through 테이블을 직접 수정하므로 m2m_changed 가 발생하지 않는다.
+        favorites_count 는 여기서 F() 로 갱신한다.
+        """
+        type(article).objects.filter(pk=article.pk).update(
+            favorites_count=F('favorites_count') + delta
+        )
+        article.refresh_from_db(fields=['favorites_count'])
+        favorites_changed.send(sender=Profile, article_ids=[article.pk], profile_ids=[self.pk])
 
     def has_favorited(self, article):
-        return self.favorites.filter(pk=article.pk).exists()
+        return self.social_graph.has_favorited(article.pk)
+
+
+class SocialToggle(models.Model):
+    """
+    write-behind 로 미뤄둔 팔로우 / 좋아요 토글 (append-only)
+    target_id 는 kind 가 following 이면 Profile, favorites 면 Article 의 pk
+    flush 한 토글은 flushed 로 표시해서 잠시 남겨둔다. 늦게 commit 된 (id 가 더 작은) 토글이 덮어쓰지 않도록 비교한다.
+    """
+    KIND_CHOICES = ((FOLLOWING, FOLLOWING), (FAVORITES, FAVORITES))
+
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='social_toggles')
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    target_id = models.BigIntegerField()
+    active = models.BooleanField()
+    flushed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['flushed', 'id'], name='social_toggle_flushed_id_idx'),
+        ]
+
+
+class SocialFlushLock(models.Model):
+    """
+    write-behind flush 를 프로세스와 상관없이 한 번에 하나만 하도록 flush transaction 의 처음에 이 row 를 UPDATE 한다.
+    """
+    flushed_at = models.DateTimeField(null=True)
+
+
+def following_expression(viewer, profile_ref='pk'):
+    """
+    viewer 가 OuterRef(profile_ref) 의 Profile 을 팔로우하는지 여부 (annotate 용)
+    """
+    if viewer is None:
+        return Value(False, output_field=BooleanField())
+    return Exists(Profile.follows.through.objects.filter(
+        from_profile_id=viewer.pk,
+        to_profile_id=OuterRef(profile_ref),
+    ))
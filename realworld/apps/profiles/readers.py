@@ -0,0 +1,28 @@
+"""
+GET 요청용 읽기 전용 경로
+ModelSerializer 대신 .values() row 로 바로 dict 를 만든다. 출력은 ProfileSerializer 와 같아야 한다.
+"""
+from realworld.apps.profiles.models import Profile, following_expression
+from realworld.apps.profiles.serializers import DEFAULT_PROFILE_IMAGE
+
+
+def read_profile(username, bio, image, following) -> dict:
+    return {
+        'username': username,
+        'bio': bio,
+        'image': image or DEFAULT_PROFILE_IMAGE,
+        'following': following,
+    }
+
+
+def get_profile_row(username, viewer=None):
+    """
+    없으면 Profile.DoesNotExist
+    """
+    return Profile.objects.filter(user__username=username).annotate(
+        following=following_expression(viewer)
+    ).values('pk', 'user__username', 'bio', 'image', 'following').get()
+
+
+def read_profile_row(row) -> dict:
+    return read_profile(row['user__username'], row['bio'], row['image'], row['following'])
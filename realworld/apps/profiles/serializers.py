@@ -1,7 +1,10 @@
 from rest_framework import serializers as ser
 
+from realworld.apps.profiles.following import FollowStateListSerializer, get_follow_state_resolver
 from realworld.apps.profiles.models import Profile
 
+DEFAULT_PROFILE_IMAGE = 'https://static.productionready.io/images/smiley-cyrus.jpg'
+
 
 class ProfileSerializer(ser.ModelSerializer):
     username = ser.CharField(source='user.username')
@@ -13,20 +16,21 @@ class ProfileSerializer(ser.ModelSerializer):
         model = Profile
         fields = ('username', 'bio', 'image', 'following')
         read_only_fields = ('username',)
+        list_serializer_class = FollowStateListSerializer
+
+    @staticmethod
+    def get_followed_profile_ids(profiles):
+        return [profile.pk for profile in profiles]
 
     @staticmethod
     def get_image(obj) -> str:
         if obj.image:
             return obj.image
-        return 'https://static.productionready.io/images/smiley-cyrus.jpg'
+        return DEFAULT_PROFILE_IMAGE
 
     def get_following(self, instance: Profile) -> bool:
-        request = self.context.get('request', None)
-        if request is None:
-            return False
-        if not request.user.is_authenticated:
-            return False
-
-        follower = request.user.profile
-        followee = instance
-        return follower.is_following(followee)
+        following = getattr(instance, 'following', None)
+        if following is not None:
+            return following
+
+        return get_follow_state_resolver(self.context).is_following(instance.pk)
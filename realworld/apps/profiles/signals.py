@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Profile.favorite / unfavorite 는 through 테이블을 직접 수정하므로 m2m_changed 대신 이 signal 을 보낸다.
+# kwargs: article_ids, profile_ids
+favorites_changed = Signal()
@@ -1,6 +1,17 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
+from realworld.apps.articles.models import Article, Comment, FeedEntry
+from realworld.apps.articles.serializers import CommentSerializer
+from realworld.apps.profiles.following import get_follow_state_resolver
+from realworld.apps.profiles.graph import FAVORITES, IdSet
+from realworld.apps.profiles.models import Profile, SocialToggle
+from realworld.apps.profiles.serializers import ProfileSerializer
 from realworld.apps.profiles.views import ProfileRetrieveAPIView, ProfileFollowAPIView
+from realworld.apps.profiles.write_behind import flush, flush_all
 from realworld.testing_util import TestCaseWithAuth, parse_body
 
 
@@ -97,3 +108,212 @@ class ProfileTest(TestCaseWithAuth):
     @staticmethod
     def get_following(follow_response):
         return parse_body(follow_response)["profile"]['following']
+
+
+class FollowStateResolverTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.profile_1.follow(cls.profile_2)
+        for profile in (cls.profile_1, cls.profile_2):
+            Comment.objects.create(author=profile, article=cls.article_1, body='댓글')
+
+    def get_context(self):
+        request = self.factory.get('/')
+        request.user = self.user_1
+        return {'request': request}
+
+    def test_profile_list_in_one_query(self):
+        profiles = list(Profile.objects.select_related('user').order_by('pk'))
+        with self.assertNumQueries(1):
+            data = ProfileSerializer(profiles, many=True, context=self.get_context()).data
+        assert [profile['following'] for profile in data] == [False, True]
+
+    def test_comment_list_in_one_query(self):
+        comments = list(Comment.objects.select_related('author__user').order_by('pk'))
+        with self.assertNumQueries(1):
+            data = CommentSerializer(comments, many=True, context=self.get_context()).data
+        assert [comment['author']['following'] for comment in data] == [False, True]
+
+    def test_resolver_reuses_states(self):
+        context = self.get_context()
+        resolver = get_follow_state_resolver(context)
+        resolver.add([self.profile_1.pk, self.profile_2.pk])
+        with self.assertNumQueries(1):
+            assert resolver.is_following(self.profile_2.pk)
+            assert not resolver.is_following(self.profile_1.pk)
+        with self.assertNumQueries(0):
+            assert resolver.is_following(self.profile_2.pk)
+
+    def test_anonymous_needs_no_query(self):
+        profiles = list(Profile.objects.select_related('user'))
+        with self.assertNumQueries(0):
+            data = ProfileSerializer(profiles, many=True).data
+        assert not any(profile['following'] for profile in data)
+
+
+def test_id_set():
+    ids = IdSet([5, 1, 3, 3])
+    assert list(ids) == [1, 3, 5]
+    ids.add(4)
+    ids.add(4)
+    ids.discard(1)
+    ids.discard(2)
+    assert list(ids) == [3, 4, 5]
+    assert 4 in ids and 1 not in ids
+    assert list(IdSet.from_bytes(ids.to_bytes())) == [3, 4, 5]
+
+
+class SocialGraphTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+
+    def setUp(self):
+        cache.clear()
+
+    def fresh_profile(self):
+        return Profile.objects.get(pk=self.profile_1.pk)
+
+    def test_loaded_once_and_updated_in_place(self):
+        profile = self.fresh_profile()
+        with self.assertNumQueries(1):
+            assert not profile.is_following(self.profile_2)
+            assert not profile.is_following(self.profile_1)
+        profile.follow(self.profile_2)
+        profile.favorite(self.article_2)
+        with self.assertNumQueries(1):
+            assert profile.is_following(self.profile_2)
+            assert profile.has_favorited(self.article_2)
+            assert not profile.has_favorited(self.article_1)
+        profile.unfollow(self.profile_2)
+        profile.unfavorite(self.article_2)
+        with self.assertNumQueries(0):
+            assert not profile.is_following(self.profile_2)
+            assert not profile.has_favorited(self.article_2)
+
+    @override_settings(SOCIAL_GRAPH_CACHE='default')
+    def test_shared_between_instances(self):
+        assert not self.fresh_profile().is_following(self.profile_2)
+        profile = self.fresh_profile()
+        with self.assertNumQueries(0):
+            assert not profile.is_following(self.profile_2)
+
+        self.fresh_profile().follow(self.profile_2)
+        assert self.fresh_profile().is_following(self.profile_2)
+
+        self.profile_2.followed_by.clear()
+        assert not self.fresh_profile().is_following(self.profile_2)
+
+        self.fresh_profile().favorite(self.article_2)
+        assert self.fresh_profile().has_favorited(self.article_2)
+        self.article_2.favorited_by.remove(self.profile_1)
+        assert not self.fresh_profile().has_favorited(self.article_2)
+
+
+@override_settings(SOCIAL_WRITE_BEHIND=True, SOCIAL_WRITE_BEHIND_INTERVAL=None)
+class WriteBehindTest(TestCaseWithAuth):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_users_1_2()
+        cls.create_articles_1_2()
+        cls.FOLLOW_URL = f"/api/profiles/{cls.user_2.username}/follow"
+        cls.FAVORITE_URL = f"/api/articles/{cls.article_2.slug}/favorite/"
+
+    def fresh_profile(self):
+        return Profile.objects.get(pk=self.profile_1.pk)
+
+    def test_follow_is_deferred_until_flush(self):
+        self.login()
+        response = self.client.post(self.FOLLOW_URL)
+        self.assert_201_created(response)
+        assert parse_body(response)['profile']['following']
+        assert not self.profile_1.follows.exists()
+        assert self.fresh_profile().is_following(self.profile_2)
+
+        self.assert_201_created(self.client.post(self.FOLLOW_URL))
+        assert SocialToggle.objects.count() == 1
+
+        assert flush() == 1
+        assert not SocialToggle.objects.filter(flushed=False).exists()
+        assert self.profile_1.follows.filter(pk=self.profile_2.pk).exists()
+        assert FeedEntry.objects.filter(follower=self.profile_1, article=self.article_2).exists()
+
+    def test_favorite_response_reflects_intended_state(self):
+        self.login()
+        response = self.client.post(self.FAVORITE_URL)
+        self.assert_201_created(response)
+        article = parse_body(response)['article']
+        assert article['favorited'] and article['favoritesCount'] == 1
+        assert Article.objects.get(pk=self.article_2.pk).favorites_count == 0
+
+        response = self.client.delete(self.FAVORITE_URL)
+        article = parse_body(response)['article']
+        assert not article['favorited'] and article['favoritesCount'] == 0
+
+    def test_toggles_are_coalesced(self):
+        self.login()
+        for _ in range(3):
+            self.client.post(self.FAVORITE_URL)
+            self.client.delete(self.FAVORITE_URL)
+        self.client.post(self.FAVORITE_URL)
+        self.profile_2.favorite(self.article_2)
+        assert SocialToggle.objects.count() == 7
+
+        assert flush_all(batch_size=2) == 7
+        article = Article.objects.get(pk=self.article_2.pk)
+        assert article.favorites_count == article.favorited_by.count() == 2
+
+        self.client.delete(self.FAVORITE_URL)
+        self.client.post(self.FOLLOW_URL)
+        self.client.delete(self.FOLLOW_URL)
+        with self.assertNumQueries(14):
+            assert flush() == 3
+        article.refresh_from_db()
+        assert article.favorites_count == article.favorited_by.count() == 1
+        assert not self.profile_1.follows.exists()
+
+    def test_late_older_toggle_does_not_override(self):
+        """
+        id 가 더 큰 토글을 반영한 뒤에 commit 된 옛 토글은 버린다.
+        """
+        newer = SocialToggle.objects.create(
+            profile=self.profile_1, kind=FAVORITES, target_id=self.article_2.pk, active=False
+        )
+        assert flush() == 1
+        SocialToggle.objects.create(
+            id=newer.id - 1, profile=self.profile_1, kind=FAVORITES, target_id=self.article_2.pk, active=True
+        )
+        assert flush() == 1
+        assert not self.profile_1.favorites.exists()
+        assert Article.objects.get(pk=self.article_2.pk).favorites_count == 0
+        assert not self.fresh_profile().has_favorited(self.article_2)
+
+    def test_flushed_toggles_are_pruned(self):
+        self.login()
+        self.client.post(self.FAVORITE_URL)
+        assert flush() == 1
+        with override_settings(SOCIAL_WRITE_BEHIND_RETENTION=0):
+            assert flush() == 0
+        assert not SocialToggle.objects.exists()
+        assert self.profile_1.favorites.filter(pk=self.article_2.pk).exists()
+
+    def test_flush_takes_the_lock_first(self):
+        self.login()
+        self.client.post(self.FAVORITE_URL)
+        with CaptureQueriesContext(connection) as queries:
+            flush()
+        statements = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        assert statements[0].startswith('UPDATE "profiles_socialflushlock"')
+
+    def test_deleted_target_is_skipped(self):
+        self.login()
+        self.client.post(self.FAVORITE_URL)
+        self.article_2.delete()
+        assert flush() == 1
+        assert not self.profile_1.favorites.exists()
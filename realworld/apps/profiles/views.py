@@ -5,7 +5,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import write_behind
 from .models import Profile
+from ..core.metrics import RequestMetricsMixin
+from .readers import get_profile_row, read_profile_row
 from .renderers import ProfileJSONRenderer
 from .serializers import ProfileSerializer
 from ...strings import NO_USER_FOUND_WITH_USERNAME, CANT_FOLLOW_YOURSELF
@@ -37,18 +40,20 @@ class ProfileMixIn:
         return Response(serializer.data, status=status_code)
 
 
-class ProfileRetrieveAPIView(ProfileMixIn, RetrieveAPIView):
+class ProfileRetrieveAPIView(RequestMetricsMixin, ProfileMixIn, RetrieveAPIView):
     permission_classes = (AllowAny,)
     queryset = Profile.objects.select_related('user')
 
     def retrieve(self, request, username, *args, **kwargs):
-        profile = self.get_profile_or_404(username)
-        return self.response_after_serialize(
-            profile, request,
-            status.HTTP_200_OK)
+        viewer = request.user.profile if request.user.is_authenticated else None
+        try:
+            row = get_profile_row(username, viewer)
+        except Profile.DoesNotExist:
+            raise NotFound(NO_USER_FOUND_WITH_USERNAME)
+        return Response(read_profile_row(row), status=status.HTTP_200_OK)
 
 
-class ProfileFollowAPIView(ProfileMixIn, APIView):
+class ProfileFollowAPIView(RequestMetricsMixin, ProfileMixIn, APIView):
     permission_classes = (IsAuthenticated,)
 
     def response_after_strategy(
@@ -68,13 +73,13 @@ class ProfileFollowAPIView(ProfileMixIn, APIView):
     def post(self, request, username, *args, **kwargs):
         return self.response_after_strategy(
             request, username,
-            lambda a, b: a.follow(b),
+            write_behind.follow,
             status.HTTP_201_CREATED
         )
 
     def delete(self, request, username, *args, **kwargs):
         return self.response_after_strategy(
             request, username,
-            lambda a, b: a.unfollow(b),
+            write_behind.unfollow,
             status.HTTP_200_OK
         )
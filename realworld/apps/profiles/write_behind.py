@@ -0,0 +1,290 @@
+"""
+팔로우 / 좋아요 API 의 write-behind (SOCIAL_WRITE_BEHIND = True)
+토글은 SocialToggle 에 append 만 하고, 응답은 viewer 의 SocialGraph 로 바로 바뀐 상태를 보여준다.
+flush 는 (kind, profile, target) 마다 id 가 가장 큰 토글만 남겨서 batch 로 through 테이블에 반영한다.
+flush 는 SocialFlushLock row 로 프로세스 (worker 스레드, flush_social_toggles 명령) 와 상관없이 한 번에 하나만 돈다.
+늦게 commit 되어 이미 반영한 토글보다 id 가 작은 토글은 버린다. (반영한 토글은 SOCIAL_WRITE_BEHIND_RETENTION 초 동안 남겨둔다)
+인기 글의 favorites_count UPDATE 도 요청마다가 아니라 batch 마다 한 번이다.
+flush 전까지는 다른 사용자가 보는 favoritesCount, 목록의 favorited / following 이 예전 값이다.
+
+SOCIAL_WRITE_BEHIND_INTERVAL 초마다 worker 스레드가 flush 한다. None 이면 스레드 없이
+flush_social_toggles 명령으로만 반영한다. (토글은 DB 에 있으므로 프로세스가 죽어도 남는다)
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from realworld.apps.profiles.graph import FAVORITES, FOLLOWING, bump_social_graphs, is_write_behind_enabled
+from realworld.apps.profiles.models import Profile, SocialFlushLock, SocialToggle
+from realworld.apps.profiles.signals import favorites_changed
+
+DEFAULT_WRITE_BEHIND_INTERVAL = 1.0
+DEFAULT_WRITE_BEHIND_BATCH_SIZE = 500
+DEFAULT_WRITE_BEHIND_RETENTION = 60
+FLUSH_LOCK_ID = 1
+
+logger = logging.getLogger(__name__)
+
+Follow = Profile.follows.through
+Favorite = Profile.favorites.through
+Article = Profile.favorites.field.related_model
+
+
+def get_interval():
+    return getattr(settings, 'SOCIAL_WRITE_BEHIND_INTERVAL', DEFAULT_WRITE_BEHIND_INTERVAL)
+
+
+def get_batch_size():
+    return getattr(settings, 'SOCIAL_WRITE_BEHIND_BATCH_SIZE', DEFAULT_WRITE_BEHIND_BATCH_SIZE)
+
+
+def get_retention():
+    return getattr(settings, 'SOCIAL_WRITE_BEHIND_RETENTION', DEFAULT_WRITE_BEHIND_RETENTION)
+
+
+def follow(follower, followee):
+    if not is_write_behind_enabled():
+        return follower.follow(followee)
+    toggle(follower, FOLLOWING, followee.pk, True)
+
+
+def unfollow(follower, followee):
+    if not is_write_behind_enabled():
+        return follower.unfollow(followee)
+    toggle(follower, FOLLOWING, followee.pk, False)
+
+
+def favorite(profile, article):
+    if not is_write_behind_enabled():
+        return profile.favorite(article)
+    toggle(profile, FAVORITES, article.pk, True)
+    apply_own_favorite(profile, article, True)
+
+
+def unfavorite(profile, article):
+    if not is_write_behind_enabled():
+        return profile.unfavorite(article)
+    toggle(profile, FAVORITES, article.pk, False)
+    apply_own_favorite(profile, article, False)
+
+
+def apply_own_favorite(profile, article, active):
+    """
+    DB 의 favorites_count 에는 아직 flush 되지 않은 이 사용자의 토글이 빠져 있으므로 응답에서만 더한다.
+    """
+    flushed = Favorite.objects.filter(profile_id=profile.pk, article_id=article.pk).exists()
+    article.favorites_count += int(active) - int(flushed)
+
+
+def toggle(profile, kind, target_id, active) -> bool:
+    """
+    viewer 의 집합으로 보아 상태가 바뀌지 않는 토글은 쌓지 않는다. 쌓았으면 True
+    """
+    graph = profile.social_graph
+    if (target_id in graph.get(kind)) == active:
+        return False
+
+    SocialToggle.objects.create(profile=profile, kind=kind, target_id=target_id, active=active)
+    if active:
+        graph.added(kind, target_id)
+    else:
+        graph.removed(kind, target_id)
+    bump_social_graphs([profile.pk])
+    flush_worker.start()
+    return True
+
+
+def lock_flush():
+    """
+    transaction 안에서 부른다. 처음 쓰는 문장이 같은 row 의 UPDATE 이므로 다른 flush 는 commit 까지 기다린다.
+    (SQLite 는 쓰기 lock, PostgreSQL 은 row lock. 기다린 뒤에 읽는 토글과 through 테이블은 앞 flush 가 commit 한 뒤의 값이다)
+    """
+    if not SocialFlushLock.objects.filter(pk=FLUSH_LOCK_ID).update(flushed_at=timezone.now()):
+        SocialFlushLock.objects.get_or_create(pk=FLUSH_LOCK_ID)
+        SocialFlushLock.objects.filter(pk=FLUSH_LOCK_ID).update(flushed_at=timezone.now())
+
+
+def get_flushed_ids(kind, keys):
+    """
+    {(profile_id, target_id): 이미 반영한 토글 중 가장 큰 id}
+    """
+    if not keys:
+        return {}
+    rows = SocialToggle.objects.filter(
+        flushed=True, kind=kind,
+        profile_id__in={profile_id for profile_id, _ in keys},
+        target_id__in={target_id for _, target_id in keys},
+    ).order_by().values('profile_id', 'target_id').annotate(last_id=Max('id')).values_list(
+        'profile_id', 'target_id', 'last_id'
+    )
+    return {(profile_id, target_id): last_id for profile_id, target_id, last_id in rows}
+
+
+def get_latest_states(toggles):
+    """
+    kind 마다 {(profile_id, target_id): active}. 키마다 id 가 가장 큰 토글이 이기고,
+    이미 반영한 토글보다 id 가 작으면 (늦게 commit 된 옛 토글) 버린다.
+    """
+    latest = {FOLLOWING: {}, FAVORITES: {}}
+    for toggle_id, kind, profile_id, target_id, active in toggles:
+        # id 순서이므로 뒤의 토글이 앞의 것을 덮는다.
+        latest[kind][(profile_id, target_id)] = (toggle_id, active)
+
+    states = {}
+    for kind, toggles_by_key in latest.items():
+        flushed_ids = get_flushed_ids(kind, toggles_by_key.keys())
+        states[kind] = {
+            key: active for key, (toggle_id, active) in toggles_by_key.items()
+            if toggle_id > flushed_ids.get(key, 0)
+        }
+    return states
+
+
+def flush(batch_size=None) -> int:
+    """
+    반영하지 않은 토글 중 가장 오래된 batch_size 개를 반영한다. 처리한 토글 수를 돌려준다.
+    """
+    if batch_size is None:
+        batch_size = get_batch_size()
+    with transaction.atomic():
+        lock_flush()
+        toggles = list(
+            SocialToggle.objects.filter(flushed=False).order_by('id').values_list(
+                'id', 'kind', 'profile_id', 'target_id', 'active'
+            )[:batch_size]
+        )
+        if toggles:
+            states = get_latest_states(toggles)
+            apply_follows(states[FOLLOWING])
+            apply_favorites(states[FAVORITES])
+            SocialToggle.objects.filter(pk__in=[toggle_id for toggle_id, *_ in toggles]).update(flushed=True)
+        SocialToggle.objects.filter(
+            flushed=True, created_at__lt=timezone.now() - timedelta(seconds=get_retention())
+        ).delete()
+    return len(toggles)
+
+
+def flush_all(batch_size=None) -> int:
+    if batch_size is None:
+        batch_size = get_batch_size()
+    total = 0
+    while True:
+        flushed = flush(batch_size)
+        total += flushed
+        if flushed < batch_size:
+            return total
+
+
+def split_states(states):
+    """
+    {(owner_id, target_id): active} -> owner_id 마다 (추가할 target_ids, 지울 target_ids)
+    """
+    changes = defaultdict(lambda: ([], []))
+    for (owner_id, target_id), active in states.items():
+        changes[owner_id][0 if active else 1].append(target_id)
+    return changes
+
+
+def apply_follows(states):
+    """
+    피드 backfill / trim 이 m2m_changed 에 걸려 있으므로 follower 마다 follows.add / remove 로 반영한다.
+    """
+    if not states:
+        return
+    live_ids = set(Profile.objects.filter(
+        pk__in={target_id for (_, target_id), active in states.items() if active}
+    ).values_list('pk', flat=True))
+    changes = split_states(states)
+    for follower in Profile.objects.filter(pk__in=changes.keys()):
+        added_ids, removed_ids = changes[follower.pk]
+        added_ids = [pk for pk in added_ids if pk in live_ids]
+        if added_ids:
+            follower.follows.add(*added_ids)
+        if removed_ids:
+            follower.follows.remove(*removed_ids)
+
+
+def apply_favorites(states):
+    """
+    batch 전체를 through 테이블에 bulk 로 반영하고 favorites_count 는 글마다 UPDATE 한 번
+    """
+    if not states:
+        return
+    profile_ids = {profile_id for profile_id, _ in states}
+    article_ids = {article_id for _, article_id in states}
+    existing = set(Favorite.objects.filter(
+        profile_id__in=profile_ids, article_id__in=article_ids
+    ).values_list('profile_id', 'article_id'))
+    live_ids = set(Article.objects.filter(
+        pk__in={article_id for (_, article_id), active in states.items() if active}
+    ).values_list('pk', flat=True))
+
+    added = [pair for pair, active in states.items() if active and pair not in existing and pair[1] in live_ids]
+    removed = [pair for pair, active in states.items() if not active and pair in existing]
+    Favorite.objects.bulk_create([
+        Favorite(profile_id=profile_id, article_id=article_id) for profile_id, article_id in added
+    ], ignore_conflicts=True)
+    for profile_id, (_, removed_ids) in split_states(dict.fromkeys(removed, False)).items():
+        Favorite.objects.filter(profile_id=profile_id, article_id__in=removed_ids).delete()
+
+    deltas = Counter(article_id for _, article_id in added)
+    deltas.subtract(article_id for _, article_id in removed)
+    ids_by_delta = defaultdict(list)
+    for article_id, delta in deltas.items():
+        if delta:
+            ids_by_delta[delta].append(article_id)
+    for delta, pks in ids_by_delta.items():
+        Article.objects.filter(pk__in=pks).update(favorites_count=F('favorites_count') + delta)
+
+    changed = added + removed
+    if changed:
+        favorites_changed.send(
+            sender=Profile,
+            article_ids=list({article_id for _, article_id in changed}),
+            profile_ids=list({profile_id for profile_id, _ in changed}),
+        )
+
+
+class FlushWorker:
+    """
+    처음 토글이 쌓일 때 daemon 스레드 하나를 띄워서 interval 마다 쌓인 토글을 모두 flush 한다.
+    프로세스마다 하나씩 뜨지만 flush 는 lock_flush 로 한 번에 하나씩만 돈다.
+    """
+
+    def __init__(self):
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        interval = get_interval()
+        if interval is None:
+            return
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(
+                target=self.run, args=(interval,), name='social-write-behind', daemon=True
+            )
+            self.thread.start()
+
+    @staticmethod
+    def run(interval):
+        while True:
+            time.sleep(interval)
+            close_old_connections()
+            try:
+                flush_all()
+            except Exception:
+                logger.exception('social write-behind flush failed')
+            finally:
+                close_old_connections()
+
+
+flush_worker = FlushWorker()
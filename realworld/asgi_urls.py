@@ -0,0 +1,14 @@
+"""
+ASGI 배포용 ROOT_URLCONF (ROOT_URLCONF = 'realworld.asgi_urls')
+글 목록, 글, 피드, 댓글 목록, 프로필의 GET 만 async view 로 받고 나머지는 realworld.urls 와 같다.
+앞에 있는 pattern 이 먼저 걸리므로 같은 경로의 POST, PUT, DELETE 는 get_or_sync_view 가 DRF view 로 넘긴다.
+ASYNC_DB_CONCURRENCY = True 가 아니면 async view 의 DB 작업은 요청 사이에서 스레드 하나로 직렬화된다. (core.aio)
+"""
+from django.urls import include, path
+
+from realworld.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/', include('realworld.apps.articles.async_urls')),
+    path('api/profiles/', include('realworld.apps.profiles.async_urls')),
+] + sync_urlpatterns
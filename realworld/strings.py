@@ -10,3 +10,6 @@ EMAIL_IS_REQUIRED = 'An email address is required to log in.'
 PASSWORD_IS_REQUIRED = 'A password is required to log in.'
 NO_USER_FOUND_WITH_EMAIL_PASSWORD = 'A user with this email and password was not found.'
 CANT_FOLLOW_YOURSELF = 'You can not follow yourself.'
+INVALID_TOP = 'top must be a positive integer.'
+SEARCH_QUERY_REQUIRED = 'q must contain at least one word.'
+INVALID_TAG_MODE = 'tag_mode must be all or any.'
@@ -4,6 +4,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from realworld.apps.core.views import MetricsAPIView
+
 schema_view = get_schema_view(
    openapi.Info(
       title="Real World API by DRF",
@@ -22,6 +24,7 @@ urlpatterns = [
     path('api/', include('realworld.apps.articles.urls'), name='articles'),
     path('api/users/', include('realworld.apps.authentication.urls'), name='authentication'),
     path('api/profiles/', include('realworld.apps.profiles.urls'), name='profiles'),
+    path('metrics/', MetricsAPIView.as_view(), name='metrics'),
     path('docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
 ]
 